@@ -0,0 +1,132 @@
+"""
+Embedding inference backend benchmark.
+
+Loads the embedding model on PyTorch, on ONNX Runtime at full precision, and
+on ONNX Runtime with dynamic int8 quantization, then reports for each:
+single-text latency percentiles (the query path), batch throughput (the
+ingestion path), and cosine agreement of its vectors with PyTorch's. The cache
+is disabled so every text reaches the model. A backend whose dependencies or
+model cannot be loaded is reported as skipped.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+def make_texts(count: int) -> List[str]:
+    """Synthetic clinical policy sentences of varied length."""
+    topics = ["sepsis triage", "stroke alerts", "discharge summaries", "medication reconciliation"]
+    return [
+        f"Policy {i} on {topics[i % len(topics)]}: " + "review within the hour and document it. " * (1 + i % 6)
+        for i in range(count)
+    ]
+
+
+def measure(generator: Any, texts: List[str], queries: int, batch_size: int) -> Dict[str, Any]:
+    """Single-text latency and batch throughput of one generator."""
+    generator.generate_embeddings(texts[:batch_size], batch_size=batch_size)  # warm up
+
+    latencies = []
+    for text in texts[:queries]:
+        t0 = time.perf_counter()
+        generator.generate_embedding(text)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    latencies.sort()
+
+    t0 = time.perf_counter()
+    embeddings = generator.generate_embeddings(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 3),
+        "texts_per_second": round(len(texts) / elapsed, 2),
+        "embeddings": embeddings,
+    }
+
+
+def cosine(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise cosine similarity."""
+    return np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+
+def bench(texts: int, queries: int, batch_size: int, threads: int, quantize: str) -> Dict[str, Any]:
+    from agentic_clinical_assistant.config import settings
+    from agentic_clinical_assistant.vector.embeddings import EmbeddingGenerator
+
+    settings.EMBEDDING_CACHE_ENABLED = False
+    settings.EMBEDDING_INTRA_OP_THREADS = threads
+    corpus = make_texts(texts)
+
+    report: Dict[str, Any] = {
+        "texts": texts,
+        "queries": queries,
+        "batch_size": batch_size,
+        "intra_op_threads": threads,
+        "backends": {},
+    }
+    reference: Optional[np.ndarray] = None
+    for name, backend, preset in [
+        ("torch", "torch", ""),
+        ("onnx", "onnx", ""),
+        (f"onnx-qint8-{quantize}", "onnx", quantize),
+    ]:
+        try:
+            result = measure(
+                EmbeddingGenerator(backend=backend, quantize=preset), corpus, queries, batch_size
+            )
+        except (ImportError, OSError) as exc:  # pragma: no cover - optional dep / model download
+            report["backends"][name] = {"status": "skipped", "reason": str(exc)}
+            continue
+
+        embeddings = result.pop("embeddings")
+        if backend == "torch":
+            reference = embeddings
+        elif reference is not None:
+            agreement = cosine(reference, embeddings)
+            result["cosine_min"] = round(float(agreement.min()), 5)
+            result["cosine_mean"] = round(float(agreement.mean()), 5)
+        report["backends"][name] = {"status": "ok", **result}
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Embedding inference backend benchmark")
+    p.add_argument("--texts", type=int, default=1000, help="Texts embedded in batches")
+    p.add_argument("--queries", type=int, default=200, help="Texts embedded one at a time")
+    p.add_argument("--batch-size", type=int, default=32, help="Batch size")
+    p.add_argument("--threads", type=int, default=0, help="Intra-op threads (0 = default)")
+    p.add_argument(
+        "--quantize",
+        default="avx2",
+        choices=["avx2", "avx512", "avx512_vnni", "arm64"],
+        help="Int8 quantization preset",
+    )
+    p.add_argument("--out", help="Optional path to write JSON report")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    report = bench(args.texts, args.queries, args.batch_size, args.threads, args.quantize)
+    print(json.dumps(report, indent=2))
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote report to {out_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,102 @@
+"""
+Embedding micro-batching benchmark.
+
+Sends concurrent single-text embedding requests the way API handlers do, once
+with one model call per request and once through ``EmbeddingBatcher``, and
+reports throughput and per-request latency percentiles for each. The cache is
+disabled and every text is distinct, so each request reaches the model.
+Skips if the embedding model cannot be loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+async def drive(
+    embed: Callable[[str], Awaitable[Any]], requests: int, concurrency: int
+) -> Dict[str, Any]:
+    """Run `requests` embeds with `concurrency` in flight; report throughput and latency."""
+    latencies: List[float] = []
+    queue = iter(range(requests))
+
+    async def client() -> None:
+        for i in queue:
+            t0 = time.perf_counter()
+            await embed(f"clinical policy question number {i} about sepsis triage")
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests_per_second": round(requests / elapsed, 2),
+        "p50_ms": round(statistics.median(latencies), 3),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))], 3),
+    }
+
+
+async def bench(requests: int, concurrency: int, window_ms: float, max_batch: int) -> Dict[str, Any]:
+    try:
+        from agentic_clinical_assistant.vector.embedding_batcher import (
+            EXECUTOR_KEY,
+            EmbeddingBatcher,
+        )
+        from agentic_clinical_assistant.vector.embeddings import EmbeddingGenerator
+        from agentic_clinical_assistant.vector.executor import run_blocking
+
+        generator = EmbeddingGenerator()
+        generator.cache = None
+        generator.generate_embedding("warm up")
+    except Exception as exc:  # pragma: no cover - optional dep / model download
+        return {"status": "skipped", "reason": str(exc)}
+
+    async def unbatched(text: str) -> Any:
+        return await run_blocking(EXECUTOR_KEY, generator.generate_embedding, text)
+
+    batcher = EmbeddingBatcher(generator, window_seconds=window_ms / 1000, max_batch_size=max_batch)
+    return {
+        "status": "ok",
+        "requests": requests,
+        "concurrency": concurrency,
+        "window_ms": window_ms,
+        "max_batch": max_batch,
+        "unbatched": await drive(unbatched, requests, concurrency),
+        "batched": await drive(batcher.embed, requests, concurrency),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Embedding micro-batching benchmark")
+    p.add_argument("--requests", type=int, default=512, help="Total requests")
+    p.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    p.add_argument("--window-ms", type=float, default=3.0, help="Batching window")
+    p.add_argument("--max-batch", type=int, default=64, help="Maximum batch size")
+    p.add_argument("--out", help="Optional path to write JSON report")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    report = asyncio.run(bench(args.requests, args.concurrency, args.window_ms, args.max_batch))
+    print(json.dumps(report, indent=2))
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote report to {out_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,121 @@
+"""
+Embedding representation microbenchmark.
+
+Compares the memory allocated and the time taken to move a batch of
+embeddings from the generator into documents and on to a FAISS add, and a
+query embedding into a search matrix, with embeddings as Python float lists
+(the previous representation) versus float32 NumPy arrays. The model itself
+is not run; its output is simulated by a random float32 matrix.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """Peak traced allocation of one run, and the best time over several."""
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    return {"peak_bytes": peak, "seconds": round(best, 6)}
+
+
+def bench(n: int, dim: int, repeat: int) -> Dict[str, Any]:
+    try:
+        import numpy as np
+        from pydantic import BaseModel
+
+        from agentic_clinical_assistant.vector.base import Document, as_embedding
+        from agentic_clinical_assistant.vector.faiss_adapter import FAISSAdapter
+    except ImportError as exc:  # pragma: no cover - optional dep
+        return {"status": "skipped", "reason": str(exc)}
+
+    class ListDocument(BaseModel):
+        id: str
+        text: str
+        embedding: List[float]
+
+    model_output = np.random.random((n, dim)).astype("float32")
+    query_output = model_output[0].copy()
+    adapter = FAISSAdapter(dimension=dim)
+
+    def ingest_lists() -> Any:
+        # generate_embeddings(...).tolist(), List[float] validation, then stacking
+        embeddings = model_output.tolist()
+        documents = [
+            ListDocument(id=str(i), text="", embedding=embedding)
+            for i, embedding in enumerate(embeddings)
+        ]
+        return np.array([doc.embedding for doc in documents], dtype="float32")
+
+    def ingest_arrays() -> Any:
+        documents = [
+            Document(id=str(i), text="", embedding=embedding)
+            for i, embedding in enumerate(model_output)
+        ]
+        return adapter._stack_embeddings(documents)
+
+    def query_list() -> Any:
+        return np.array([query_output.tolist()], dtype="float32")
+
+    def query_array() -> Any:
+        return as_embedding(query_output)[np.newaxis]
+
+    results = {
+        "ingest_lists": measure(ingest_lists, repeat),
+        "ingest_arrays": measure(ingest_arrays, repeat),
+        "query_list": measure(query_list, repeat * 100),
+        "query_array": measure(query_array, repeat * 100),
+    }
+    assert np.array_equal(ingest_lists(), ingest_arrays())
+
+    return {
+        "status": "ok",
+        "n": n,
+        "dim": dim,
+        "results": results,
+        "ingest_bytes_saved": results["ingest_lists"]["peak_bytes"]
+        - results["ingest_arrays"]["peak_bytes"],
+        "query_bytes_saved": results["query_list"]["peak_bytes"]
+        - results["query_array"]["peak_bytes"],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Embedding representation microbenchmark")
+    p.add_argument("--n", type=int, default=2000, help="Documents per batch")
+    p.add_argument("--dim", type=int, default=384, help="Embedding dimension")
+    p.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    p.add_argument("--out", help="Optional path to write JSON report")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    report = bench(args.n, args.dim, args.repeat)
+    print(json.dumps(report, indent=2))
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote report to {out_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
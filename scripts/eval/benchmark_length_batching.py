@@ -0,0 +1,124 @@
+"""
+Length-bucketed embedding batching benchmark.
+
+Embeds a mixed-length corpus of short queries and long policy paragraphs,
+once in fixed batches of ``--batch-size`` texts (``EMBEDDING_BATCH_TOKEN_BUDGET=0``)
+and once in token-length buckets within ``--token-budget``, and reports
+throughput and padded tokens (rows times longest text, summed over batches)
+for each. The cache is disabled so every text reaches the model. Skips if the
+embedding model cannot be loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+
+def make_corpus(count: int, seed: int = 7) -> List[str]:
+    """Shuffled mix of one-line queries and paragraph-length policy texts."""
+    rng = random.Random(seed)
+    sentence = "Review the sepsis triage policy within the hour and document it. "
+    texts = []
+    for i in range(count):
+        if i % 4 == 0:
+            texts.append(f"Policy {i}: " + sentence * rng.randint(8, 40))
+        else:
+            texts.append(f"question {i} about " + " ".join(sentence.split()[: rng.randint(2, 10)]))
+    rng.shuffle(texts)
+    return texts
+
+
+def padded_tokens(batches: List[List[int]]) -> int:
+    """Tokens a model processes for batches of token lengths, padding included."""
+    return sum(len(batch) * max(batch) for batch in batches)
+
+
+def bench(model: str, texts: int, batch_size: int, token_budget: int) -> Dict[str, Any]:
+    from agentic_clinical_assistant.config import settings
+    from agentic_clinical_assistant.vector.embeddings import EmbeddingGenerator
+    from agentic_clinical_assistant.vector.length_batching import token_buckets
+
+    settings.EMBEDDING_CACHE_ENABLED = False
+    corpus = make_corpus(texts)
+    generator = EmbeddingGenerator(model_name=model, long_text_strategy="truncate")
+    try:
+        generator.generate_embeddings(corpus[:8])  # load and warm up
+    except OSError as exc:  # pragma: no cover - model download
+        return {"status": "skipped", "reason": str(exc)}
+
+    tokenizer = generator.model.tokenizer
+    max_length = generator.model.max_seq_length
+    lengths = [
+        min(len(ids) + tokenizer.num_special_tokens_to_add(pair=False), max_length)
+        for ids in tokenizer(corpus, add_special_tokens=False, verbose=False)["input_ids"]
+    ]
+    # SentenceTransformer.encode batches texts sorted by character length, longest first
+    by_chars = sorted(range(len(corpus)), key=lambda i: -len(corpus[i]))
+    fixed_batches = [
+        [lengths[i] for i in by_chars[start : start + batch_size]]
+        for start in range(0, len(corpus), batch_size)
+    ]
+    bucketed_batches = [[lengths[i] for i in bucket] for bucket in token_buckets(lengths, token_budget)]
+
+    report: Dict[str, Any] = {
+        "status": "ok",
+        "model": model,
+        "texts": texts,
+        "batch_size": batch_size,
+        "token_budget": token_budget,
+        "real_tokens": sum(lengths),
+    }
+    for name, budget, batches in [
+        ("fixed", 0, fixed_batches),
+        ("bucketed", token_budget, bucketed_batches),
+    ]:
+        settings.EMBEDDING_BATCH_TOKEN_BUDGET = budget
+        t0 = time.perf_counter()
+        generator.generate_embeddings(corpus, batch_size=batch_size)
+        elapsed = time.perf_counter() - t0
+        report[name] = {
+            "batches": len(batches),
+            "padded_tokens": padded_tokens(batches),
+            "texts_per_second": round(texts / elapsed, 2),
+        }
+    report["speedup"] = round(
+        report["bucketed"]["texts_per_second"] / report["fixed"]["texts_per_second"], 2
+    )
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Length-bucketed embedding batching benchmark")
+    p.add_argument("--model", default=None, help="Model name or path (default: EMBEDDING_MODEL)")
+    p.add_argument("--texts", type=int, default=2000, help="Texts in the corpus")
+    p.add_argument("--batch-size", type=int, default=32, help="Fixed batch size")
+    p.add_argument("--token-budget", type=int, default=8192, help="Padded tokens per bucket")
+    p.add_argument("--out", help="Optional path to write JSON report")
+    return p.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.model is None:
+        from agentic_clinical_assistant.config import settings
+
+        args.model = settings.EMBEDDING_MODEL
+    report = bench(args.model, args.texts, args.batch_size, args.token_budget)
+    print(json.dumps(report, indent=2))
+
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote report to {out_path}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
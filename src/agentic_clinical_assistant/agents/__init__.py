@@ -1,9 +1,27 @@
-"""Specialized agents for agentic clinical assistant."""
+"""Specialized agents for agentic clinical assistant.
+
+Agents are imported on first access, so importing one agent's models does not
+load every other agent and its dependencies (session memory, the database).
+"""
+
+import importlib
+from typing import Any
+
+# Exported agent class -> module defining it
+_AGENTS = {
+    "IntakeAgent": "agentic_clinical_assistant.agents.intake.agent",
+    "RetrievalAgent": "agentic_clinical_assistant.agents.retrieval.agent",
+    "SynthesisAgent": "agentic_clinical_assistant.agents.synthesis.agent",
+    "VerifierAgent": "agentic_clinical_assistant.agents.verifier.agent",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _AGENTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module), name)
 
-from agentic_clinical_assistant.agents.intake.agent import IntakeAgent
-from agentic_clinical_assistant.agents.retrieval.agent import RetrievalAgent
-from agentic_clinical_assistant.agents.synthesis.agent import SynthesisAgent
-from agentic_clinical_assistant.agents.verifier.agent import VerifierAgent
 
 __all__ = [
     "IntakeAgent",
@@ -11,4 +29,3 @@ __all__ = [
     "SynthesisAgent",
     "VerifierAgent",
 ]
-
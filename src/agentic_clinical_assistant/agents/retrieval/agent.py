@@ -1,11 +1,14 @@
 """Retrieval Agent - Retrieves evidence from vector databases."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from agentic_clinical_assistant.agents.retrieval.models import EvidenceBundle, EvidenceItem, RetrievalResult
+import numpy as np
+
+from agentic_clinical_assistant.agents.retrieval.models import RetrievalResult
 from agentic_clinical_assistant.config import settings
 from agentic_clinical_assistant.vector import VectorDBManager
-from agentic_clinical_assistant.vector.base import VectorDBBackend
+from agentic_clinical_assistant.vector.base import SearchHit, VectorDBBackend
+from agentic_clinical_assistant.vector.embedding_batcher import get_embedding_batcher
 from agentic_clinical_assistant.vector.embeddings import get_embedding_generator
 
 
@@ -16,6 +19,7 @@ class RetrievalAgent:
         """Initialize Retrieval Agent."""
         self.vector_manager: Optional[VectorDBManager] = None
         self.embedding_generator = get_embedding_generator()
+        self.embedding_batcher = get_embedding_batcher()
         self.default_top_k = 10
 
     async def initialize(self) -> None:
@@ -51,8 +55,8 @@ class RetrievalAgent:
         if self.vector_manager is None:
             raise RuntimeError("Vector manager not initialized")
 
-        # Generate query embedding
-        query_embedding = self.embedding_generator.generate_embedding(query)
+        # Generate query embedding, batched with concurrent requests
+        query_embedding = await self.embedding_batcher.embed(query)
 
         # Determine which backends to query
         if backends is None:
@@ -63,7 +67,7 @@ class RetrievalAgent:
             # TODO: Get from settings or use all configured backends
 
         # Query backends
-        evidence_bundle = await self._query_backends(
+        return await self._query_backends(
             query=query,
             query_embedding=query_embedding,
             top_k=top_k,
@@ -71,19 +75,16 @@ class RetrievalAgent:
             backends=backends,
         )
 
-        # Convert to RetrievalResult
-        return RetrievalResult.from_evidence_bundle(evidence_bundle)
-
     async def _query_backends(
         self,
         query: str,
-        query_embedding: List[float],
+        query_embedding: np.ndarray,
         top_k: int,
         filters: Dict[str, Any],
         backends: List[str],
-    ) -> EvidenceBundle:
+    ) -> RetrievalResult:
         """Query multiple backends and aggregate results."""
-        all_evidence: List[EvidenceItem] = []
+        all_hits: List[Tuple[str, SearchHit]] = []
         backends_queried = []
 
         for backend_name in backends:
@@ -102,19 +103,10 @@ class RetrievalAgent:
                 # )
                 
                 # Placeholder: Create empty results
-                results = []
+                results: List[SearchHit] = []
                 
-                # Convert to EvidenceItem
-                for result in results:
-                    evidence_item = EvidenceItem(
-                        document_id=result.document.id,
-                        text=result.document.text,
-                        score=result.score,
-                        doc_hash=result.document.doc_hash or "",
-                        backend=backend_name,
-                        metadata=result.document.metadata,
-                    )
-                    all_evidence.append(evidence_item)
+                # Keep the hits as they are; their text is read only for the kept ones
+                all_hits.extend((backend_name, hit) for hit in results)
                 
                 backends_queried.append(backend_name)
                 
@@ -127,17 +119,12 @@ class RetrievalAgent:
         selected_backend = backends_queried[0] if backends_queried else None
 
         # Sort by score
-        all_evidence.sort(key=lambda x: x.score, reverse=True)
+        all_hits.sort(key=lambda item: item[1].score, reverse=True)
 
         # Take top_k
-        top_evidence = all_evidence[:top_k]
-
-        return EvidenceBundle(
-            query=query,
-            evidence=top_evidence,
+        return RetrievalResult.from_hits(
+            all_hits[:top_k],
             backends_queried=backends_queried,
             selected_backend=selected_backend,
-            total_results=len(top_evidence),
             retrieval_mode="multi_backend" if len(backends) > 1 else "single_backend",
         )
-
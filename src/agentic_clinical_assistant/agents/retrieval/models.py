@@ -1,9 +1,11 @@
 """Retrieval Agent models."""
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
+from agentic_clinical_assistant.vector.base import SearchHit
+
 
 class EvidenceItem(BaseModel):
     """Single evidence item from retrieval."""
@@ -61,3 +63,45 @@ class RetrievalResult(BaseModel):
             },
         )
 
+    @classmethod
+    def from_hits(
+        cls,
+        hits: List[Tuple[str, SearchHit]],
+        backends_queried: List[str],
+        selected_backend: Optional[str],
+        retrieval_mode: str,
+    ) -> "RetrievalResult":
+        """
+        Create RetrievalResult from ranked search hits, each with its backend.
+
+        Hits are converted here, at the serialization boundary, in one pass;
+        their text and metadata are loaded only now.
+        """
+        evidence = []
+        doc_hashes = []
+        scores = []
+        for backend, hit in hits:
+            doc_hash = hit.doc_hash
+            evidence.append(
+                {
+                    "document_id": hit.id,
+                    "text": hit.text,
+                    "score": hit.score,
+                    "doc_hash": doc_hash,
+                    "backend": backend,
+                    "metadata": hit.metadata,
+                }
+            )
+            doc_hashes.append(doc_hash)
+            scores.append(hit.score)
+        return cls(
+            evidence=evidence,
+            doc_hashes=doc_hashes,
+            scores=scores,
+            backend=selected_backend,
+            metadata={
+                "backends_queried": backends_queried,
+                "retrieval_mode": retrieval_mode,
+                "total_results": len(evidence),
+            },
+        )
@@ -42,16 +42,50 @@ class Settings(BaseSettings):
     # FAISS
     FAISS_INDEX_PATH: str = "./data/faiss_index"
     FAISS_DIMENSION: int = 384
+    FAISS_ADD_BATCH_SIZE: int = 10000
+    FAISS_SNAPSHOT_INTERVAL: int = 50000
+    FAISS_WAL_FSYNC: bool = True
+    FAISS_INDEX_TYPE: str = "flat"  # flat, ivf_flat, ivf_pq, hnsw_flat, sq8
+    FAISS_NLIST: int = 1024
+    FAISS_PQ_M: int = 16
+    FAISS_PQ_NBITS: int = 8
+    FAISS_HNSW_M: int = 32
+    FAISS_HNSW_EF_CONSTRUCTION: int = 200
+    FAISS_NPROBE: int = 16
+    FAISS_EF_SEARCH: int = 64
+    FAISS_TRAIN_SAMPLE_SIZE: int = 100000
+    FAISS_COMPACTION_THRESHOLD: float = 0.2
+    FAISS_COMPACTION_INTERVAL_MINUTES: int = 60
+    FAISS_FILTER_BRUTE_FORCE_MAX: int = 4096
+    FAISS_READ_ONLY: bool = False
+    FAISS_SNAPSHOT_GENERATIONS: int = 3
+    FAISS_WRITER_LOCK_TIMEOUT: float = 10.0
+    FAISS_REFRESH_INTERVAL_SECONDS: float = 5.0
+    FAISS_BM25_K1: float = 1.2
+    FAISS_BM25_B: float = 0.75
+    FAISS_HYBRID_CANDIDATES: int = 4  # Candidates per side in hybrid search, as a multiple of top_k
 
     # Pinecone
     PINECONE_API_KEY: str = ""
     PINECONE_ENVIRONMENT: str = "us-west1-gcp"
     PINECONE_INDEX_NAME: str = "clinical-assistant"
+    PINECONE_INDEX_HOST: str = ""
+    PINECONE_UPSERT_BATCH_SIZE: int = 100
+    PINECONE_UPSERT_MAX_BYTES: int = 1_800_000
+    PINECONE_UPSERT_CONCURRENCY: int = 4
+    PINECONE_UPSERT_RETRIES: int = 3
+    PINECONE_UPSERT_RETRY_BACKOFF_SECONDS: float = 0.5
+    PINECONE_FETCH_BATCH_SIZE: int = 100
 
     # Weaviate
     WEAVIATE_URL: str = "http://localhost:8080"
     WEAVIATE_API_KEY: str = ""
     WEAVIATE_CLASS_NAME: str = "ClinicalDocument"
+    WEAVIATE_BATCH_MODE: str = "fixed"  # fixed, rate_limit, dynamic
+    WEAVIATE_BATCH_SIZE: int = 100
+    WEAVIATE_BATCH_CONCURRENT_REQUESTS: int = 2
+    WEAVIATE_BATCH_REQUESTS_PER_MINUTE: int = 600
+    WEAVIATE_BATCH_RETRIES: int = 2
 
     # LLM (OpenAI)
     OPENAI_API_KEY: str = ""
@@ -60,11 +94,53 @@ class Settings(BaseSettings):
     # Embedding
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DEVICE: str = "cpu"
+    EMBEDDING_BACKEND: str = "torch"  # torch, onnx
+    EMBEDDING_ONNX_QUANTIZE: str = ""  # avx2, avx512, avx512_vnni, arm64; "" keeps fp32
+    EMBEDDING_ONNX_MODEL_DIR: str = "./data/onnx_models"
+    EMBEDDING_INTRA_OP_THREADS: int = 0  # 0 keeps the runtime default
+    EMBEDDING_BATCH_TOKEN_BUDGET: int = 8192  # Padded tokens per batch; 0 uses batch_size
+    EMBEDDING_LONG_TEXT_STRATEGY: str = "truncate"  # truncate, window
+    EMBEDDING_WINDOW_OVERLAP: int = 32  # Tokens shared by consecutive windows
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    EMBEDDING_CACHE_PATH: str = ""  # SQLite file for a disk tier; "" keeps the cache in memory only
+    EMBEDDING_BATCH_WINDOW_SECONDS: float = 0.003
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+    EMBEDDING_SERVER_ENABLED: bool = False  # Embed through the node's shared embedding server
+    EMBEDDING_SERVER_SOCKET: str = "/tmp/agentic-clinical-assistant-embeddings.sock"
+    EMBEDDING_SERVER_CONNECT_TIMEOUT_SECONDS: float = 30.0
+    EMBEDDING_SERVER_TIMEOUT_SECONDS: float = 60.0  # Per request, on the socket
+    EMBEDDING_SERVER_FALLBACK_LOCAL: bool = False  # Embed in process when the server fails
 
     # Agent
     DEFAULT_VECTOR_BACKEND: str = "faiss"
     MAX_RETRIEVAL_RESULTS: int = 10
     ENABLE_MULTI_BACKEND_RETRIEVAL: bool = False
+    VECTOR_EXECUTOR_THREADS: int = 32
+    VECTOR_BACKEND_CONCURRENCY: int = 8
+    VECTOR_FUSION_METHOD: str = "rrf"  # rrf, score
+    VECTOR_RRF_K: int = 60
+    VECTOR_BACKEND_TIMEOUT_SECONDS: float = 2.0
+    VECTOR_HEDGED_REQUESTS: bool = False
+    VECTOR_HEDGE_DELAY_SECONDS: float = 0.1
+    VECTOR_LATENCY_WINDOW: int = 256
+    VECTOR_ADAPTIVE_ROUTING: bool = False
+    VECTOR_ROUTING_EWMA_ALPHA: float = 0.2
+    VECTOR_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    VECTOR_CIRCUIT_RESET_SECONDS: float = 30.0
+    VECTOR_REQUEST_DEADLINE_SECONDS: float = 3.0
+    VECTOR_RETRY_BUDGET_RATIO: float = 0.2
+    VECTOR_LAZY_INIT: bool = False
+    VECTOR_INIT_TIMEOUT_SECONDS: float = 10.0
+    VECTOR_HEALTH_PROBE_INTERVAL_SECONDS: float = 30.0
+    VECTOR_CACHE_ENABLED: bool = False
+    VECTOR_CACHE_MAX_ENTRIES: int = 1024
+    VECTOR_CACHE_TTL_SECONDS: float = 300.0
+    VECTOR_CACHE_SIMILARITY_THRESHOLD: float = 0.0  # 0 disables near-duplicate hits
+    VECTOR_CACHE_WRITE_COUNTER: bool = False  # Share write counts across processes via REDIS_URL
+    VECTOR_CACHE_WRITE_COUNTER_INTERVAL_SECONDS: float = 1.0
+    VECTOR_DEDUP_ENABLED: bool = True
+    VECTOR_DEDUP_INDEX_PATH: str = "./data/dedup"
 
     # Safety & Compliance
     ENABLE_PHI_REDACTION: bool = True
@@ -88,6 +88,71 @@ backend_selected_total = Counter(
     ["backend", "query_type"],  # query_type: policy_lookup, summarize, compare, explain
 )
 
+vector_index_tombstone_ratio = Gauge(
+    "vector_index_tombstone_ratio",
+    "Fraction of vector index rows holding deleted documents",
+    ["backend"],
+)
+
+vector_routing_weight = Gauge(
+    "vector_routing_weight",
+    "Share of traffic the router would send to a vector backend",
+    ["backend", "request_type"],
+)
+
+vector_circuit_state = Gauge(
+    "vector_circuit_state",
+    "Vector backend circuit breaker state (0=closed, 1=half-open, 2=open)",
+    ["backend"],
+)
+
+vector_hedged_requests_total = Counter(
+    "vector_hedged_requests_total",
+    "Total number of hedged requests sent to a secondary vector backend",
+    ["backend"],
+)
+
+vector_ingest_objects_total = Counter(
+    "vector_ingest_objects_total",
+    "Total number of objects sent to a vector backend for import",
+    ["backend", "status"],  # status: imported, failed
+)
+
+vector_ingest_objects_per_second = Gauge(
+    "vector_ingest_objects_per_second",
+    "Import throughput of the last ingestion run",
+    ["backend"],
+)
+
+vector_ingest_documents_total = Counter(
+    "vector_ingest_documents_total",
+    "Total number of documents seen by ingestion, by doc-hash index status",
+    ["backend", "status"],  # status: new, changed, unchanged
+)
+
+embedding_cache_lookups_total = Counter(
+    "embedding_cache_lookups_total",
+    "Total number of embedding cache lookups",
+    ["result"],  # result: memory_hit, disk_hit, miss
+)
+
+embedding_cache_hit_ratio = Gauge(
+    "embedding_cache_hit_ratio",
+    "Fraction of embedding cache lookups answered from memory or disk since startup",
+)
+
+embedding_batch_size = Histogram(
+    "embedding_batch_size",
+    "Texts per micro-batched embedding call",
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128, 256],
+)
+
+vector_cache_lookups_total = Counter(
+    "vector_cache_lookups_total",
+    "Total number of search result cache lookups",
+    ["scope", "result"],  # result: hit, near_hit, miss
+)
+
 # Workflow Metrics
 workflow_duration_ms = Histogram(
     "workflow_duration_ms",
@@ -226,6 +291,115 @@ class MetricsCollector:
         """
         backend_selected_total.labels(backend=backend, query_type=query_type).inc()
 
+    @staticmethod
+    def set_tombstone_ratio(backend: str, ratio: float) -> None:
+        """
+        Set the deleted-row fraction of a vector index.
+
+        Args:
+            backend: Backend name
+            ratio: Fraction of rows holding deleted documents
+        """
+        vector_index_tombstone_ratio.labels(backend=backend).set(ratio)
+
+    @staticmethod
+    def set_routing_weight(backend: str, request_type: str, weight: float) -> None:
+        """
+        Set the routing weight of a vector backend.
+
+        Args:
+            backend: Backend name
+            request_type: Kind of request (search, search_batch)
+            weight: Share of traffic, 0-1
+        """
+        vector_routing_weight.labels(backend=backend, request_type=request_type).set(weight)
+
+    @staticmethod
+    def set_circuit_state(backend: str, level: int) -> None:
+        """
+        Set the circuit breaker state of a vector backend.
+
+        Args:
+            backend: Backend name
+            level: 0 closed, 1 half-open, 2 open
+        """
+        vector_circuit_state.labels(backend=backend).set(level)
+
+    @staticmethod
+    def record_hedged_request(backend: str) -> None:
+        """
+        Record a hedged request.
+
+        Args:
+            backend: Backend the hedged request was sent to
+        """
+        vector_hedged_requests_total.labels(backend=backend).inc()
+
+    @staticmethod
+    def record_ingest(backend: str, imported: int, failed: int, seconds: float) -> None:
+        """
+        Record an ingestion run.
+
+        Args:
+            backend: Backend name
+            imported: Objects imported
+            failed: Objects that failed after retries
+            seconds: Wall time of the run
+        """
+        vector_ingest_objects_total.labels(backend=backend, status="imported").inc(imported)
+        vector_ingest_objects_total.labels(backend=backend, status="failed").inc(failed)
+        if seconds > 0:
+            vector_ingest_objects_per_second.labels(backend=backend).set(imported / seconds)
+
+    @staticmethod
+    def record_dedup(backend: str, counts: Dict[str, int]) -> None:
+        """
+        Record the doc-hash index statuses of an ingestion run.
+
+        Args:
+            backend: Backend name
+            counts: Documents per status (new, changed, unchanged)
+        """
+        for status, count in counts.items():
+            vector_ingest_documents_total.labels(backend=backend, status=status).inc(count)
+
+    @staticmethod
+    def record_embedding_cache(memory_hits: int, disk_hits: int, misses: int, hit_ratio: float) -> None:
+        """
+        Record a batch of embedding cache lookups.
+
+        Args:
+            memory_hits: Texts found in memory
+            disk_hits: Texts found on disk
+            misses: Texts that must be encoded
+            hit_ratio: Cumulative hit ratio of the cache
+        """
+        embedding_cache_lookups_total.labels(result="memory_hit").inc(memory_hits)
+        embedding_cache_lookups_total.labels(result="disk_hit").inc(disk_hits)
+        embedding_cache_lookups_total.labels(result="miss").inc(misses)
+        embedding_cache_hit_ratio.set(hit_ratio)
+
+    @staticmethod
+    def record_embedding_batch(size: int) -> None:
+        """
+        Record the size of a micro-batched embedding call.
+
+        Args:
+            size: Texts in the batch
+        """
+        embedding_batch_size.observe(size)
+
+    @staticmethod
+    def record_cache_lookup(scope: str, result: str) -> None:
+        """
+        Record a search result cache lookup.
+
+        Args:
+            scope: Backend name, or "routed"
+            result: hit, near_hit or miss
+        """
+        vector_cache_lookups_total.labels(scope=scope, result=result).inc()
+
     @staticmethod
     def record_workflow_duration(status: str, duration_ms: float) -> None:
         """
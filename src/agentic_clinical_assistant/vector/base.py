@@ -2,9 +2,20 @@
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Callable, Dict, List, Optional, Sequence, TypeVar, Union
 
-from pydantic import BaseModel
+import numpy as np
+from pydantic import BaseModel, PlainSerializer, PlainValidator
+
+from agentic_clinical_assistant.vector.executor import run_blocking
+
+# A 2-D float32 array, or anything np.asarray turns into one
+QueryMatrix = Union[np.ndarray, Sequence[Sequence[float]]]
+
+# A 1-D float32 array, or anything np.asarray turns into one
+EmbeddingLike = Union[np.ndarray, Sequence[float]]
+
+T = TypeVar("T")
 
 
 class VectorDBBackend(str, Enum):
@@ -15,24 +26,153 @@ class VectorDBBackend(str, Enum):
     WEAVIATE = "weaviate"
 
 
+def as_embedding(embedding: EmbeddingLike) -> np.ndarray:
+    """
+    View an embedding as a 1-D float32 array.
+
+    A float32 array, or a row of a float32 matrix, is returned as is, without
+    a copy; lists are converted once.
+
+    Args:
+        embedding: Embedding vector
+
+    Returns:
+        Float32 vector
+    """
+    vector = np.asarray(embedding, dtype=np.float32)
+    if vector.ndim != 1:
+        raise ValueError(f"Embedding must be 1-D, got shape {vector.shape}")
+    return vector
+
+
+# Kept as a float32 array in memory; becomes a list of floats only in JSON
+Embedding = Annotated[
+    np.ndarray,
+    PlainValidator(as_embedding),
+    PlainSerializer(lambda vector: vector.tolist(), return_type=List[float], when_used="json"),
+]
+
+
 class Document(BaseModel):
     """Document model for vector storage."""
 
     id: str
     text: str
-    embedding: Optional[List[float]] = None
+    embedding: Optional[Embedding] = None
     metadata: Dict[str, Any] = {}
     doc_hash: Optional[str] = None  # SHA-256 hash for verification
 
 
 class SearchResult(BaseModel):
-    """Search result model."""
+    """Search result model, for serializing search hits."""
 
     document: Document
     score: float
     doc_hash: str
 
 
+class SearchHit:
+    """
+    A search hit, as adapters, the manager and agents pass them around.
+
+    Unlike ``SearchResult`` it is a plain slotted object, so a hit costs no
+    validation or nested copies. An adapter may give a ``load`` callable
+    instead of the text, metadata and hash; it runs once, on first access to
+    any of them, so hits dropped by fusion or ``top_k`` are never decoded.
+    Convert with ``to_result`` only where results are serialized.
+    """
+
+    __slots__ = ("id", "score", "_text", "_metadata", "_doc_hash", "_load")
+
+    def __init__(
+        self,
+        id: str,
+        score: float,
+        text: str = "",
+        metadata: Optional[Dict[str, Any]] = None,
+        doc_hash: Optional[str] = None,
+        load: Optional[Callable[[], Dict[str, Any]]] = None,
+    ):
+        """
+        Initialize search hit.
+
+        Args:
+            id: Document ID
+            score: Similarity score
+            text: Document text
+            metadata: Document metadata
+            doc_hash: Document hash
+            load: Returns the document's ``text``, ``metadata`` and ``doc_hash``
+                fields on demand, in place of the three arguments above
+        """
+        self.id = id
+        self.score = score
+        self._text = text
+        self._metadata = metadata
+        self._doc_hash = doc_hash
+        self._load = load
+
+    def __repr__(self) -> str:
+        return f"SearchHit(id={self.id!r}, score={self.score!r})"
+
+    @property
+    def text(self) -> str:
+        """Document text."""
+        self._resolve()
+        return self._text
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Document metadata."""
+        self._resolve()
+        if self._metadata is None:
+            self._metadata = {}
+        return self._metadata
+
+    @property
+    def doc_hash(self) -> str:
+        """Document hash, or an empty string if the document has none."""
+        self._resolve()
+        return self._doc_hash or ""
+
+    def with_score(self, score: float) -> "SearchHit":
+        """Copy of the hit carrying another score, e.g. a fused one."""
+        return SearchHit(self.id, score, self._text, self._metadata, self._doc_hash, self._load)
+
+    def to_document(self) -> Document:
+        """The hit's document, without an embedding."""
+        return Document(id=self.id, text=self.text, metadata=self.metadata, doc_hash=self._doc_hash)
+
+    def to_result(self) -> SearchResult:
+        """Validated result model, for serialization."""
+        return SearchResult(document=self.to_document(), score=self.score, doc_hash=self.doc_hash)
+
+    def _resolve(self) -> None:
+        """Run the loader, if any, once."""
+        if self._load is not None:
+            fields = self._load()
+            self._text = fields.get("text", "")
+            self._metadata = fields.get("metadata")
+            self._doc_hash = fields.get("doc_hash")
+            self._load = None
+
+
+def as_query_matrix(query_embeddings: QueryMatrix) -> np.ndarray:
+    """
+    Convert batch query embeddings into a contiguous 2-D float32 array.
+
+    Args:
+        query_embeddings: One embedding per row
+
+    Returns:
+        Float32 matrix of shape (n_queries, dimension)
+    """
+    matrix = np.ascontiguousarray(query_embeddings, dtype=np.float32)
+    if matrix.ndim != 2:
+        raise ValueError(f"Batch query embeddings must be 2-D, got shape {matrix.shape}")
+    return matrix
+
+
 class VectorDB(ABC):
     """Abstract base class for vector database adapters."""
 
@@ -40,6 +180,22 @@ class VectorDB(ABC):
         """Initialize vector database adapter."""
         self.backend = backend
 
+    async def _run_blocking(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call off the event loop, within this backend's concurrency limit."""
+        return await run_blocking(self.backend.value, func, *args, **kwargs)
+
+    def cache_token(self) -> Optional[str]:
+        """
+        Token that changes when the index is replaced outside this process.
+
+        Cached search results are valid only while the token stays the same.
+        Writes made through ``VectorDBManager`` invalidate them separately.
+
+        Returns:
+            Token, or None if only writes through the manager change the index
+        """
+        return None
+
     @abstractmethod
     async def initialize(self) -> None:
         """Initialize the vector database connection/index."""
@@ -64,11 +220,11 @@ class VectorDB(ABC):
     @abstractmethod
     async def search(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingLike,
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         **kwargs: Any,
-    ) -> List[SearchResult]:
+    ) -> List[SearchHit]:
         """
         Search for similar documents.
 
@@ -79,7 +235,29 @@ class VectorDB(ABC):
             **kwargs: Additional backend-specific parameters
 
         Returns:
-            List of search results with scores
+            Search hits, best first
+        """
+        pass
+
+    @abstractmethod
+    async def search_batch(
+        self,
+        query_embeddings: QueryMatrix,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[List[SearchHit]]:
+        """
+        Search for similar documents for several queries at once.
+
+        Args:
+            query_embeddings: 2-D float32 array with one query embedding per row
+            top_k: Number of results to return per query
+            filters: Metadata filters applied to every query
+            **kwargs: Additional backend-specific parameters
+
+        Returns:
+            One list of search hits per query, in query order
         """
         pass
 
@@ -106,6 +284,19 @@ class VectorDB(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_documents(self, document_ids: List[str]) -> List[Document]:
+        """
+        Get several documents by ID in bulk.
+
+        Args:
+            document_ids: Document IDs
+
+        Returns:
+            Documents found, in the order of their IDs
+        """
+        pass
+
     @abstractmethod
     async def update_document(self, document: Document) -> None:
         """
@@ -0,0 +1,234 @@
+"""Query-result cache in front of vector searches.
+
+Entries are keyed by search scope (a backend, or the routed default), top_k,
+the normalized filters and other search options, and the query itself: its
+normalized text when one is given, else its unit-normalized embedding
+quantized to int8, so float noise between two embeddings of the same question
+does not split the key. Optionally, a query whose embedding has cosine
+similarity of at least ``VECTOR_CACHE_SIMILARITY_THRESHOLD`` with a cached
+query under the same scope, filters and options is answered from that entry.
+
+Each entry stores the validity token current when its search started; the
+manager's token changes on every write and whenever a backend loads a new
+index generation, so a lookup with a different token is a miss. Entries are
+also evicted least-recently-used beyond ``VECTOR_CACHE_MAX_ENTRIES`` and
+expire after ``VECTOR_CACHE_TTL_SECONDS``.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
+from agentic_clinical_assistant.vector.base import SearchHit
+
+# Quantization steps per unit of a normalized embedding component
+QUANTIZATION_LEVELS = 127
+
+Context = Tuple[str, int, str, str]
+CacheKey = Tuple[Context, Tuple[str, str]]
+
+
+def normalize_query_text(text: str) -> str:
+    """Lowercase a query and collapse its whitespace."""
+    return " ".join(text.lower().split())
+
+
+def _canonical(value: Any) -> str:
+    """Order-independent JSON of filters or options."""
+    return json.dumps(value or {}, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def _unit(query_embedding: Sequence[float]) -> np.ndarray:
+    """Query embedding scaled to unit length."""
+    vector = np.asarray(query_embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm > 0 else vector
+
+
+class _Entry:
+    """A cached result list."""
+
+    __slots__ = ("token", "expires_at", "results", "vector")
+
+    def __init__(
+        self,
+        token: Hashable,
+        expires_at: float,
+        results: List[SearchHit],
+        vector: Optional[np.ndarray],
+    ):
+        self.token = token
+        self.expires_at = expires_at
+        self.results = results
+        self.vector = vector
+
+
+class SearchCache:
+    """LRU and TTL cache of search results with optional near-duplicate matching."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        similarity_threshold: Optional[float] = None,
+    ):
+        """
+        Initialize search cache.
+
+        Args:
+            max_entries: Entries kept (default: ``VECTOR_CACHE_MAX_ENTRIES``)
+            ttl_seconds: Entry lifetime (default: ``VECTOR_CACHE_TTL_SECONDS``)
+            similarity_threshold: Cosine similarity for near-duplicate hits, 0
+                to disable (default: ``VECTOR_CACHE_SIMILARITY_THRESHOLD``)
+        """
+        self.max_entries = max_entries or settings.VECTOR_CACHE_MAX_ENTRIES
+        self.ttl_seconds = settings.VECTOR_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self.similarity_threshold = (
+            settings.VECTOR_CACHE_SIMILARITY_THRESHOLD
+            if similarity_threshold is None
+            else similarity_threshold
+        )
+        self._entries: "OrderedDict[CacheKey, _Entry]" = OrderedDict()
+        # Keys of entries holding an embedding, per context, for near-duplicate lookups
+        self._by_context: Dict[Context, Dict[CacheKey, None]] = {}
+
+    def __len__(self) -> int:
+        """Number of cached entries, including expired ones not yet evicted."""
+        return len(self._entries)
+
+    def lookup(
+        self,
+        scope: str,
+        token: Hashable,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        options: Optional[Dict[str, Any]],
+        query_embedding: Optional[Sequence[float]] = None,
+        query_text: Optional[str] = None,
+    ) -> Optional[List[SearchHit]]:
+        """
+        Find cached results for a search.
+
+        Args:
+            scope: Backend name, or the routed scope
+            token: Current validity token of the scope
+            top_k: Number of results requested
+            filters: Metadata filters
+            options: Other search parameters that change results
+            query_embedding: Query vector
+            query_text: Query text; when given it keys the entry instead of the vector
+
+        Returns:
+            A copy of the cached results, or None on a miss
+        """
+        context = self._context(scope, top_k, filters, options)
+        key = (context, self._query_key(query_embedding, query_text))
+        entry = self._valid(key, token)
+        result = "hit"
+        if entry is None and query_embedding is not None and self.similarity_threshold > 0:
+            entry = self._nearest(context, _unit(query_embedding), token)
+            result = "near_hit"
+        if entry is None:
+            MetricsCollector.record_cache_lookup(scope, "miss")
+            return None
+        MetricsCollector.record_cache_lookup(scope, result)
+        return list(entry.results)
+
+    def store(
+        self,
+        scope: str,
+        token: Hashable,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        options: Optional[Dict[str, Any]],
+        results: List[SearchHit],
+        query_embedding: Optional[Sequence[float]] = None,
+        query_text: Optional[str] = None,
+    ) -> None:
+        """
+        Cache the results of a search.
+
+        Args:
+            scope: Backend name, or the routed scope
+            token: Validity token taken before the search started
+            top_k: Number of results requested
+            filters: Metadata filters
+            options: Other search parameters that change results
+            results: Results to cache
+            query_embedding: Query vector
+            query_text: Query text
+        """
+        context = self._context(scope, top_k, filters, options)
+        key = (context, self._query_key(query_embedding, query_text))
+        vector = _unit(query_embedding) if query_embedding is not None else None
+        self._discard(key)
+        self._entries[key] = _Entry(token, time.monotonic() + self.ttl_seconds, list(results), vector)
+        if vector is not None:
+            self._by_context.setdefault(context, {})[key] = None
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._by_context.clear()
+
+    @staticmethod
+    def _context(
+        scope: str, top_k: int, filters: Optional[Dict[str, Any]], options: Optional[Dict[str, Any]]
+    ) -> Context:
+        """Everything but the query that an entry's results depend on."""
+        return scope, top_k, _canonical(filters), _canonical(options)
+
+    @staticmethod
+    def _query_key(
+        query_embedding: Optional[Sequence[float]], query_text: Optional[str]
+    ) -> Tuple[str, str]:
+        """Normalized query text, or a digest of the quantized query embedding."""
+        if query_text:
+            return "text", normalize_query_text(query_text)
+        if query_embedding is None:
+            raise ValueError("A cached search needs a query embedding or query text")
+        quantized = np.round(_unit(query_embedding) * QUANTIZATION_LEVELS).astype(np.int8)
+        return "vector", hashlib.blake2b(quantized.tobytes(), digest_size=16).hexdigest()
+
+    def _valid(self, key: CacheKey, token: Hashable) -> Optional[_Entry]:
+        """The entry under a key if it is current, refreshing its recency; stale ones are dropped."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.token != token or entry.expires_at <= time.monotonic():
+            self._discard(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _nearest(self, context: Context, vector: np.ndarray, token: Hashable) -> Optional[_Entry]:
+        """Most similar current entry of a context at or above the similarity threshold."""
+        keys = list(self._by_context.get(context, ()))
+        if not keys:
+            return None
+        similarities = np.stack([self._entries[key].vector for key in keys]) @ vector
+        for position in np.argsort(-similarities):
+            if similarities[position] < self.similarity_threshold:
+                break
+            entry = self._valid(keys[position], token)
+            if entry is not None:
+                return entry
+        return None
+
+    def _discard(self, key: CacheKey) -> None:
+        """Remove an entry and its near-duplicate registration."""
+        if self._entries.pop(key, None) is None:
+            return
+        context_keys = self._by_context.get(key[0])
+        if context_keys is not None:
+            context_keys.pop(key, None)
+            if not context_keys:
+                del self._by_context[key[0]]
@@ -0,0 +1,173 @@
+"""Doc-hash index that lets ingestion skip documents it has already stored.
+
+Each ingested document is recorded under its document id (the source id when
+it has one, else an id derived from its ``doc_hash``, so id-less documents are
+content-addressed) with the ``doc_hash`` of its text. Before embedding,
+ingestion classifies every incoming document as new (key never stored),
+changed (key stored with another hash) or unchanged (key stored with the same
+hash); only new and changed ones are embedded and inserted.
+
+The key-to-hash table lives in SQLite, one file per backend under
+``VECTOR_DEDUP_INDEX_PATH``. Incoming keys are looked up in bulk, in chunks
+of primary-key ``IN (...)`` queries, so opening the index reads nothing and a
+run costs lookups in proportion to its own documents. Documents deleted from
+the backend are forgotten (``forget_documents``), and the whole table is
+cleared when the backend turns out to be empty, so a re-ingested document is
+stored again.
+
+Only the text is hashed: a change to a document's metadata alone is not
+detected.
+"""
+
+import sqlite3
+import threading
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from agentic_clinical_assistant.config import settings
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+
+class DedupStatus(str, Enum):
+    """Doc-hash index status of an incoming document."""
+
+    NEW = "new"
+    CHANGED = "changed"
+    UNCHANGED = "unchanged"
+
+
+class DocHashIndex:
+    """Persistent record of the documents ingested into one backend."""
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) a doc-hash index.
+
+        Args:
+            path: SQLite file holding the index
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents (doc_key TEXT PRIMARY KEY, doc_hash TEXT NOT NULL)"
+        )
+        self._connection.commit()
+
+    @classmethod
+    def for_backend(cls, backend: str) -> "DocHashIndex":
+        """
+        Open the doc-hash index of a backend under ``VECTOR_DEDUP_INDEX_PATH``.
+
+        Args:
+            backend: Backend name
+
+        Returns:
+            Doc-hash index
+        """
+        return cls(index_path(backend))
+
+    def __len__(self) -> int:
+        """Number of recorded documents."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def classify(self, entries: Sequence[Tuple[str, str]]) -> List[DedupStatus]:
+        """
+        Classify incoming documents against the recorded ones.
+
+        Args:
+            entries: (key, doc_hash) of each document
+
+        Returns:
+            Status of each document, in order
+        """
+        stored = self._stored_hashes([key for key, _ in entries])
+        statuses = []
+        for key, doc_hash in entries:
+            recorded = stored.get(key)
+            if recorded is None:
+                statuses.append(DedupStatus.NEW)
+            elif recorded == doc_hash:
+                statuses.append(DedupStatus.UNCHANGED)
+            else:
+                statuses.append(DedupStatus.CHANGED)
+        return statuses
+
+    def record(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """
+        Record documents as stored in the backend.
+
+        Args:
+            entries: (key, doc_hash) of each document
+        """
+        entries = list(entries)
+        with self._lock:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO documents (doc_key, doc_hash) VALUES (?, ?)", entries
+            )
+            self._connection.commit()
+
+    def remove(self, keys: Iterable[str]) -> None:
+        """
+        Forget documents deleted from the backend, so they count as new again.
+
+        Args:
+            keys: Document keys
+        """
+        with self._lock:
+            self._connection.executemany(
+                "DELETE FROM documents WHERE doc_key = ?", [(key,) for key in keys]
+            )
+            self._connection.commit()
+
+    def clear(self) -> None:
+        """Forget every document, e.g. after the backend's index was reset."""
+        with self._lock:
+            self._connection.execute("DELETE FROM documents")
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _stored_hashes(self, keys: List[str]) -> Dict[str, str]:
+        """Recorded hash of each key that has one, looked up in chunks."""
+        stored: Dict[str, str] = {}
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start : start + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._connection.execute(
+                    f"SELECT doc_key, doc_hash FROM documents WHERE doc_key IN ({placeholders})",
+                    chunk,
+                )
+                stored.update(rows)
+        return stored
+
+
+def index_path(backend: str) -> Path:
+    """SQLite file of a backend's doc-hash index under ``VECTOR_DEDUP_INDEX_PATH``."""
+    return Path(settings.VECTOR_DEDUP_INDEX_PATH) / f"{backend}.sqlite3"
+
+
+def forget_documents(backend: str, document_ids: Sequence[str]) -> None:
+    """
+    Remove deleted documents from a backend's doc-hash index, if it has one.
+
+    Args:
+        backend: Backend name
+        document_ids: Ids of the deleted documents
+    """
+    if not settings.VECTOR_DEDUP_ENABLED or not index_path(backend).exists():
+        return
+    index = DocHashIndex.for_backend(backend)
+    try:
+        index.remove(document_ids)
+    finally:
+        index.close()
@@ -0,0 +1,149 @@
+"""Inference backends for the embedding model.
+
+``EMBEDDING_BACKEND`` selects how ``EmbeddingGenerator`` runs the model:
+
+- ``torch``: PyTorch, as ``SentenceTransformer`` loads it by default.
+- ``onnx``: ONNX Runtime (``pip install -e .[onnx]``). The model is exported
+  to ONNX once, under ``EMBEDDING_ONNX_MODEL_DIR``, and loaded from there on
+  later starts. With ``EMBEDDING_ONNX_QUANTIZE`` set to an instruction-set
+  preset (``avx2``, ``avx512``, ``avx512_vnni`` or ``arm64``), the export is
+  also dynamically quantized to int8 weights, which is smaller and faster on
+  CPU at a small cost in accuracy.
+
+``EMBEDDING_INTRA_OP_THREADS`` caps the threads each backend uses inside one
+forward pass (0 keeps the runtime default, one per core), so several worker
+processes on a host do not oversubscribe its cores.
+
+Both backends return a ``SentenceTransformer``, so ``encode`` and everything
+built on it are unchanged. Further backends register a loader in ``LOADERS``.
+"""
+
+from pathlib import Path
+from typing import Callable, Dict
+
+from sentence_transformers import SentenceTransformer
+
+from agentic_clinical_assistant.config import settings
+
+# (model name, device, int8 quantization preset or "", intra-op threads or 0) -> model
+Loader = Callable[[str, str, str, int], SentenceTransformer]
+
+
+def load_torch(model_name: str, device: str, quantize: str, threads: int) -> SentenceTransformer:
+    """
+    Load the model for PyTorch inference.
+
+    Args:
+        model_name: Sentence transformer model name or path
+        device: Device to use ('cpu' or 'cuda')
+        quantize: Must be "": int8 inference needs the ONNX backend
+        threads: Intra-op threads, 0 for the default
+
+    Returns:
+        Loaded model
+
+    Raises:
+        ValueError: If quantization is requested
+    """
+    if quantize:
+        raise ValueError("EMBEDDING_ONNX_QUANTIZE requires EMBEDDING_BACKEND=onnx")
+    if threads:
+        import torch
+
+        torch.set_num_threads(threads)
+    return SentenceTransformer(model_name, device=device)
+
+
+def load_onnx(model_name: str, device: str, quantize: str, threads: int) -> SentenceTransformer:
+    """
+    Load the model for ONNX Runtime inference, exporting it on first use.
+
+    Args:
+        model_name: Sentence transformer model name or path
+        device: Device to use ('cpu' or 'cuda')
+        quantize: Dynamic int8 quantization preset, "" for full precision
+        threads: Intra-op threads, 0 for the default
+
+    Returns:
+        Loaded model
+    """
+    import onnxruntime as ort
+
+    session_options = ort.SessionOptions()
+    if threads:
+        session_options.intra_op_num_threads = threads
+    model_kwargs = {
+        "provider": "CUDAExecutionProvider" if device == "cuda" else "CPUExecutionProvider",
+        "session_options": session_options,
+    }
+
+    export_dir = Path(settings.EMBEDDING_ONNX_MODEL_DIR) / model_name.replace("/", "__")
+    file_name = f"onnx/model_qint8_{quantize}.onnx" if quantize else "onnx/model.onnx"
+
+    if not (export_dir / "onnx" / "model.onnx").exists():
+        exported = SentenceTransformer(
+            model_name, device=device, backend="onnx", model_kwargs=dict(model_kwargs)
+        )
+        exported.save_pretrained(str(export_dir))
+        if not quantize:
+            return exported
+    if quantize and not (export_dir / file_name).exists():
+        from sentence_transformers import export_dynamic_quantized_onnx_model
+
+        exported = SentenceTransformer(
+            str(export_dir), device=device, backend="onnx", model_kwargs=dict(model_kwargs)
+        )
+        export_dynamic_quantized_onnx_model(exported, quantize, str(export_dir))
+
+    return SentenceTransformer(
+        str(export_dir),
+        device=device,
+        backend="onnx",
+        model_kwargs={**model_kwargs, "file_name": file_name},
+    )
+
+
+# Loader of each EMBEDDING_BACKEND value
+LOADERS: Dict[str, Loader] = {
+    "torch": load_torch,
+    "onnx": load_onnx,
+}
+
+
+def load_model(model_name: str, device: str, backend: str, quantize: str = "") -> SentenceTransformer:
+    """
+    Load the embedding model for an inference backend.
+
+    Args:
+        model_name: Sentence transformer model name or path
+        device: Device to use ('cpu' or 'cuda')
+        backend: Backend name, a key of ``LOADERS``
+        quantize: Int8 quantization preset, "" for none
+
+    Returns:
+        Loaded model
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    loader = LOADERS.get(backend)
+    if loader is None:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    return loader(model_name, device, quantize, settings.EMBEDDING_INTRA_OP_THREADS)
+
+
+def model_key(model_name: str, quantize: str) -> str:
+    """
+    Name under which a backend's embeddings of a model are cached.
+
+    Int8 weights change the vectors slightly, so a quantized model gets its
+    own key; full-precision backends agree and share the model name.
+
+    Args:
+        model_name: Sentence transformer model name or path
+        quantize: Int8 quantization preset, "" for none
+
+    Returns:
+        Cache key
+    """
+    return f"{model_name}#qint8-{quantize}" if quantize else model_name
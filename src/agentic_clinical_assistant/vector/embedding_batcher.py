@@ -0,0 +1,134 @@
+"""Coalesce concurrent single-text embedding requests into batches.
+
+A busy process embeds one query per request; run one by one, that is a
+forward pass per text. ``EmbeddingBatcher.embed`` instead queues the text and
+awaits its row of a shared batch. A batch is sent once its oldest request has
+waited ``EMBEDDING_BATCH_WINDOW_SECONDS`` or ``EMBEDDING_BATCH_MAX_SIZE`` texts
+are queued, whichever comes first, and is encoded by one
+``generate_embeddings`` call on the shared thread pool. One batch is encoded at
+a time per event loop; requests arriving meanwhile form the next batch, so
+batches grow with load while a lone request waits at most the window.
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
+from agentic_clinical_assistant.vector.embeddings import EmbeddingGenerator, get_embedding_generator
+from agentic_clinical_assistant.vector.executor import run_blocking
+
+# Concurrency-limit key of embedding calls on the shared thread pool
+EXECUTOR_KEY = "embedding"
+
+# Text, the caller's future, and when it was queued
+Request = Tuple[str, "asyncio.Future[np.ndarray]", float]
+
+
+class EmbeddingBatcher:
+    """Micro-batcher in front of an ``EmbeddingGenerator``."""
+
+    def __init__(
+        self,
+        generator: Optional[EmbeddingGenerator] = None,
+        window_seconds: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        model_lock: Optional[asyncio.Lock] = None,
+    ):
+        """
+        Initialize embedding batcher.
+
+        Args:
+            generator: Embedding generator (default: the global one)
+            window_seconds: Longest a request waits for others to join its batch
+                (default: ``EMBEDDING_BATCH_WINDOW_SECONDS``)
+            max_batch_size: Texts per batch (default: ``EMBEDDING_BATCH_MAX_SIZE``)
+            model_lock: Held while a batch is encoded, to share the model with
+                other callers one encode at a time
+        """
+        self.generator = generator or get_embedding_generator()
+        self.window_seconds = (
+            settings.EMBEDDING_BATCH_WINDOW_SECONDS if window_seconds is None else window_seconds
+        )
+        self.max_batch_size = max_batch_size or settings.EMBEDDING_BATCH_MAX_SIZE
+        self.model_lock = model_lock
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Request] = []
+        self._full = asyncio.Event()
+        self._worker: Optional["asyncio.Task[None]"] = None
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Embed one text as part of the next batch.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Float32 embedding vector
+        """
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Queues and tasks belong to one loop; a new loop (e.g. per Celery task) starts afresh
+            self._loop = loop
+            self._pending = []
+            self._full = asyncio.Event()
+            self._worker = None
+
+        future: "asyncio.Future[np.ndarray]" = loop.create_future()
+        self._pending.append((text, future, time.monotonic()))
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._dispatch())
+        return await future
+
+    async def _dispatch(self) -> None:
+        """Send batches until the queue is empty."""
+        while self._pending:
+            remaining = self.window_seconds - (time.monotonic() - self._pending[0][2])
+            if remaining > 0 and len(self._pending) < self.max_batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), remaining)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            if len(self._pending) < self.max_batch_size:
+                self._full.clear()
+            await self._encode(batch)
+
+    async def _encode(self, batch: List[Request]) -> None:
+        """Encode one batch and resolve its requests."""
+        MetricsCollector.record_embedding_batch(len(batch))
+        texts = [text for text, _, _ in batch]
+        try:
+            async with self.model_lock or contextlib.nullcontext():
+                embeddings = await run_blocking(
+                    EXECUTOR_KEY, self.generator.generate_embeddings, texts, batch_size=len(texts)
+                )
+        except Exception as exc:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future, _), embedding in zip(batch, embeddings):
+            if not future.done():  # The caller may have been cancelled
+                future.set_result(embedding)
+
+
+# Global embedding batcher instance
+_embedding_batcher: Optional[EmbeddingBatcher] = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Get or create the global embedding batcher."""
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        _embedding_batcher = EmbeddingBatcher()
+    return _embedding_batcher
@@ -0,0 +1,182 @@
+"""Content-addressed cache of text embeddings.
+
+Embeddings are keyed by the model name and the SHA-256 of the text, so the
+same text embedded by the same model is encoded once. Two tiers:
+
+- an in-process LRU of up to ``EMBEDDING_CACHE_MAX_ENTRIES`` vectors, and
+- optionally, a SQLite file at ``EMBEDDING_CACHE_PATH`` holding every vector
+  as a float32 blob, shared by the processes on a host and kept across
+  restarts. It is never pruned, so it is off (an empty path) by default.
+
+Disk hits are promoted into the LRU. Cached vectors are read-only arrays, so a
+caller cannot change what later callers get.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
+
+# SQLite's default limit on host parameters per statement is 999
+_QUERY_CHUNK = 500
+
+
+def text_key(text: str) -> str:
+    """SHA-256 of a text, as hex."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Two-tier (memory, then SQLite) cache of one model's embeddings."""
+
+    def __init__(
+        self,
+        model_name: str,
+        max_entries: Optional[int] = None,
+        path: Optional[str] = None,
+    ):
+        """
+        Initialize embedding cache.
+
+        Args:
+            model_name: Model whose embeddings are cached
+            max_entries: Vectors kept in memory (default: ``EMBEDDING_CACHE_MAX_ENTRIES``)
+            path: SQLite file, "" for memory only (default: ``EMBEDDING_CACHE_PATH``)
+        """
+        self.model_name = model_name
+        self.max_entries = max_entries or settings.EMBEDDING_CACHE_MAX_ENTRIES
+        self.path = settings.EMBEDDING_CACHE_PATH if path is None else path
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.lookups = 0
+
+    def __len__(self) -> int:
+        """Number of vectors held in memory."""
+        return len(self._memory)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Fraction of lookups answered from either tier."""
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look texts up, in memory first, then on disk.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            Cached embedding of each text, or None for a miss
+        """
+        keys = [text_key(text) for text in texts]
+        found: List[Optional[np.ndarray]] = [None] * len(keys)
+        with self._lock:
+            missing = []
+            for position, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is None:
+                    missing.append(position)
+                else:
+                    self._memory.move_to_end(key)
+                    found[position] = vector
+            memory_hits = len(keys) - len(missing)
+
+            stored = self._load([keys[position] for position in missing])
+            for position in missing:
+                vector = stored.get(keys[position])
+                if vector is not None:
+                    found[position] = vector
+                    self._remember(keys[position], vector)
+            disk_hits = sum(1 for position in missing if found[position] is not None)
+
+            self.hits += memory_hits + disk_hits
+            self.lookups += len(keys)
+            hit_ratio = self.hit_ratio
+
+        MetricsCollector.record_embedding_cache(
+            memory_hits, disk_hits, len(keys) - memory_hits - disk_hits, hit_ratio
+        )
+        return found
+
+    def put_many(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        """
+        Cache the embeddings of texts in both tiers.
+
+        Args:
+            texts: Embedded texts
+            embeddings: Float32 matrix with one embedding per text
+        """
+        entries: List[Tuple[str, np.ndarray]] = []
+        for text, embedding in zip(texts, embeddings):
+            vector = np.array(embedding, dtype=np.float32)
+            vector.flags.writeable = False
+            entries.append((text_key(text), vector))
+
+        with self._lock:
+            for key, vector in entries:
+                self._remember(key, vector)
+            connection = self._open()
+            if connection is not None:
+                connection.executemany(
+                    "INSERT OR IGNORE INTO embeddings (model, text_hash, vector) VALUES (?, ?, ?)",
+                    [(self.model_name, key, vector.tobytes()) for key, vector in entries],
+                )
+                connection.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection, if open."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Put a vector in the LRU, evicting the least recently used beyond capacity."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Vectors stored on disk for the keys that have one."""
+        connection = self._open()
+        if connection is None or not keys:
+            return {}
+        stored = {}
+        for start in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[start : start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = connection.execute(
+                "SELECT text_hash, vector FROM embeddings "
+                f"WHERE model = ? AND text_hash IN ({placeholders})",
+                [self.model_name, *chunk],
+            )
+            for key, blob in rows:
+                # frombuffer over bytes is read-only and shares the blob
+                stored[key] = np.frombuffer(blob, dtype=np.float32)
+        return stored
+
+    def _open(self) -> Optional[sqlite3.Connection]:
+        """SQLite connection to the disk tier, opened on first use; None if disabled."""
+        if not self.path:
+            return None
+        if self._connection is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "model TEXT NOT NULL, text_hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                "PRIMARY KEY (model, text_hash)) WITHOUT ROWID"
+            )
+            self._connection.commit()
+        return self._connection
@@ -0,0 +1,201 @@
+"""Thin client of the node's shared embedding server.
+
+``EmbeddingClient`` is an ``EmbeddingGenerator`` without a model: encoding is
+forwarded to the ``embedding_server`` process over its Unix socket, so callers
+of ``get_embedding_generator()`` work unchanged when
+``EMBEDDING_SERVER_ENABLED`` is set. The server holds the model and the
+embedding cache; the client holds neither, and costs no model load.
+
+Each thread keeps its own connection open, and a forked child opens its own.
+A request that fails on a dropped connection is resent once on a new one
+(embedding is idempotent). The client's first connection waits up to
+``EMBEDDING_SERVER_CONNECT_TIMEOUT_SECONDS`` for the server, which may still
+be starting; later connections try once, and after a failed attempt requests
+fail at once for ``RECONNECT_BACKOFF_SECONDS`` instead of each waiting for the
+server again. A request the server does not answer within
+``EMBEDDING_SERVER_TIMEOUT_SECONDS`` fails with ``EmbeddingServerError``.
+With ``EMBEDDING_SERVER_FALLBACK_LOCAL`` a failed request is embedded in
+process instead, loading the model on first use.
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Any, List, Optional, Union
+
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.vector.embedding_server import FRAME_HEADER, encode_frame
+from agentic_clinical_assistant.vector.embeddings import EmbeddingGenerator
+
+logger = logging.getLogger(__name__)
+
+# Seconds requests skip the server after a failed connection attempt
+RECONNECT_BACKOFF_SECONDS = 5.0
+
+
+class EmbeddingServerError(RuntimeError):
+    """The embedding server could not be reached or failed a request."""
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    """Read exactly `size` bytes from a socket."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            raise ConnectionError("Embedding server closed the connection")
+        received += count
+    return buffer
+
+
+class EmbeddingClient(EmbeddingGenerator):
+    """Embedding generator backed by the shared embedding server."""
+
+    def __init__(
+        self,
+        socket_path: Optional[str] = None,
+        connect_timeout: Optional[float] = None,
+        timeout: Optional[float] = None,
+        fallback_local: Optional[bool] = None,
+    ):
+        """
+        Initialize embedding client.
+
+        Args:
+            socket_path: Server socket (default: ``EMBEDDING_SERVER_SOCKET``)
+            connect_timeout: Seconds to wait for the server when connecting
+                (default: ``EMBEDDING_SERVER_CONNECT_TIMEOUT_SECONDS``)
+            timeout: Seconds a request may wait on the socket
+                (default: ``EMBEDDING_SERVER_TIMEOUT_SECONDS``)
+            fallback_local: Embed in process when the server fails
+                (default: ``EMBEDDING_SERVER_FALLBACK_LOCAL``)
+        """
+        super().__init__(cache=None)
+        self.cache = None  # The server caches
+        self.socket_path = socket_path or settings.EMBEDDING_SERVER_SOCKET
+        self.connect_timeout = (
+            settings.EMBEDDING_SERVER_CONNECT_TIMEOUT_SECONDS
+            if connect_timeout is None
+            else connect_timeout
+        )
+        self.timeout = settings.EMBEDDING_SERVER_TIMEOUT_SECONDS if timeout is None else timeout
+        self.fallback_local = (
+            settings.EMBEDDING_SERVER_FALLBACK_LOCAL if fallback_local is None else fallback_local
+        )
+        self._local = threading.local()
+        # Only the first connection waits for the server to come up
+        self._waited_for_server = False
+        self._retry_at = 0.0
+        self._fallback: Optional[EmbeddingGenerator] = None
+        self._fallback_lock = threading.Lock()
+
+    def _load_model(self) -> None:
+        """The model lives in the server."""
+
+    def _encode(self, texts: Union[str, List[str]], **kwargs: Any) -> np.ndarray:
+        """Embed one text or a list of texts on the server."""
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+        request = {"texts": batch, "batch_size": kwargs.get("batch_size", 32)}
+        try:
+            embeddings = self._request_with_retry(request)
+        except EmbeddingServerError as exc:
+            if not self.fallback_local:
+                raise
+            logger.warning("Embedding server failed, embedding locally: %s", exc)
+            return self._fallback_generator()._encode(texts, **kwargs)
+        return embeddings[0] if single else embeddings
+
+    def _request_with_retry(self, request: dict) -> np.ndarray:
+        """Send a request, resending it once on a new connection if the old one dropped."""
+        try:
+            try:
+                return self._request(request)
+            except ConnectionError:
+                self.close()
+                return self._request(request)
+        except socket.timeout as exc:
+            # A late answer would be read as the reply to the next request
+            self.close()
+            raise EmbeddingServerError(
+                f"Embedding server did not answer within {self.timeout} seconds"
+            ) from exc
+        except ConnectionError as exc:
+            self.close()
+            raise EmbeddingServerError(f"Embedding server connection failed: {exc}") from exc
+
+    def _fallback_generator(self) -> EmbeddingGenerator:
+        """In-process generator for requests the server failed, created on first use."""
+        with self._fallback_lock:
+            if self._fallback is None:
+                self._fallback = EmbeddingGenerator(model_name=self.model_name, device=self.device)
+            return self._fallback
+
+    @property
+    def dimension(self) -> int:
+        """Get the embedding dimension."""
+        if self._dimension is None:
+            self._dimension = len(self._encode("test"))
+        return self._dimension
+
+    def close(self) -> None:
+        """Close this thread's connection, if open."""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _request(self, request: dict) -> np.ndarray:
+        """Send one request and read its embeddings."""
+        sock = self._connection()
+        sock.sendall(encode_frame(request))
+        (size,) = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+        header = json.loads(_recv_exactly(sock, size))
+        if "error" in header:
+            raise EmbeddingServerError(header["error"])
+        rows, dimension = header["shape"]
+        body = _recv_exactly(sock, rows * dimension * 4)
+        return np.frombuffer(body, dtype=np.float32).reshape(rows, dimension)
+
+    def _connection(self) -> socket.socket:
+        """This thread's connection, opened on first use."""
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            if self._local.pid == os.getpid():
+                return sock
+            sock.close()  # Inherited across a fork; the parent keeps its own
+
+        now = time.monotonic()
+        if now < self._retry_at:
+            raise EmbeddingServerError(
+                f"Embedding server not reachable at {self.socket_path}; "
+                f"retrying in {self._retry_at - now:.1f} seconds"
+            )
+
+        deadline = now + (0.0 if self._waited_for_server else self.connect_timeout)
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError) as exc:
+                sock.close()
+                if time.monotonic() >= deadline:
+                    self._waited_for_server = True
+                    self._retry_at = time.monotonic() + RECONNECT_BACKOFF_SECONDS
+                    raise EmbeddingServerError(
+                        f"Embedding server not reachable at {self.socket_path}"
+                    ) from exc
+                time.sleep(0.1)
+        self._waited_for_server = True
+        self._local.sock = sock
+        self._local.pid = os.getpid()
+        return sock
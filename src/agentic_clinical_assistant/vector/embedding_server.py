@@ -0,0 +1,205 @@
+"""Shared embedding server for the worker processes of a node.
+
+Each Celery prefork child that embeds loads its own copy of the model, and
+reloads it whenever ``worker_max_tasks_per_child`` recycles the child. With
+``EMBEDDING_SERVER_ENABLED``, one server process per node holds the only copy
+and ``get_embedding_generator()`` returns an ``EmbeddingClient`` that sends
+texts to it over the Unix socket at ``EMBEDDING_SERVER_SOCKET``.
+
+The server answers every connection on one event loop. Single-text requests
+(queries) from all workers go through one ``EmbeddingBatcher``, so they are
+batched centrally; multi-text requests (ingestion) are encoded as they are,
+through the same generator and embedding cache. The model runs one encode at
+a time, a query batch or one multi-text request, so concurrent requests do not
+oversubscribe the CPU or call into the model from several threads.
+
+Wire format, per request on a kept-open connection: a 4-byte big-endian
+length and a JSON header ``{"texts": [...], "batch_size": n}``. The response
+is a length-prefixed JSON header ``{"shape": [rows, dim]}`` followed by the
+float32 matrix as raw bytes, or ``{"error": "..."}`` alone.
+
+Run it with ``python -m agentic_clinical_assistant.vector.embedding_server``.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.vector.embedding_batcher import EXECUTOR_KEY, EmbeddingBatcher
+from agentic_clinical_assistant.vector.embeddings import EmbeddingGenerator
+from agentic_clinical_assistant.vector.executor import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Length prefix of each JSON header
+FRAME_HEADER = struct.Struct("!I")
+
+# Largest JSON header accepted, so a bad client cannot make the server buffer without bound
+MAX_HEADER_BYTES = 256 * 1024 * 1024
+
+
+def encode_frame(header: Dict[str, Any]) -> bytes:
+    """Serialize a JSON header with its length prefix."""
+    payload = json.dumps(header).encode("utf-8")
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+class EmbeddingServer:
+    """Unix socket server embedding texts for the processes of one node."""
+
+    def __init__(
+        self,
+        generator: Optional[EmbeddingGenerator] = None,
+        socket_path: Optional[str] = None,
+    ):
+        """
+        Initialize embedding server.
+
+        Args:
+            generator: Embedding generator (default: a new one, loaded at start)
+            socket_path: Unix socket to listen on (default: ``EMBEDDING_SERVER_SOCKET``)
+        """
+        self.generator = generator or EmbeddingGenerator()
+        self.socket_path = socket_path or settings.EMBEDDING_SERVER_SOCKET
+        # Serializes encodes on the one model copy
+        self._model_lock = asyncio.Lock()
+        self.batcher = EmbeddingBatcher(self.generator, model_lock=self._model_lock)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+
+    async def start(self) -> None:
+        """
+        Load the model and start listening, replacing a stale socket file.
+
+        Raises:
+            RuntimeError: If another server is listening on the socket
+        """
+        # Load before listening, so no client request pays the load
+        await run_blocking(EXECUTOR_KEY, lambda: self.generator.dimension)
+        path = Path(self.socket_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists():
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(str(path))
+            except ConnectionRefusedError:
+                path.unlink()  # Left behind by a server that did not stop cleanly
+            else:
+                raise RuntimeError(f"An embedding server is already listening on {path}")
+            finally:
+                probe.close()
+        self._server = await asyncio.start_unix_server(self._handle, path=str(path))
+        logger.info("Embedding server for %s listening on %s", self.generator.model_name, path)
+
+    async def stop(self) -> None:
+        """Stop listening, drop client connections and remove the socket file."""
+        if self._server is not None:
+            self._server.close()
+            # Clients keep connections open, and wait_closed waits for them (Python 3.12+)
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def serve_forever(self) -> None:
+        """Start, and serve until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def embed(self, texts: list, batch_size: int) -> np.ndarray:
+        """
+        Embed the texts of one request.
+
+        Args:
+            texts: Input texts
+            batch_size: Batch size requested by the client
+
+        Returns:
+            Float32 matrix with one embedding per text
+        """
+        if not texts:
+            return np.empty((0, self.generator.dimension), dtype=np.float32)
+        if len(texts) == 1:
+            return (await self.batcher.embed(texts[0]))[None, :]
+        async with self._model_lock:
+            return await run_blocking(
+                EXECUTOR_KEY, self.generator.generate_embeddings, texts, batch_size=batch_size
+            )
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one client connection until it closes."""
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    (size,) = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+                except asyncio.IncompleteReadError:
+                    return
+                if size > MAX_HEADER_BYTES:
+                    writer.write(encode_frame({"error": f"Request of {size} bytes is too large"}))
+                    return
+                payload = await reader.readexactly(size)
+
+                try:
+                    request = json.loads(payload)
+                    embeddings = await self.embed(
+                        list(request["texts"]), int(request.get("batch_size", 32))
+                    )
+                except Exception as exc:
+                    logger.exception("Embedding request failed")
+                    writer.write(encode_frame({"error": f"{type(exc).__name__}: {exc}"}))
+                else:
+                    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+                    writer.write(encode_frame({"shape": list(embeddings.shape)}))
+                    writer.write(memoryview(embeddings).cast("B"))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+
+async def _serve(server: EmbeddingServer) -> None:
+    """Serve until SIGTERM or SIGINT, then remove the socket."""
+    task = asyncio.current_task()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(signum, task.cancel)
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        logger.info("Embedding server stopped")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Shared embedding server")
+    parser.add_argument(
+        "--socket", default=None, help="Unix socket path (default: EMBEDDING_SERVER_SOCKET)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    # At INFO, SentenceTransformer.encode would draw a progress bar per batch
+    logging.getLogger("sentence_transformers").setLevel(logging.WARNING)
+    asyncio.run(_serve(EmbeddingServer(socket_path=args.socket)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,41 @@
 """Embedding generation utilities."""
 
 import hashlib
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Union
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
 from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.vector.embedding_backends import load_model, model_key
+from agentic_clinical_assistant.vector.embedding_cache import EmbeddingCache
+from agentic_clinical_assistant.vector.length_batching import token_buckets, token_windows
 
 
 class EmbeddingGenerator:
-    """Generate embeddings for text documents."""
+    """
+    Generate embeddings for text documents.
+
+    Embeddings are returned as float32 NumPy arrays, not lists, so they reach
+    ``Document.embedding`` and the adapters without per-float copies. With
+    ``EMBEDDING_CACHE_ENABLED``, texts embedded before are served from an
+    ``EmbeddingCache`` and only the misses are encoded. The model runs on the
+    ``EMBEDDING_BACKEND`` inference backend (see ``embedding_backends``).
+    Texts are encoded in buckets of similar token length within
+    ``EMBEDDING_BATCH_TOKEN_BUDGET`` rather than in input order, and texts
+    beyond the model's maximum sequence length are truncated or, with
+    ``EMBEDDING_LONG_TEXT_STRATEGY=window``, embedded as averaged windows (see
+    ``length_batching``).
+    """
 
     def __init__(
         self,
         model_name: Optional[str] = None,
         device: Optional[str] = None,
+        cache: Optional[EmbeddingCache] = None,
+        backend: Optional[str] = None,
+        quantize: Optional[str] = None,
+        long_text_strategy: Optional[str] = None,
     ):
         """
         Initialize embedding generator.
@@ -22,18 +43,36 @@ class EmbeddingGenerator:
         Args:
             model_name: Name of the sentence transformer model
             device: Device to use ('cpu' or 'cuda')
+            cache: Embedding cache (default: one for the model when
+                ``EMBEDDING_CACHE_ENABLED``, else none)
+            backend: Inference backend, 'torch' or 'onnx' (default: ``EMBEDDING_BACKEND``)
+            quantize: Int8 quantization preset of the ONNX backend, "" for none
+                (default: ``EMBEDDING_ONNX_QUANTIZE`` with the ONNX backend)
+            long_text_strategy: 'truncate' or 'window' for texts longer than the
+                model accepts (default: ``EMBEDDING_LONG_TEXT_STRATEGY``)
         """
         self.model_name = model_name or settings.EMBEDDING_MODEL
         self.device = device or settings.EMBEDDING_DEVICE
+        self.backend = backend or settings.EMBEDDING_BACKEND
+        if quantize is None:
+            quantize = settings.EMBEDDING_ONNX_QUANTIZE if self.backend == "onnx" else ""
+        self.quantize = quantize
+        self.long_text_strategy = long_text_strategy or settings.EMBEDDING_LONG_TEXT_STRATEGY
         self.model: Optional[SentenceTransformer] = None
         self._dimension: Optional[int] = None
+        if cache is None and settings.EMBEDDING_CACHE_ENABLED:
+            key = model_key(self.model_name, self.quantize)
+            if self.long_text_strategy == "window":
+                key += "#window"  # Long texts embed differently than when truncated
+            cache = EmbeddingCache(key)
+        self.cache = cache
 
     def _load_model(self) -> None:
         """Lazy load the embedding model."""
         if self.model is None:
-            self.model = SentenceTransformer(self.model_name, device=self.device)
+            self.model = load_model(self.model_name, self.device, self.backend, self.quantize)
 
-    def generate_embedding(self, text: str) -> List[float]:
+    def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text.
 
@@ -41,30 +80,121 @@ class EmbeddingGenerator:
             text: Input text
 
         Returns:
-            Embedding vector as list of floats
+            Float32 embedding vector
         """
-        self._load_model()
-        if self.model is None:
-            raise RuntimeError("Model not loaded")
-        embedding = self.model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        if self.cache is not None:
+            return self.generate_embeddings([text])[0]
+        embedding = self._encode(text)
+        return np.asarray(embedding, dtype=np.float32)
 
-    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+    def generate_embeddings(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
         """
         Generate embeddings for multiple texts.
 
+        Only texts missing from the cache are encoded, each distinct one once.
+
         Args:
             texts: List of input texts
             batch_size: Batch size for processing
 
         Returns:
-            List of embedding vectors
+            Float32 matrix with one embedding per row; rows are views, so
+            documents built from them share the matrix
         """
+        if self.cache is None or not texts:
+            embeddings = self._encode(texts, batch_size=batch_size)
+            return np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        cached = self.cache.get_many(texts)
+        misses = list(dict.fromkeys(text for text, vector in zip(texts, cached) if vector is None))
+        encoded = {}
+        if misses:
+            embeddings = np.asarray(self._encode(misses, batch_size=batch_size), dtype=np.float32)
+            self.cache.put_many(misses, embeddings)
+            encoded = dict(zip(misses, embeddings))
+
+        dimension = len(cached[0]) if cached[0] is not None else len(encoded[texts[0]])
+        matrix = np.empty((len(texts), dimension), dtype=np.float32)
+        for row, (text, vector) in enumerate(zip(texts, cached)):
+            matrix[row] = encoded[text] if vector is None else vector
+        return matrix
+
+    def _encode(self, texts: Union[str, List[str]], **kwargs: Any) -> np.ndarray:
+        """Run the model on one text or a list of texts."""
         self._load_model()
         if self.model is None:
             raise RuntimeError("Model not loaded")
-        embeddings = self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
-        return embeddings.tolist()
+        by_length = settings.EMBEDDING_BATCH_TOKEN_BUDGET or self.long_text_strategy == "window"
+        if getattr(self.model, "tokenizer", None) is None or not by_length or not texts:
+            return self.model.encode(texts, convert_to_numpy=True, **kwargs)
+        if isinstance(texts, str):
+            return self._encode_by_length([texts], **kwargs)[0]
+        return self._encode_by_length(texts, **kwargs)
+
+    def _encode_by_length(
+        self, texts: List[str], batch_size: int = 32, **kwargs: Any
+    ) -> np.ndarray:
+        """
+        Encode texts in token-length buckets, windowing long ones if configured.
+
+        Args:
+            texts: Input texts
+            batch_size: Texts per batch when ``EMBEDDING_BATCH_TOKEN_BUDGET`` is 0
+            **kwargs: Passed to ``encode``
+
+        Returns:
+            Float32 matrix with one embedding per text, in input order
+        """
+        tokenizer = self.model.tokenizer
+        max_length = self.model.max_seq_length
+        special_tokens = tokenizer.num_special_tokens_to_add(pair=False)
+        token_ids = tokenizer(texts, add_special_tokens=False, verbose=False)["input_ids"]
+
+        # Each text becomes one segment, or one per window; owners maps segments to texts
+        owners: List[int] = []
+        segments: List[str] = []
+        lengths: List[int] = []
+        for position, (text, ids) in enumerate(zip(texts, token_ids)):
+            windows: Sequence[Sequence[int]] = [ids]
+            if self.long_text_strategy == "window":
+                windows = token_windows(
+                    ids, max_length - special_tokens, settings.EMBEDDING_WINDOW_OVERLAP
+                )
+            for window in windows:
+                owners.append(position)
+                segments.append(text if len(windows) == 1 else tokenizer.decode(window))
+                lengths.append(min(len(window) + special_tokens, max_length))
+
+        token_budget = settings.EMBEDDING_BATCH_TOKEN_BUDGET
+        if token_budget:
+            rows: Optional[np.ndarray] = None
+            for bucket in token_buckets(lengths, token_budget):
+                encoded = self.model.encode(
+                    [segments[i] for i in bucket],
+                    batch_size=len(bucket),
+                    convert_to_numpy=True,
+                    **kwargs,
+                )
+                if rows is None:
+                    rows = np.empty((len(segments), encoded.shape[1]), dtype=np.float32)
+                rows[bucket] = encoded
+        else:
+            rows = np.asarray(
+                self.model.encode(segments, batch_size=batch_size, convert_to_numpy=True, **kwargs),
+                dtype=np.float32,
+            )
+
+        if len(segments) == len(texts):
+            return rows
+
+        # Average the windows of each text; keep unit length if the model normalizes
+        owner_index = np.asarray(owners)
+        embeddings = np.zeros((len(texts), rows.shape[1]), dtype=np.float32)
+        np.add.at(embeddings, owner_index, rows)
+        embeddings /= np.bincount(owner_index, minlength=len(texts))[:, None]
+        if np.allclose(np.linalg.norm(rows, axis=1), 1.0, atol=1e-3):
+            embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings
 
     @property
     def dimension(self) -> int:
@@ -96,9 +226,19 @@ _embedding_generator: Optional[EmbeddingGenerator] = None
 
 
 def get_embedding_generator() -> EmbeddingGenerator:
-    """Get or create the global embedding generator."""
+    """
+    Get or create the global embedding generator.
+
+    With ``EMBEDDING_SERVER_ENABLED`` this is an ``EmbeddingClient`` of the
+    node's embedding server, and no model is loaded in this process.
+    """
     global _embedding_generator
     if _embedding_generator is None:
-        _embedding_generator = EmbeddingGenerator()
+        if settings.EMBEDDING_SERVER_ENABLED:
+            from agentic_clinical_assistant.vector.embedding_client import EmbeddingClient
+
+            _embedding_generator = EmbeddingClient()
+        else:
+            _embedding_generator = EmbeddingGenerator()
     return _embedding_generator
 
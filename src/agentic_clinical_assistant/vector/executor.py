@@ -0,0 +1,164 @@
+"""Run blocking vector-backend calls off the event loop.
+
+The adapters expose ``async`` methods, but FAISS searches are CPU-bound and
+the Pinecone and Weaviate clients used here are synchronous. Those calls run
+on one bounded thread pool shared by all adapters (``VECTOR_EXECUTOR_THREADS``
+workers), and each backend may have at most ``VECTOR_BACKEND_CONCURRENCY``
+calls in flight per event loop, so one slow backend can neither stall the
+loop nor take every worker.
+"""
+
+import asyncio
+import functools
+import os
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple, TypeVar
+
+from agentic_clinical_assistant.config import settings
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_executor_lock = threading.Lock()
+# asyncio semaphores are bound to the loop they are first used on, so each
+# loop gets its own, keyed by backend and limit
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int], asyncio.Semaphore]]"
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Return the shared thread pool, creating it on first use.
+
+    A forked worker process (Celery prefork) gets a fresh pool, since the
+    parent's threads do not survive the fork.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.VECTOR_EXECUTOR_THREADS,
+                thread_name_prefix="vector-backend",
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """
+    Shut the shared thread pool down; the next call creates a new one.
+
+    Args:
+        wait: Wait for running calls to finish
+    """
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+def backend_semaphore(backend: str) -> asyncio.Semaphore:
+    """
+    Concurrency limit of a backend on the running event loop.
+
+    Args:
+        backend: Backend name
+
+    Returns:
+        Semaphore admitting ``VECTOR_BACKEND_CONCURRENCY`` calls
+    """
+    limit = settings.VECTOR_BACKEND_CONCURRENCY
+    semaphores = _semaphores.setdefault(asyncio.get_running_loop(), {})
+    semaphore = semaphores.get((backend, limit))
+    if semaphore is None:
+        semaphore = semaphores[(backend, limit)] = asyncio.Semaphore(limit)
+    return semaphore
+
+
+async def run_blocking(backend: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking call on the shared thread pool.
+
+    Args:
+        backend: Backend whose concurrency limit the call counts against
+        func: Blocking callable
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        The return value of func
+    """
+    semaphore = backend_semaphore(backend)
+    await semaphore.acquire()
+    loop = asyncio.get_running_loop()
+    try:
+        future = get_executor().submit(functools.partial(func, *args, **kwargs))
+    except BaseException:
+        semaphore.release()
+        raise
+    # The slot is freed when the thread finishes, not when the caller stops
+    # waiting: a cancelled call keeps running until it returns
+    future.add_done_callback(lambda _: _release_threadsafe(loop, semaphore))
+    return await asyncio.wrap_future(future, loop=loop)
+
+
+def _release_threadsafe(loop: asyncio.AbstractEventLoop, semaphore: asyncio.Semaphore) -> None:
+    """Release a loop's semaphore from any thread."""
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        pass  # The loop is closed, and its semaphores with it
+
+
+class ReadWriteLock:
+    """
+    Thread lock admitting many readers or one writer.
+
+    Waiting writers block new readers, so a steady stream of searches cannot
+    starve writes.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an unlocked lock."""
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        """Hold the lock shared for the duration of the block."""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        """Hold the lock exclusively for the duration of the block."""
+        with self._condition:
+            self._waiting_writers += 1
+            try:
+                while self._writer or self._readers:
+                    self._condition.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
@@ -1,24 +1,63 @@
 """FAISS vector database adapter."""
 
 import json
-import os
+import threading
+import time
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import faiss
 import numpy as np
 
 from agentic_clinical_assistant.config import settings
-from agentic_clinical_assistant.vector.base import Document, SearchResult, VectorDB, VectorDBBackend
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
+from agentic_clinical_assistant.vector import faiss_store
+from agentic_clinical_assistant.vector.base import (
+    Document,
+    EmbeddingLike,
+    QueryMatrix,
+    SearchHit,
+    VectorDB,
+    VectorDBBackend,
+    as_embedding,
+    as_query_matrix,
+)
+from agentic_clinical_assistant.vector.executor import ReadWriteLock
+from agentic_clinical_assistant.vector.faiss_filters import MetadataIndex, bitmap_selector
+from agentic_clinical_assistant.vector.faiss_index import (
+    FILTERED_RETRY_WIDENING,
+    TRAINED_INDEX_FILE,
+    FAISSIndexType,
+    build_index,
+    detect_index_type,
+    enable_reconstruct,
+    load_trained_index,
+    min_training_size,
+    save_trained_index,
+    search_parameters,
+    supports_removal,
+    train_index,
+)
+from agentic_clinical_assistant.vector.faiss_lexical import LexicalIndex
+from agentic_clinical_assistant.vector.fusion import reciprocal_rank_fusion
 
 
 class FAISSAdapter(VectorDB):
-    """FAISS vector database adapter for local similarity search."""
+    """
+    FAISS vector database adapter for local similarity search.
+
+    Index work and file IO run on the shared vector-backend thread pool.
+    Searches share the index; writes take it exclusively. A BM25 keyword
+    index over document text is kept alongside for keyword and hybrid search.
+    """
 
     def __init__(
         self,
         index_path: Optional[str] = None,
         dimension: Optional[int] = None,
+        index_type: Optional[str] = None,
+        read_only: Optional[bool] = None,
     ):
         """
         Initialize FAISS adapter.
@@ -26,161 +65,733 @@ class FAISSAdapter(VectorDB):
         Args:
             index_path: Path to save/load FAISS index
             dimension: Embedding dimension
+            index_type: Index structure for new indexes (flat, ivf_flat, ivf_pq, hnsw_flat, sq8)
+            read_only: Memory-map the current snapshot and reject writes
         """
         super().__init__(VectorDBBackend.FAISS)
         self.index_path = Path(index_path or settings.FAISS_INDEX_PATH)
         self.dimension = dimension or settings.FAISS_DIMENSION
+        self.index_type = FAISSIndexType(index_type or settings.FAISS_INDEX_TYPE)
+        self.read_only = settings.FAISS_READ_ONLY if read_only is None else read_only
         self.index: Optional[faiss.Index] = None
-        self.documents: Dict[str, Document] = {}
-        self.id_to_index: Dict[str, int] = {}
-        self.index_to_id: Dict[int, str] = {}
+        # Table row i describes the index vector with id i; embeddings live only in the index
+        self.table = faiss_store.DocumentTable()
+        self.filters = MetadataIndex()
+        self.lexical = LexicalIndex()
+        self._log: Optional[faiss_store.RecordLog] = None
+        self._writer_lock = faiss_store.WriterLock(self.index_path / faiss_store.LOCK_FILE)
+        self._generation: Optional[str] = None
+        self._last_refresh_check = 0.0
+        self._snapshot_lsn = 0
+        self._changes_since_snapshot = 0
+        self._lock = ReadWriteLock()
+        self._snapshot_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
 
     async def initialize(self) -> None:
-        """Initialize or load FAISS index."""
-        # Create directory if it doesn't exist
-        self.index_path.parent.mkdir(parents=True, exist_ok=True)
-
-        # Load existing index if it exists
-        index_file = self.index_path / "index.faiss"
-        metadata_file = self.index_path / "metadata.json"
-
-        if index_file.exists() and metadata_file.exists():
-            # Load existing index
-            self.index = faiss.read_index(str(index_file))
-            with open(metadata_file, "r") as f:
-                metadata = json.load(f)
-                self.documents = {
-                    doc_id: Document(**doc_data) for doc_id, doc_data in metadata["documents"].items()
-                }
-                self.id_to_index = metadata["id_to_index"]
-                self.index_to_id = {v: k for k, v in self.id_to_index.items()}
+        """
+        Load the current snapshot and replay the write-ahead log.
+
+        Writers first take the writer lock of the index directory, waiting up
+        to ``FAISS_WRITER_LOCK_TIMEOUT`` seconds for another writer to finish.
+        """
+        if self.read_only:
+            await self._run_blocking(self._open_read_only)
+        else:
+            await self._run_blocking(self._open)
+
+    def _open(self) -> None:
+        """Take the writer lock, load the current snapshot and replay the log."""
+        with self._lock.write():
+            self._load()
+
+    def _load(self) -> None:
+        """Load the current snapshot, or migrate or create an index, and replay the log."""
+        if self._log is not None:
+            self._log.close()
+
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self._writer_lock.acquire(timeout=settings.FAISS_WRITER_LOCK_TIMEOUT)
+        self.table = faiss_store.DocumentTable()
+        self.filters = MetadataIndex()
+        self.lexical = LexicalIndex()
+
+        legacy_index_file = self.index_path / "index.faiss"
+        legacy_metadata_file = self.index_path / "metadata.json"
+        migrate_legacy = False
+
+        snapshot = faiss_store.read_current_snapshot(self.index_path)
+        self._generation = snapshot.generation if snapshot is not None else None
+        if snapshot is not None:
+            # A persisted index keeps the type it was built with
+            self.index = snapshot.index
+            self.index_type = detect_index_type(self.index)
+            enable_reconstruct(self.index)
+            self.table = snapshot.table
+            self._snapshot_lsn = snapshot.lsn
+            self.filters = MetadataIndex.load(snapshot.directory)
+            self.lexical = LexicalIndex.load(snapshot.directory, self.table)
+        elif legacy_index_file.exists() and legacy_metadata_file.exists():
+            self._load_legacy(legacy_index_file, legacy_metadata_file)
+            self._snapshot_lsn = 0
+            migrate_legacy = True
+        else:
+            # Start from the persisted training artifact when there is one (L2 distance)
+            self.index = load_trained_index(self.index_path / TRAINED_INDEX_FILE)
+            if self.index is None:
+                self.index = build_index(self.index_type, self.dimension)
+            else:
+                self.index_type = detect_index_type(self.index)
+            self._snapshot_lsn = 0
+
+        self._log = faiss_store.RecordLog(
+            self.index_path / faiss_store.LOG_FILE,
+            self.dimension,
+            fsync=settings.FAISS_WAL_FSYNC,
+        )
+        replay = [
+            record
+            for record in self._log.open(start_lsn=self._snapshot_lsn)
+            if record.lsn > self._snapshot_lsn
+        ]
+        for record in replay:
+            self._apply_record(record)
+        self._changes_since_snapshot = sum(len(record.document_ids) for record in replay)
+
+        if migrate_legacy:
+            self._write_snapshot()
+            legacy_index_file.unlink()
+            legacy_metadata_file.unlink()
+
+    def _open_read_only(self) -> None:
+        """
+        Memory-map the current snapshot without opening the log.
+
+        Index data, table columns and posting lists are mapped rather than
+        copied, so startup cost does not grow with the corpus and processes
+        on one node share the page cache. Writes logged after the snapshot
+        become visible when the writer publishes the next generation.
+        """
+        self._last_refresh_check = time.monotonic()
+        snapshot = faiss_store.read_current_snapshot(self.index_path, mmap_mode=True)
+        if snapshot is None:
+            index, table = build_index(self.index_type, self.dimension), faiss_store.DocumentTable()
+            filters, lexical = MetadataIndex(), LexicalIndex()
+            generation, lsn = None, 0
         else:
-            # Create new index (L2 distance)
-            self.index = faiss.IndexFlatL2(self.dimension)
+            index, table = snapshot.index, snapshot.table
+            filters = MetadataIndex.load(snapshot.directory, mmap_mode=True)
+            lexical = LexicalIndex.load(snapshot.directory, table, mmap_mode=True)
+            generation, lsn = snapshot.generation, snapshot.lsn
+
+        # Publish the whole generation at once; searches pin it under the read lock
+        with self._lock.write():
+            self.index_type = detect_index_type(index)
+            self.index, self.table, self.filters, self.lexical = index, table, filters, lexical
+            self._generation = generation
+            self._snapshot_lsn = lsn
+
+    async def refresh(self) -> bool:
+        """
+        Hot-swap to the newest generation published by the writer.
+
+        Returns:
+            True if a new generation was loaded
+        """
+        if not self.read_only:
+            return False
+        return await self._run_blocking(self._refresh)
+
+    def _refresh(self, wait: bool = True) -> bool:
+        """
+        Open the newest generation if it differs from the loaded one.
+
+        Args:
+            wait: Wait for a refresh already running instead of skipping this one
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return False
+        try:
+            self._last_refresh_check = time.monotonic()
+            generation = faiss_store.current_generation(self.index_path)
+            if generation is None or generation == self._generation:
+                return False
+            try:
+                self._open_read_only()
+            except (OSError, RuntimeError):
+                # The writer retired the generation while it was being opened; retry on the next check
+                return False
+            return True
+        finally:
+            self._refresh_lock.release()
+
+    def _maybe_refresh(self) -> None:
+        """Check for a new generation at most every FAISS_REFRESH_INTERVAL_SECONDS."""
+        if time.monotonic() - self._last_refresh_check >= settings.FAISS_REFRESH_INTERVAL_SECONDS:
+            # Searches that find a refresh running go on with the loaded generation
+            self._refresh(wait=False)
+
+    def cache_token(self) -> Optional[str]:
+        """Loaded generation of a read-only adapter, which the writer replaces."""
+        return self._generation if self.read_only else None
+
+    def _check_writable(self) -> None:
+        """Reject writes to a read-only adapter."""
+        if self.read_only:
+            raise RuntimeError(f"FAISS index at {self.index_path} is opened read-only")
+
+    def _load_legacy(self, index_file: Path, metadata_file: Path) -> None:
+        """Load the pre-snapshot layout: a single index file plus pretty-printed JSON."""
+        legacy_index = faiss.read_index(str(index_file))
+        with open(metadata_file, "r") as f:
+            metadata = json.load(f)
+
+        # Only live rows are carried over, which also drops vectors left by old deletes
+        documents = [Document(**doc_data) for doc_data in metadata["documents"].values()]
+        rows = [metadata["id_to_index"][doc.id] for doc in documents]
+        self.index_type = FAISSIndexType.FLAT
+        self.index = build_index(self.index_type, self.dimension)
+        if documents:
+            vectors = np.vstack([legacy_index.reconstruct(int(row)) for row in rows])
+            self._insert([doc.id for doc in documents], [self._encode(doc) for doc in documents], vectors)
 
     async def add_documents(
         self, documents: List[Document], batch_size: Optional[int] = None
     ) -> List[str]:
-        """Add documents to FAISS index."""
+        """
+        Add documents to FAISS index.
+
+        All embeddings are validated and stacked into a single float32 matrix
+        up front, then added in chunks of ``batch_size`` rows with one
+        ``index.add`` call and one log write per chunk.
+        """
+        self._check_writable()
         if self.index is None:
             await self.initialize()
 
         if self.index is None:
             raise RuntimeError("Index not initialized")
 
+        if not documents:
+            return []
+
+        batch_size = batch_size or settings.FAISS_ADD_BATCH_SIZE
+        if batch_size <= 0:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        return await self._run_blocking(self._add, documents, batch_size)
+
+    def _add(self, documents: List[Document], batch_size: int) -> List[str]:
+        """Stack, log and index documents batch by batch."""
+        embeddings = self._stack_embeddings(documents)
+        if not self.index.is_trained:
+            self._train(embeddings)
+
         document_ids = []
-        embeddings = []
 
+        for start in range(0, len(documents), batch_size):
+            batch = documents[start : start + batch_size]
+            vectors = embeddings[start : start + batch_size]
+            ids = [doc.id for doc in batch]
+            records = [self._encode(doc) for doc in batch]
+
+            with self._lock.write():
+                self._persist(faiss_store.OP_PUT, ids, records, vectors)
+                self._insert(ids, records, vectors)
+            self._maybe_snapshot()
+            document_ids.extend(ids)
+
+        return document_ids
+
+    async def train(self, embeddings: Any) -> None:
+        """
+        Train an approximate index on a sample of embeddings.
+
+        Indexes that need training are trained automatically on the first
+        ``add_documents`` call; call this first to train on a larger or more
+        representative sample. The trained, empty index is persisted as
+        ``trained.faiss`` and reused when the index is rebuilt.
+
+        Args:
+            embeddings: Matrix or list of training embeddings
+        """
+        self._check_writable()
+        if self.index is None:
+            await self.initialize()
+
+        await self._run_blocking(self._train, embeddings)
+
+    def _train(self, embeddings: Any) -> None:
+        """Train the index in place, replacing an already trained empty index."""
+        if self.index.ntotal > 0:
+            raise ValueError("Cannot retrain a FAISS index that already holds vectors")
+
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+            raise ValueError(
+                f"Training embeddings must have shape (n, {self.dimension}), got {vectors.shape}"
+            )
+
+        required = min_training_size(self.index_type)
+        if len(vectors) < required:
+            raise ValueError(
+                f"{self.index_type.value} index needs at least {required} training vectors, "
+                f"got {len(vectors)}; call train() with a larger sample before adding documents"
+            )
+
+        index = build_index(self.index_type, self.dimension) if self.index.is_trained else self.index
+        train_index(index, vectors)
+        save_trained_index(index, self.index_path / TRAINED_INDEX_FILE)
+        with self._lock.write():
+            self.index = index
+
+    async def compact(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Rebuild the index and document table without deleted rows.
+
+        Compaction runs once the tombstone ratio reaches
+        ``FAISS_COMPACTION_THRESHOLD``. It reclaims the table rows of deleted
+        documents and, for HNSW indexes, which cannot remove vectors in place,
+        the deleted vectors themselves. A snapshot of the result is written.
+
+        Args:
+            force: Compact even when the ratio is below the threshold
+
+        Returns:
+            Compaction summary
+        """
+        self._check_writable()
+        if self.index is None:
+            await self.initialize()
+
+        return await self._run_blocking(self._compact, force)
+
+    def _compact(self, force: bool) -> Dict[str, Any]:
+        """Rebuild and snapshot the index if the tombstone ratio calls for it."""
+        with self._lock.write():
+            ratio = self.table.tombstone_ratio
+            result = {
+                "compacted": False,
+                "tombstone_ratio": ratio,
+                "rows_before": len(self.table),
+                "rows_after": len(self.table),
+            }
+            if ratio == 0.0 or (not force and ratio < settings.FAISS_COMPACTION_THRESHOLD):
+                return result
+
+            self._rebuild()
+            self._write_snapshot()
+            self._record_tombstones()
+            result.update(compacted=True, rows_after=len(self.table))
+        return result
+
+    def _rebuild(self) -> None:
+        """Copy live vectors into a fresh index, renumbering table rows from zero."""
+        rows = self.table.live_rows()
+        index = self._empty_index()
+        if len(rows) and not index.is_trained:
+            rng = np.random.default_rng(0)
+            sample_size = min(len(rows), settings.FAISS_TRAIN_SAMPLE_SIZE)
+            sample = np.sort(rng.choice(rows, sample_size, replace=False))
+            train_index(index, self.index.reconstruct_batch(sample))
+
+        batch_size = settings.FAISS_ADD_BATCH_SIZE
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            index.add_with_ids(
+                self.index.reconstruct_batch(batch),
+                np.arange(start, start + len(batch), dtype=np.int64),
+            )
+
+        self.index = index
+        self.table = self.table.compacted()
+        self.filters = MetadataIndex.build(self.table)
+        self.lexical = LexicalIndex.build(self.table)
+
+    def _empty_index(self) -> faiss.Index:
+        """Empty index of the current type, trained when a training artifact exists."""
+        index = load_trained_index(self.index_path / TRAINED_INDEX_FILE)
+        if index is None or detect_index_type(index) != self.index_type:
+            index = build_index(self.index_type, self.dimension)
+        return index
+
+    def _insert(self, document_ids: List[str], records: List[bytes], vectors: np.ndarray) -> None:
+        """Add a validated batch to the index and the document table."""
+        # Each vector is keyed by the table row its document is appended to
+        first_row = len(self.table)
+        self.index.add_with_ids(
+            vectors, np.arange(first_row, first_row + len(document_ids), dtype=np.int64)
+        )
+        replaced = self.table.append(document_ids, records)
+        rows = range(first_row, first_row + len(document_ids))
+        decoded = [faiss_store.decode_record(record) for record in records]
+        self.filters.add(rows, (record["metadata"] for record in decoded))
+        self.lexical.add(rows, (record["text"] for record in decoded))
+        self.lexical.remove(replaced)
+        self._drop_vectors(replaced)
+
+    def _remove(self, document_ids: List[str]) -> None:
+        """Drop documents from the document table and their vectors from the index."""
+        rows = [int(row) for row in self.table.rows_of(document_ids) if row >= 0]
+        for row in rows:
+            self.table.remove(row)
+        self.lexical.remove(rows)
+        self._drop_vectors(rows)
+
+    def _drop_vectors(self, rows: List[int]) -> None:
+        """Remove the vectors of removed table rows from the index."""
+        # HNSW graphs keep them as tombstones, skipped in searches, until compaction
+        if rows and supports_removal(self.index):
+            self.index.remove_ids(np.asarray(rows, dtype=np.int64))
+        self._record_tombstones()
+
+    def _record_tombstones(self) -> None:
+        """Publish the current tombstone ratio."""
+        MetricsCollector.set_tombstone_ratio(self.backend.value, self.table.tombstone_ratio)
+
+    def _stack_embeddings(self, documents: List[Document]) -> np.ndarray:
+        """
+        Validate document embeddings and stack them into a contiguous float32 matrix.
+
+        Documents whose embeddings are consecutive rows of one matrix, as
+        ``EmbeddingGenerator.generate_embeddings`` returns them, are added
+        from a view of that matrix without copying.
+        """
         for doc in documents:
             if doc.embedding is None:
                 raise ValueError(f"Document {doc.id} missing embedding")
-
             if len(doc.embedding) != self.dimension:
                 raise ValueError(
                     f"Embedding dimension mismatch: expected {self.dimension}, got {len(doc.embedding)}"
                 )
 
-            # Add to index
-            idx = self.index.ntotal
-            self.index.add(np.array([doc.embedding], dtype=np.float32))
+        shared = self._shared_rows([doc.embedding for doc in documents])
+        if shared is not None:
+            return shared
+
+        embeddings = np.empty((len(documents), self.dimension), dtype=np.float32)
+        for row, doc in enumerate(documents):
+            embeddings[row] = doc.embedding
+        return embeddings
+
+    @staticmethod
+    def _shared_rows(vectors: List[np.ndarray]) -> Optional[np.ndarray]:
+        """The slice of a C-contiguous matrix whose consecutive rows the vectors are, if any."""
+        base = vectors[0].base
+        if not (
+            isinstance(base, np.ndarray)
+            and base.ndim == 2
+            and base.dtype == np.float32
+            and base.flags.c_contiguous
+            and base.shape[1] == len(vectors[0])
+        ):
+            return None
+        row_bytes = base.strides[0]
+        base_address = base.__array_interface__["data"][0]
+        first = (vectors[0].__array_interface__["data"][0] - base_address) // row_bytes
+        for position, vector in enumerate(vectors):
+            if (
+                vector.base is not base
+                or vector.__array_interface__["data"][0] != base_address + (first + position) * row_bytes
+            ):
+                return None
+        return base[first : first + len(vectors)]
 
-            # Store document metadata
-            self.documents[doc.id] = doc
-            self.id_to_index[doc.id] = idx
-            self.index_to_id[idx] = doc.id
-            document_ids.append(doc.id)
+    async def search(
+        self,
+        query_embedding: EmbeddingLike,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[SearchHit]:
+        """
+        Search for similar documents.
 
-        await self._save_index()
-        return document_ids
+        Args:
+            query_embedding: Query vector embedding
+            top_k: Number of results to return
+            filters: Metadata filters to apply; a list value matches any of its items
+            **kwargs: ``nprobe`` (IVF indexes) and ``ef_search`` (HNSW indexes)
+                override the configured search parameters for this query;
+                ``retrieval_mode`` ("vector", "hybrid" or "keyword") and
+                ``query_text`` select keyword matching as in ``WeaviateAdapter``
+        """
+        query_vector = as_embedding(query_embedding)
+        if len(query_vector) != self.dimension:
+            raise ValueError(
+                f"Query embedding dimension mismatch: expected {self.dimension}, got {len(query_vector)}"
+            )
 
-    async def search(
+        query_text = kwargs.pop("query_text", "")
+        results = await self.search_batch(
+            query_vector[np.newaxis], top_k=top_k, filters=filters, query_texts=[query_text], **kwargs
+        )
+        return results[0]
+
+    async def search_batch(
         self,
-        query_embedding: List[float],
+        query_embeddings: QueryMatrix,
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         **kwargs: Any,
-    ) -> List[SearchResult]:
-        """Search for similar documents."""
+    ) -> List[List[SearchHit]]:
+        """
+        Search for several queries with a single matrix search.
+
+        In "keyword" mode documents are ranked by BM25 against
+        ``query_texts``. In "hybrid" mode the top
+        ``top_k * FAISS_HYBRID_CANDIDATES`` vector and keyword candidates are
+        fused by reciprocal rank, so the scores are fused RRF scores.
+
+        Args:
+            query_embeddings: 2-D float32 array with one query embedding per row
+            top_k: Number of results to return per query
+            filters: Metadata filters applied to every query
+            **kwargs: ``nprobe`` (IVF indexes) and ``ef_search`` (HNSW indexes);
+                ``retrieval_mode`` ("vector", "hybrid" or "keyword") and
+                ``query_texts``, one keyword query per row
+
+        Returns:
+            One list of search results per query, in query order
+        """
         if self.index is None:
             await self.initialize()
 
         if self.index is None:
             raise RuntimeError("Index not initialized")
 
-        if len(query_embedding) != self.dimension:
+        query_vectors = as_query_matrix(query_embeddings)
+        if query_vectors.shape[1] != self.dimension:
             raise ValueError(
-                f"Query embedding dimension mismatch: expected {self.dimension}, got {len(query_embedding)}"
+                f"Query embedding dimension mismatch: expected {self.dimension}, got {query_vectors.shape[1]}"
             )
 
-        # Search in FAISS
-        query_vector = np.array([query_embedding], dtype=np.float32)
-        distances, indices = self.index.search(query_vector, min(top_k, self.index.ntotal))
+        retrieval_mode = kwargs.get("retrieval_mode", "vector")
+        if retrieval_mode not in ("vector", "hybrid", "keyword"):
+            raise ValueError(f"Unknown retrieval_mode: {retrieval_mode}")
+        query_texts = kwargs.get("query_texts") or [""] * len(query_vectors)
+        if len(query_texts) != len(query_vectors):
+            raise ValueError("query_texts must have one entry per query embedding")
+
+        return await self._run_blocking(
+            self._search,
+            query_vectors,
+            top_k,
+            filters,
+            kwargs.get("nprobe"),
+            kwargs.get("ef_search"),
+            retrieval_mode,
+            query_texts,
+        )
+
+    def _search(
+        self,
+        query_vectors: np.ndarray,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        nprobe: Optional[int],
+        ef_search: Optional[int],
+        retrieval_mode: str = "vector",
+        query_texts: Optional[List[str]] = None,
+    ) -> List[List[SearchHit]]:
+        """Run a batch search while holding the index shared."""
+        if self.read_only:
+            self._maybe_refresh()
+
+        with self._lock.read():
+            # Pin the current generation; a hot swap during the search leaves it intact
+            index, table, metadata_index, lexical = self.index, self.table, self.filters, self.lexical
+            if retrieval_mode == "vector":
+                return self._search_pinned(
+                    index, table, metadata_index, query_vectors, top_k, filters, nprobe, ef_search
+                )
+
+            keyword_k = top_k if retrieval_mode == "keyword" else top_k * settings.FAISS_HYBRID_CANDIDATES
+            keyword_results = self._keyword_search(
+                table, metadata_index, lexical, query_texts, keyword_k, filters
+            )
+            if retrieval_mode == "keyword":
+                return keyword_results
 
+            vector_results = self._search_pinned(
+                index, table, metadata_index, query_vectors, keyword_k, filters, nprobe, ef_search
+            )
+            return [
+                reciprocal_rank_fusion([vectors, keywords], top_k)
+                for vectors, keywords in zip(vector_results, keyword_results)
+            ]
+
+    def _keyword_search(
+        self,
+        table: faiss_store.DocumentTable,
+        metadata_index: MetadataIndex,
+        lexical: LexicalIndex,
+        query_texts: List[str],
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+    ) -> List[List[SearchHit]]:
+        """BM25 search of one pinned generation, one result list per query text."""
+        alive = table.alive
+        mask = metadata_index.mask(filters, alive) if filters else None
         results = []
-        for distance, idx in zip(distances[0], indices[0]):
-            if idx == -1:  # FAISS returns -1 for empty results
-                continue
+        for query_text in query_texts:
+            rows, scores = lexical.search(query_text, alive, top_k, mask=mask)
+            query_results = []
+            for row, score in zip(rows, scores):
+                query_results.append(self._hit_at(table, int(row), float(score)))
+            results.append(query_results)
+        return results
+
+    def _search_pinned(
+        self,
+        index: faiss.Index,
+        table: faiss_store.DocumentTable,
+        metadata_index: MetadataIndex,
+        query_vectors: np.ndarray,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        nprobe: Optional[int],
+        ef_search: Optional[int],
+    ) -> List[List[SearchHit]]:
+        """Search one pinned generation of the index, table and metadata index."""
+        top_k = min(top_k, table.live_count)
+
+        # Restrict the search to matching rows up front, so filtered-out and
+        # tombstoned vectors never take result slots
+        mask = None
+        if filters:
+            mask = metadata_index.mask(filters, table.alive)
+        elif index.ntotal > table.live_count:
+            mask = table.alive
+        if mask is not None:
+            candidates = int(np.count_nonzero(mask))
+            top_k = min(top_k, candidates)
+        if top_k <= 0 or not len(query_vectors):
+            return [[] for _ in range(len(query_vectors))]
+
+        if mask is not None and candidates <= settings.FAISS_FILTER_BRUTE_FORCE_MAX:
+            distances, labels = self._search_subset(index, query_vectors, mask, top_k)
+        else:
+            selector = bitmap_selector(mask) if mask is not None else None
+            params = search_parameters(index, nprobe, ef_search, selector)
+            distances, labels = index.search(query_vectors, top_k, params=params)
+            short = np.flatnonzero(labels[:, -1] == -1) if mask is not None else []
+            if len(short):
+                # The approximate search reached too few matching vectors for these
+                # queries; search them once more over a wider part of the index and
+                # return what that finds, rather than scanning every matching row
+                params = search_parameters(
+                    index,
+                    (nprobe or settings.FAISS_NPROBE) * FILTERED_RETRY_WIDENING,
+                    (ef_search or settings.FAISS_EF_SEARCH) * FILTERED_RETRY_WIDENING,
+                    selector,
+                )
+                distances[short], labels[short] = index.search(
+                    query_vectors[short], top_k, params=params
+                )
 
-            doc_id = self.index_to_id.get(idx)
-            if doc_id is None:
-                continue
+        return [
+            self._to_results(table, query_distances, query_labels)
+            for query_distances, query_labels in zip(distances, labels)
+        ]
 
-            doc = self.documents.get(doc_id)
-            if doc is None:
+    def _to_results(
+        self, table: faiss_store.DocumentTable, distances: np.ndarray, labels: np.ndarray
+    ) -> List[SearchHit]:
+        """Convert one query's distances and labels into search results."""
+        results = []
+        for distance, label in zip(distances, labels):
+            if label == -1:  # FAISS returns -1 for empty results
                 continue
 
-            # Apply metadata filters if provided
-            if filters:
-                if not self._matches_filters(doc.metadata, filters):
-                    continue
-
             # Convert L2 distance to similarity score (lower distance = higher similarity)
             # Normalize to 0-1 range (assuming max distance of 10)
             score = max(0.0, 1.0 - (float(distance) / 10.0))
 
-            results.append(
-                SearchResult(
-                    document=doc,
-                    score=score,
-                    doc_hash=doc.doc_hash or "",
-                )
-            )
+            results.append(self._hit_at(table, int(label), score))
 
-        return results[:top_k]
+        return results
 
-    def _matches_filters(self, metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
-        """Check if document metadata matches filters."""
-        for key, value in filters.items():
-            if key not in metadata:
-                return False
-            if isinstance(value, list):
-                if metadata[key] not in value:
-                    return False
-            elif metadata[key] != value:
-                return False
-        return True
+    @staticmethod
+    def _search_subset(
+        index: faiss.Index, query_vector: np.ndarray, mask: np.ndarray, top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Exhaustive search over the vectors of the rows set in a mask."""
+        rows = np.flatnonzero(mask)
+        distances, positions = faiss.knn(query_vector, index.reconstruct_batch(rows), top_k)
+        return distances, rows[positions]
 
     async def delete_documents(self, document_ids: List[str]) -> None:
-        """Delete documents (FAISS doesn't support deletion, so we mark as deleted)."""
-        for doc_id in document_ids:
-            if doc_id in self.documents:
-                # FAISS doesn't support deletion, so we remove from metadata
-                # The index entry remains but won't be returned in searches
-                del self.documents[doc_id]
-                if doc_id in self.id_to_index:
-                    idx = self.id_to_index[doc_id]
-                    del self.id_to_index[doc_id]
-                    del self.index_to_id[idx]
-
-        await self._save_index()
+        """Delete documents and remove their vectors from the index."""
+        self._check_writable()
+        if self.index is None:
+            await self.initialize()
+
+        await self._run_blocking(self._delete, document_ids)
+
+    def _delete(self, document_ids: List[str]) -> None:
+        """Log and apply a delete batch for the documents that exist."""
+        unique_ids = list(dict.fromkeys(document_ids))
+        with self._lock.write():
+            rows = self.table.rows_of(unique_ids)
+            existing = [doc_id for doc_id, row in zip(unique_ids, rows) if row >= 0]
+            if not existing:
+                return
+
+            self._persist(faiss_store.OP_DELETE, existing)
+            self._remove(existing)
+        self._maybe_snapshot()
 
     async def get_document(self, document_id: str) -> Optional[Document]:
-        """Get document by ID."""
-        return self.documents.get(document_id)
+        """Get document by ID, reconstructing its embedding from the index."""
+        if self.index is None:
+            await self.initialize()
+
+        return await self._run_blocking(self._get_document, document_id)
+
+    def _get_document(self, document_id: str) -> Optional[Document]:
+        """Look a document up and reconstruct its embedding."""
+        if self.read_only:
+            self._maybe_refresh()
+
+        with self._lock.read():
+            index, table = self.index, self.table
+            row = table.row_of(document_id)
+            if row is None:
+                return None
+            return self._document_at(table, row, index)
+
+    async def get_documents(self, document_ids: List[str]) -> List[Document]:
+        """Get documents by ID, reconstructing their embeddings in one batch."""
+        if self.index is None:
+            await self.initialize()
+
+        return await self._run_blocking(self._get_documents, document_ids)
+
+    def _get_documents(self, document_ids: List[str]) -> List[Document]:
+        """Look documents up and reconstruct their embeddings."""
+        if self.read_only:
+            self._maybe_refresh()
+
+        unique_ids = list(dict.fromkeys(document_ids))
+        with self._lock.read():
+            index, table = self.index, self.table
+            rows = table.rows_of(unique_ids)
+            rows = rows[rows >= 0]
+            embeddings = index.reconstruct_batch(rows) if len(rows) else []
+            return [
+                Document(
+                    id=table.id_at(int(row)),
+                    embedding=embedding,
+                    **faiss_store.decode_record(table.record_at(int(row))),
+                )
+                for row, embedding in zip(rows, embeddings)
+            ]
 
     async def update_document(self, document: Document) -> None:
         """Update document (FAISS doesn't support updates, so we delete and re-add)."""
-        if document.id in self.documents:
+        self._check_writable()
+        if self.table.row_of(document.id) is not None:
             await self.delete_documents([document.id])
         await self.add_documents([document])
 
@@ -190,31 +801,103 @@ class FAISSAdapter(VectorDB):
             return {"total_documents": 0, "dimension": self.dimension}
 
         return {
-            "total_documents": len(self.documents),
+            "total_documents": self.table.live_count,
             "index_size": self.index.ntotal,
             "dimension": self.dimension,
             "backend": self.backend.value,
+            "index_type": self.index_type.value,
+            "is_trained": self.index.is_trained,
+            "tombstone_ratio": self.table.tombstone_ratio,
+            "read_only": self.read_only,
+            "generation": self._generation,
+            "snapshot_lsn": self._snapshot_lsn,
+            "changes_since_snapshot": self._changes_since_snapshot,
         }
 
     async def close(self) -> None:
-        """Save index and close."""
-        await self._save_index()
-
-    async def _save_index(self) -> None:
-        """Save FAISS index and metadata to disk."""
-        if self.index is None:
-            return
-
-        # Save FAISS index
-        index_file = self.index_path / "index.faiss"
-        faiss.write_index(self.index, str(index_file))
-
-        # Save metadata
-        metadata_file = self.index_path / "metadata.json"
-        metadata = {
-            "documents": {doc_id: doc.model_dump() for doc_id, doc in self.documents.items()},
-            "id_to_index": self.id_to_index,
-        }
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        """Write a final snapshot, close the log and release the writer lock."""
+        await self._run_blocking(self._close)
+
+    def _close(self) -> None:
+        """Snapshot, then close the log and release the writer lock."""
+        self._save_index()
+        with self._lock.write():
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+            self._writer_lock.release()
+            self.index = None
+
+    @staticmethod
+    def _document_at(table: faiss_store.DocumentTable, row: int, index: faiss.Index) -> Document:
+        """Materialize the document in a table row, reconstructing its embedding from the index."""
+        return Document(
+            id=table.id_at(row),
+            embedding=index.reconstruct(row),
+            **faiss_store.decode_record(table.record_at(row)),
+        )
+
+    @staticmethod
+    def _hit_at(table: faiss_store.DocumentTable, row: int, score: float) -> SearchHit:
+        """Hit for a table row; its record is copied now and decoded only when read."""
+        return SearchHit(
+            table.id_at(row), score, load=partial(faiss_store.decode_record, table.record_at(row))
+        )
+
+    def _persist(
+        self,
+        op: int,
+        document_ids: List[str],
+        records: Optional[List[bytes]] = None,
+        vectors: Optional[np.ndarray] = None,
+    ) -> None:
+        """Append a write batch to the log ahead of applying it in memory."""
+        if self._log is None:
+            raise RuntimeError("Index not initialized")
 
+        self._log.append(op, document_ids, records, vectors)
+        self._changes_since_snapshot += len(document_ids)
+
+    def _maybe_snapshot(self) -> None:
+        """Snapshot once enough logged changes have piled up."""
+        if self._changes_since_snapshot >= settings.FAISS_SNAPSHOT_INTERVAL:
+            self._save_index()
+
+    def _save_index(self) -> None:
+        """Snapshot the index and document table, then truncate the log."""
+        # Writing holds the index shared: searches continue, writes wait
+        with self._snapshot_lock, self._lock.read():
+            if self.index is None or self._log is None:
+                return
+            if self._log.next_lsn - 1 == self._snapshot_lsn:
+                return  # Nothing logged since the last snapshot
+            self._write_snapshot()
+
+    def _write_snapshot(self) -> None:
+        """Write a snapshot covering everything logged so far."""
+        lsn = self._log.next_lsn - 1
+        directory = faiss_store.write_snapshot(
+            self.index_path,
+            lsn,
+            self.index,
+            self.table,
+            self.filters,
+            keep_generations=settings.FAISS_SNAPSHOT_GENERATIONS,
+            lexical=self.lexical,
+        )
+        self._generation = directory.name
+        self._log.reset()
+        self._snapshot_lsn = lsn
+        self._changes_since_snapshot = 0
+
+    def _apply_record(self, record: faiss_store.LogRecord) -> None:
+        """Re-apply a logged write batch during recovery."""
+        if record.op == faiss_store.OP_PUT:
+            self._insert(record.document_ids, record.records, record.vectors)
+        elif record.op == faiss_store.OP_DELETE:
+            self._remove(record.document_ids)
+
+    @staticmethod
+    def _encode(doc: Document) -> bytes:
+        """Encode a document as a table record; the id and embedding are stored elsewhere."""
+        return doc.model_dump_json(exclude={"id", "embedding"}).encode("utf-8")
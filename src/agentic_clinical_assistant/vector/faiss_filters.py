@@ -0,0 +1,178 @@
+"""Metadata pre-filtering for the FAISS adapter.
+
+``MetadataIndex`` is an inverted index from a metadata ``(key, value)`` term to
+the document table rows holding it. A filter dict compiles into a boolean row
+mask (values in a list are OR-ed, keys are AND-ed, and removed rows are
+masked out), which the adapter either hands to FAISS as an ``IDSelectorBitmap``
+or, for small subsets, scans exhaustively.
+
+Posting lists are append-only: removed rows stay in them until the table is
+compacted and the index rebuilt, and are dropped by the alive mask meanwhile.
+Snapshots store the live posting lists as one concatenated row array, so
+loading the index does not mean decoding every document record.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+from agentic_clinical_assistant.vector.faiss_store import (
+    DocumentTable,
+    _GrowableArray,
+    decode_record,
+)
+
+TERMS_FILE = "filters.terms.json"
+POSTING_ROWS_FILE = "filters.rows.npy"
+POSTING_OFFSETS_FILE = "filters.offsets.npy"
+
+Term = Tuple[str, Hashable]
+
+
+def _term(key: str, value: Any) -> Term:
+    """Posting key for a metadata value; unhashable values are keyed by their JSON."""
+    try:
+        hash(value)
+    except TypeError:
+        return key, json.dumps(value, sort_keys=True, default=str)
+    return key, value
+
+
+class MetadataIndex:
+    """Inverted index from metadata terms to document table rows."""
+
+    def __init__(self) -> None:
+        """Initialize an empty metadata index."""
+        self._postings: Dict[Term, _GrowableArray] = {}
+
+    def __len__(self) -> int:
+        """Number of distinct metadata terms."""
+        return len(self._postings)
+
+    @classmethod
+    def build(cls, table: DocumentTable) -> "MetadataIndex":
+        """
+        Build the index from the live rows of a document table.
+
+        Args:
+            table: Document table
+
+        Returns:
+            Metadata index covering every live row
+        """
+        index = cls()
+        rows = table.live_rows()
+        index.add(rows, (decode_record(table.record_at(int(row)))["metadata"] for row in rows))
+        return index
+
+    @classmethod
+    def load(cls, directory: Path, mmap_mode: bool = False) -> "MetadataIndex":
+        """
+        Load the posting lists saved in a snapshot directory.
+
+        Args:
+            directory: Snapshot directory
+            mmap_mode: Map the posting lists read-only
+
+        Returns:
+            Metadata index covering every live row
+
+        Raises:
+            FileNotFoundError: If the snapshot holds no posting lists
+        """
+        with open(directory / TERMS_FILE, "r") as f:
+            terms = json.load(f)
+        mode = "r" if mmap_mode else None
+        rows = np.load(directory / POSTING_ROWS_FILE, mmap_mode=mode)
+        offsets = np.load(directory / POSTING_OFFSETS_FILE)
+
+        index = cls()
+        for (key, value), start, end in zip(terms, offsets[:-1], offsets[1:]):
+            index._postings[(key, value)] = _GrowableArray(np.int64, rows[start:end])
+        return index
+
+    def save(self, directory: Path, alive: np.ndarray) -> None:
+        """
+        Write the live posting lists into a snapshot directory.
+
+        Args:
+            directory: Snapshot directory
+            alive: Live-row mask of the table being saved
+        """
+        terms = []
+        postings = []
+        for term, posting in self._postings.items():
+            rows = posting.view[alive[posting.view]]
+            if len(rows):
+                terms.append(list(term))
+                postings.append(rows)
+
+        with open(directory / TERMS_FILE, "w") as f:
+            json.dump(terms, f, separators=(",", ":"))
+        lengths = [len(rows) for rows in postings]
+        np.save(
+            directory / POSTING_ROWS_FILE,
+            np.concatenate(postings) if postings else np.empty(0, dtype=np.int64),
+        )
+        np.save(directory / POSTING_OFFSETS_FILE, np.concatenate([[0], np.cumsum(lengths)]))
+
+    def add(self, rows: Iterable[int], metadatas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index the metadata of newly appended rows.
+
+        Args:
+            rows: Table rows, in increasing order
+            metadatas: Metadata dicts, aligned with rows
+        """
+        batch: Dict[Term, list] = {}
+        for row, metadata in zip(rows, metadatas):
+            for key, value in (metadata or {}).items():
+                batch.setdefault(_term(key, value), []).append(row)
+
+        for term, term_rows in batch.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = _GrowableArray(np.int64)
+            posting.extend(term_rows)
+
+    def mask(self, filters: Dict[str, Any], alive: np.ndarray) -> np.ndarray:
+        """
+        Compile filters into a mask of live rows that match all of them.
+
+        Args:
+            filters: Metadata filters; a list value matches any of its items
+            alive: Live-row mask of the document table
+
+        Returns:
+            Boolean mask aligned with the table rows
+        """
+        mask = alive.copy()
+        for key, value in filters.items():
+            values: Sequence[Any] = value if isinstance(value, list) else [value]
+            matches = np.zeros(len(alive), dtype=np.bool_)
+            for item in values:
+                posting = self._postings.get(_term(key, item))
+                if posting is not None:
+                    matches[posting.view] = True
+            mask &= matches
+        return mask
+
+
+def bitmap_selector(mask: np.ndarray) -> faiss.IDSelector:
+    """
+    Build a FAISS selector accepting the ids set in a row mask.
+
+    Args:
+        mask: Boolean mask indexed by vector id
+
+    Returns:
+        ``IDSelectorBitmap`` over the packed mask
+    """
+    bits = np.packbits(mask, bitorder="little")
+    selector = faiss.IDSelectorBitmap(len(mask), faiss.swig_ptr(bits))
+    # The selector only borrows the buffer, so keep it alive alongside the selector
+    selector.referenced_objects = [bits]
+    return selector
@@ -0,0 +1,172 @@
+"""FAISS index construction, training and per-query search parameters.
+
+Every index built here is addressed by stable 64-bit ids (the adapter uses the
+document table row) rather than by insertion position: flat, SQ8 and HNSW
+indexes are wrapped in an ``IndexIDMap2`` and IVF indexes take ids natively,
+with a hashtable direct map so vectors can be reconstructed and removed by id.
+"""
+
+import os
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+import faiss
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+
+TRAINED_INDEX_FILE = "trained.faiss"
+# Factor applied to nprobe and efSearch when a filtered search comes back short
+FILTERED_RETRY_WIDENING = 8
+
+
+class FAISSIndexType(str, Enum):
+    """Supported FAISS index structures."""
+
+    FLAT = "flat"
+    IVF_FLAT = "ivf_flat"
+    IVF_PQ = "ivf_pq"
+    HNSW_FLAT = "hnsw_flat"
+    SQ8 = "sq8"
+
+
+def build_index(index_type: FAISSIndexType, dimension: int) -> faiss.Index:
+    """
+    Build an empty, id-addressed L2 index of the requested type from settings.
+
+    Args:
+        index_type: Index structure to build
+        dimension: Embedding dimension
+
+    Returns:
+        Empty (possibly untrained) FAISS index
+    """
+    if index_type == FAISSIndexType.FLAT:
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(dimension))
+    if index_type == FAISSIndexType.IVF_FLAT:
+        description = f"IVF{settings.FAISS_NLIST},Flat"
+    elif index_type == FAISSIndexType.IVF_PQ:
+        description = f"IVF{settings.FAISS_NLIST},PQ{settings.FAISS_PQ_M}x{settings.FAISS_PQ_NBITS}"
+    elif index_type == FAISSIndexType.HNSW_FLAT:
+        description = f"HNSW{settings.FAISS_HNSW_M},Flat"
+    elif index_type == FAISSIndexType.SQ8:
+        description = "SQ8"
+    else:
+        raise ValueError(f"Unsupported FAISS index type: {index_type}")
+
+    index = faiss.index_factory(dimension, description, faiss.METRIC_L2)
+    if index_type == FAISSIndexType.HNSW_FLAT:
+        index.hnsw.efConstruction = settings.FAISS_HNSW_EF_CONSTRUCTION
+    if faiss.try_extract_index_ivf(index) is None:
+        index = faiss.IndexIDMap2(index)
+    enable_reconstruct(index)
+    return index
+
+
+def base_index(index: faiss.Index) -> faiss.Index:
+    """Index wrapped by an id map, or the index itself."""
+    if isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2)):
+        return faiss.downcast_index(index.index)
+    return index
+
+
+def supports_removal(index: faiss.Index) -> bool:
+    """Whether vectors can be removed in place (HNSW graphs cannot drop nodes)."""
+    return not isinstance(base_index(index), faiss.IndexHNSW)
+
+
+def detect_index_type(index: faiss.Index) -> FAISSIndexType:
+    """Infer the index type of a loaded index."""
+    index = base_index(index)
+    if isinstance(index, faiss.IndexIVFPQ):
+        return FAISSIndexType.IVF_PQ
+    if isinstance(index, faiss.IndexIVF):
+        return FAISSIndexType.IVF_FLAT
+    if isinstance(index, faiss.IndexHNSW):
+        return FAISSIndexType.HNSW_FLAT
+    if isinstance(index, faiss.IndexScalarQuantizer):
+        return FAISSIndexType.SQ8
+    return FAISSIndexType.FLAT
+
+
+def min_training_size(index_type: FAISSIndexType) -> int:
+    """Smallest sample an index type can be trained on."""
+    if index_type == FAISSIndexType.IVF_FLAT:
+        return settings.FAISS_NLIST
+    if index_type == FAISSIndexType.IVF_PQ:
+        return max(settings.FAISS_NLIST, 2**settings.FAISS_PQ_NBITS)
+    if index_type == FAISSIndexType.SQ8:
+        return 1
+    return 0
+
+
+def train_index(index: faiss.Index, vectors: np.ndarray, sample_size: Optional[int] = None) -> None:
+    """
+    Train an index on a random sample of vectors.
+
+    Args:
+        index: Untrained index
+        vectors: Candidate training vectors
+        sample_size: Maximum number of vectors to train on
+    """
+    sample_size = sample_size or settings.FAISS_TRAIN_SAMPLE_SIZE
+    if len(vectors) > sample_size:
+        rng = np.random.default_rng(0)
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))]
+    index.train(np.ascontiguousarray(vectors, dtype=np.float32))
+    enable_reconstruct(index)
+
+
+def enable_reconstruct(index: faiss.Index) -> None:
+    """Let an index reconstruct and remove vectors by id (IVF indexes need a hashtable direct map)."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and ivf.direct_map.type != faiss.DirectMap.Hashtable:
+        ivf.set_direct_map_type(faiss.DirectMap.Hashtable)
+
+
+def save_trained_index(index: faiss.Index, path: Path) -> None:
+    """Persist an empty copy of a trained index as the training artifact."""
+    template = faiss.clone_index(index)
+    template.reset()
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    faiss.write_index(template, str(tmp_path))
+    os.replace(tmp_path, path)
+
+
+def load_trained_index(path: Path) -> Optional[faiss.Index]:
+    """Load the persisted training artifact, if any."""
+    if not path.exists():
+        return None
+    index = faiss.read_index(str(path))
+    enable_reconstruct(index)
+    return index
+
+
+def search_parameters(
+    index: faiss.Index,
+    nprobe: Optional[int] = None,
+    ef_search: Optional[int] = None,
+    selector: Optional[faiss.IDSelector] = None,
+) -> Optional[faiss.SearchParameters]:
+    """
+    Build per-query search parameters.
+
+    Args:
+        index: Index being searched
+        nprobe: Inverted lists to visit (IVF indexes)
+        ef_search: Candidate list size (HNSW indexes)
+        selector: Restricts the search to the ids it accepts
+
+    Returns:
+        Search parameters, or None for an unrestricted exact search
+    """
+    if faiss.try_extract_index_ivf(index) is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe or settings.FAISS_NPROBE)
+    if isinstance(base_index(index), faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(
+            sel=selector, efSearch=ef_search or settings.FAISS_EF_SEARCH
+        )
+    if selector is not None:
+        return faiss.SearchParameters(sel=selector)
+    return None
@@ -0,0 +1,281 @@
+"""BM25 keyword index for the FAISS adapter.
+
+``LexicalIndex`` is an inverted index from a token to the document table rows
+holding it, with the token's frequency in each row, plus the token length of
+every row. It follows the table the same way ``MetadataIndex`` does: rows are
+indexed as they are appended, removed rows stay in the posting lists until the
+table is compacted and are dropped by the alive mask meanwhile, and snapshots
+store the live posting lists as concatenated arrays that read-only processes
+memory-map.
+
+Scoring is vectorized per query term: the posting arrays of the query's terms
+are concatenated and their BM25 contributions summed per row with
+``np.bincount``, so a query costs time proportional to its postings rather than
+to the corpus. Document frequencies and the average length count live rows
+only, so deletes do not skew scores; the live-row count and total length are
+kept as running totals, updated by ``add`` and ``remove``.
+"""
+
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.vector.faiss_store import (
+    DocumentTable,
+    _GrowableArray,
+    decode_record,
+)
+
+TERMS_FILE = "lexical.terms.json"
+POSTING_ROWS_FILE = "lexical.rows.npy"
+POSTING_FREQUENCIES_FILE = "lexical.tf.npy"
+POSTING_OFFSETS_FILE = "lexical.offsets.npy"
+LENGTHS_FILE = "lexical.lengths.npy"
+
+# Words, keeping codes and names joined by ".", "-" or "/" (J45.909, ICD-10) whole
+_TOKEN_PATTERN = re.compile(r"\w+(?:[./-]\w+)*")
+_SEPARATOR_PATTERN = re.compile(r"[./-]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase BM25 terms.
+
+    Compound tokens such as ``icd-10`` are kept whole and also split into
+    their parts, so both the exact code and its pieces match.
+
+    Args:
+        text: Document or query text
+
+    Returns:
+        Terms, with repeats
+    """
+    terms = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        terms.append(token)
+        if _SEPARATOR_PATTERN.search(token):
+            terms.extend(part for part in _SEPARATOR_PATTERN.split(token) if part)
+    return terms
+
+
+class LexicalIndex:
+    """BM25 inverted index over document table rows."""
+
+    def __init__(self) -> None:
+        """Initialize an empty lexical index."""
+        self._postings: Dict[str, Tuple[_GrowableArray, _GrowableArray]] = {}
+        self._lengths = _GrowableArray(np.float32)
+        self._live_rows = 0
+        self._live_length = 0.0
+
+    def __len__(self) -> int:
+        """Number of distinct terms."""
+        return len(self._postings)
+
+    @classmethod
+    def build(cls, table: DocumentTable) -> "LexicalIndex":
+        """
+        Build the index from the live rows of a document table.
+
+        Args:
+            table: Document table
+
+        Returns:
+            Lexical index covering every live row
+        """
+        index = cls()
+        rows = table.live_rows()
+        index.add(rows, (decode_record(table.record_at(int(row)))["text"] for row in rows))
+        return index
+
+    @classmethod
+    def load(cls, directory: Path, table: DocumentTable, mmap_mode: bool = False) -> "LexicalIndex":
+        """
+        Load the posting lists saved in a snapshot directory.
+
+        Args:
+            directory: Snapshot directory
+            table: Document table loaded from the same snapshot
+            mmap_mode: Map the posting lists read-only
+
+        Returns:
+            Lexical index covering every live row
+
+        Raises:
+            FileNotFoundError: If the snapshot holds no posting lists
+        """
+        with open(directory / TERMS_FILE, "r") as f:
+            terms = json.load(f)
+        mode = "r" if mmap_mode else None
+        rows = np.load(directory / POSTING_ROWS_FILE, mmap_mode=mode)
+        frequencies = np.load(directory / POSTING_FREQUENCIES_FILE, mmap_mode=mode)
+        offsets = np.load(directory / POSTING_OFFSETS_FILE)
+
+        index = cls()
+        for term, start, end in zip(terms, offsets[:-1], offsets[1:]):
+            index._postings[term] = (
+                _GrowableArray(np.int64, rows[start:end]),
+                _GrowableArray(np.float32, frequencies[start:end]),
+            )
+        index._lengths = _GrowableArray(np.float32, np.load(directory / LENGTHS_FILE, mmap_mode=mode))
+        # Removed rows are saved with zero length
+        index._live_rows = table.live_count
+        index._live_length = float(np.sum(index._lengths.view, dtype=np.float64))
+        return index
+
+    def save(self, directory: Path, alive: np.ndarray) -> None:
+        """
+        Write the live posting lists and row lengths into a snapshot directory.
+
+        Args:
+            directory: Snapshot directory
+            alive: Live-row mask of the table being saved
+        """
+        terms = []
+        rows_list = []
+        frequencies_list = []
+        for term, (rows, frequencies) in self._postings.items():
+            live = alive[rows.view]
+            if live.any():
+                terms.append(term)
+                rows_list.append(rows.view[live])
+                frequencies_list.append(frequencies.view[live])
+
+        with open(directory / TERMS_FILE, "w") as f:
+            json.dump(terms, f, separators=(",", ":"))
+        np.save(
+            directory / POSTING_ROWS_FILE,
+            np.concatenate(rows_list) if rows_list else np.empty(0, dtype=np.int64),
+        )
+        np.save(
+            directory / POSTING_FREQUENCIES_FILE,
+            np.concatenate(frequencies_list) if frequencies_list else np.empty(0, dtype=np.float32),
+        )
+        np.save(
+            directory / POSTING_OFFSETS_FILE,
+            np.concatenate([[0], np.cumsum([len(rows) for rows in rows_list])]),
+        )
+        lengths = np.zeros(len(alive), dtype=np.float32)
+        count = min(len(alive), len(self._lengths))
+        lengths[:count] = np.where(alive[:count], self._lengths.view[:count], 0.0)
+        np.save(directory / LENGTHS_FILE, lengths)
+
+    def add(self, rows: Iterable[int], texts: Iterable[str]) -> None:
+        """
+        Index the text of newly appended rows.
+
+        Args:
+            rows: Table rows, in increasing order
+            texts: Document texts, aligned with rows
+        """
+        batch: Dict[str, Tuple[list, list]] = {}
+        row_list = []
+        lengths = []
+        for row, text in zip(rows, texts):
+            terms = tokenize(text or "")
+            row_list.append(row)
+            lengths.append(len(terms))
+            for term, frequency in Counter(terms).items():
+                term_rows, term_frequencies = batch.setdefault(term, ([], []))
+                term_rows.append(row)
+                term_frequencies.append(frequency)
+
+        if row_list:
+            # Rows may skip removed ones (when building from a table), so grow to fit
+            needed = int(row_list[-1]) + 1
+            if needed > len(self._lengths):
+                self._lengths.extend(np.zeros(needed - len(self._lengths), dtype=np.float32))
+            self._lengths.view[np.asarray(row_list, dtype=np.int64)] = lengths
+            self._live_rows += len(row_list)
+            self._live_length += float(sum(lengths))
+
+        for term, (term_rows, term_frequencies) in batch.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = (
+                    _GrowableArray(np.int64),
+                    _GrowableArray(np.float32),
+                )
+            posting[0].extend(term_rows)
+            posting[1].extend(term_frequencies)
+
+    def remove(self, rows: Iterable[int]) -> None:
+        """
+        Take removed rows out of the collection statistics.
+
+        Their postings stay until the table is compacted; searches skip them
+        by the alive mask.
+
+        Args:
+            rows: Table rows that were live until now
+        """
+        for row in rows:
+            self._live_rows -= 1
+            self._live_length -= float(self._lengths.view[row])
+
+    def search(
+        self,
+        query_text: str,
+        alive: np.ndarray,
+        top_k: int,
+        mask: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank live rows by BM25 score against a query.
+
+        Args:
+            query_text: Keyword query
+            alive: Live-row mask of the document table
+            top_k: Number of rows to return
+            mask: Rows that may be returned, e.g. those matching metadata filters
+                (default: all live rows)
+
+        Returns:
+            Rows and their scores, best first; rows without a query term are left out
+        """
+        empty = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        terms = list(dict.fromkeys(tokenize(query_text or "")))
+        if top_k <= 0 or not terms:
+            return empty
+
+        mask = alive if mask is None else mask
+        # Collection statistics over live rows, so deleted rows do not count
+        if self._live_rows <= 0:
+            return empty
+        lengths = self._lengths.view
+        average_length = max(self._live_length / self._live_rows, 1.0)
+        k1, b = settings.FAISS_BM25_K1, settings.FAISS_BM25_B
+
+        row_parts = []
+        score_parts = []
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            rows, frequencies = posting[0].view, posting[1].view
+            live = alive[rows]
+            document_frequency = int(np.count_nonzero(live))
+            if not document_frequency:
+                continue
+            searchable = mask[rows]
+            rows, frequencies = rows[searchable], frequencies[searchable]
+            idf = np.log1p((self._live_rows - document_frequency + 0.5) / (document_frequency + 0.5))
+            norm = k1 * (1.0 - b + b * lengths[rows] / average_length)
+            row_parts.append(rows)
+            score_parts.append(idf * frequencies * (k1 + 1.0) / (frequencies + norm))
+
+        if not row_parts:
+            return empty
+        unique_rows, positions = np.unique(np.concatenate(row_parts), return_inverse=True)
+        scores = np.bincount(positions, weights=np.concatenate(score_parts)).astype(np.float32)
+        if len(scores) > top_k:
+            best = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            best = np.arange(len(scores))
+        order = best[np.argsort(-scores[best], kind="stable")]
+        return unique_rows[order], scores[order]
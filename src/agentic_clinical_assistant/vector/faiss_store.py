@@ -0,0 +1,738 @@
+"""Crash-safe on-disk storage for the FAISS adapter.
+
+The store is made of two parts that live inside the adapter's index directory:
+
+* an append-only write-ahead log (``wal.log``) holding one checksummed frame per
+  write batch, so a write costs time proportional to the change;
+* periodic snapshots, written as numbered generations (``generation-<n>/``),
+  holding the FAISS index and the columns of a ``DocumentTable``: a string
+  table of document ids, the document records as a binary blob plus an offset
+  index, the mask of live rows, and a sorted hash lookup from id to row, plus the posting lists of the
+  metadata and BM25 keyword indexes. The ``CURRENT`` file names the active generation and is
+  swapped atomically.
+
+Snapshot columns are plain files and ``.npy`` arrays, so a read-only process
+can memory-map the whole snapshot instead of deserializing it. Only one
+process writes at a time, holding ``WriterLock``; readers notice a new
+generation by re-reading ``CURRENT``. The most recent generations are kept so
+a reader that is still opening the previous one does not lose it.
+
+Embeddings are never stored in the document records; the index holds them.
+
+On startup the adapter loads the current snapshot and replays every log frame
+with a higher log sequence number (LSN). A frame cut short by a crash fails its
+length or checksum check and is truncated away.
+"""
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import struct
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+if TYPE_CHECKING:
+    from agentic_clinical_assistant.vector.faiss_filters import MetadataIndex
+    from agentic_clinical_assistant.vector.faiss_lexical import LexicalIndex
+
+LOG_FILE = "wal.log"
+CURRENT_FILE = "CURRENT"
+LOCK_FILE = "writer.lock"
+GENERATION_PREFIX = "generation-"
+INDEX_FILE = "index.faiss"
+IDS_FILE = "ids.bin"
+ID_OFFSETS_FILE = "ids.offsets.npy"
+RECORDS_FILE = "documents.bin"
+OFFSETS_FILE = "documents.offsets.npy"
+LOOKUP_KEYS_FILE = "lookup.keys.npy"
+LOOKUP_ROWS_FILE = "lookup.rows.npy"
+ALIVE_FILE = "alive.npy"
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+# Read-only loads map index data and table columns instead of copying them
+MMAP_IO_FLAGS = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_MMAP_IFC | faiss.IO_FLAG_READ_ONLY
+
+# Log operations
+OP_PUT = 1
+OP_DELETE = 2
+
+# Frame layout: header (lsn, op, body length), body, crc32 of header + body
+_FRAME_HEADER = struct.Struct("<QBQ")
+_FRAME_CRC = struct.Struct("<I")
+_META_LENGTH = struct.Struct("<Q")
+
+
+@dataclass
+class LogRecord:
+    """A single write batch recorded in the log."""
+
+    lsn: int
+    op: int
+    document_ids: List[str]
+    records: List[bytes] = field(default_factory=list)
+    vectors: Optional[np.ndarray] = None
+
+
+@dataclass
+class Snapshot:
+    """A loaded snapshot: index, document table and the LSN it covers."""
+
+    lsn: int
+    index: faiss.Index
+    table: "DocumentTable"
+    directory: Path
+
+    @property
+    def generation(self) -> str:
+        """Name of the snapshot directory."""
+        return self.directory.name
+
+
+def decode_record(payload: bytes) -> Dict[str, Any]:
+    """Decode a document record stored as compact JSON."""
+    return json.loads(payload)
+
+
+class RecordLog:
+    """Append-only log of checksummed write batches."""
+
+    def __init__(self, path: Path, dimension: int, fsync: bool = True):
+        """
+        Initialize record log.
+
+        Args:
+            path: Log file path
+            dimension: Embedding dimension of logged vectors
+            fsync: Whether to fsync after every append
+        """
+        self.path = path
+        self.dimension = dimension
+        self.fsync = fsync
+        self.next_lsn = 1
+        self._file = None
+
+    def open(self, start_lsn: int = 0) -> List[LogRecord]:
+        """
+        Open the log for appending and return the records it holds.
+
+        A torn or corrupt tail left by an interrupted write is truncated.
+
+        Args:
+            start_lsn: LSN covered by the current snapshot
+
+        Returns:
+            Records in log order
+        """
+        records: List[LogRecord] = []
+        valid_length = 0
+
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                data = f.read()
+            valid_length, records = self._scan(data)
+            if valid_length < len(data):
+                with open(self.path, "r+b") as f:
+                    f.truncate(valid_length)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+        last_lsn = records[-1].lsn if records else 0
+        self.next_lsn = max(start_lsn, last_lsn) + 1
+        self._file = open(self.path, "ab")
+        return records
+
+    def append(
+        self,
+        op: int,
+        document_ids: Sequence[str],
+        records: Optional[Sequence[bytes]] = None,
+        vectors: Optional[np.ndarray] = None,
+    ) -> int:
+        """
+        Append one write batch as a single frame.
+
+        Args:
+            op: Operation (OP_PUT or OP_DELETE)
+            document_ids: Ids of the documents written or deleted
+            records: Encoded document records (OP_PUT only)
+            vectors: Float32 matrix with one row per document (OP_PUT only)
+
+        Returns:
+            LSN assigned to the frame
+        """
+        if self._file is None:
+            raise RuntimeError("Record log is not open")
+
+        ids = json.dumps(list(document_ids), separators=(",", ":")).encode("utf-8")
+        parts = [_META_LENGTH.pack(len(ids)), ids]
+        if op == OP_PUT:
+            parts.append(np.array([len(record) for record in records], dtype=np.int64).tobytes())
+            parts.extend(records)
+            parts.append(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        body = b"".join(parts)
+
+        lsn = self.next_lsn
+        header = _FRAME_HEADER.pack(lsn, op, len(body))
+        crc = zlib.crc32(body, zlib.crc32(header))
+        self._file.write(header + body + _FRAME_CRC.pack(crc))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+        self.next_lsn += 1
+        return lsn
+
+    def reset(self) -> None:
+        """Drop all frames once a snapshot covers them."""
+        if self._file is None:
+            raise RuntimeError("Record log is not open")
+        self._file.truncate(0)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the log file."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _scan(self, data: bytes) -> Tuple[int, List[LogRecord]]:
+        """Parse frames until the end of data or the first invalid frame."""
+        records = []
+        offset = 0
+        while offset + _FRAME_HEADER.size <= len(data):
+            header = data[offset : offset + _FRAME_HEADER.size]
+            lsn, op, body_length = _FRAME_HEADER.unpack(header)
+            body_start = offset + _FRAME_HEADER.size
+            body_end = body_start + body_length
+            frame_end = body_end + _FRAME_CRC.size
+            if frame_end > len(data):
+                break
+
+            body = data[body_start:body_end]
+            (crc,) = _FRAME_CRC.unpack(data[body_end:frame_end])
+            if crc != zlib.crc32(body, zlib.crc32(header)):
+                break
+
+            records.append(self._decode_body(lsn, op, body))
+            offset = frame_end
+        return offset, records
+
+    def _decode_body(self, lsn: int, op: int, body: bytes) -> LogRecord:
+        """Decode a frame body into a log record."""
+        (ids_length,) = _META_LENGTH.unpack_from(body)
+        position = _META_LENGTH.size + ids_length
+        document_ids = json.loads(body[_META_LENGTH.size : position])
+        if op != OP_PUT:
+            return LogRecord(lsn=lsn, op=op, document_ids=document_ids)
+
+        count = len(document_ids)
+        lengths = np.frombuffer(body, dtype=np.int64, count=count, offset=position)
+        position += lengths.nbytes
+        records = []
+        for length in lengths:
+            records.append(body[position : position + length])
+            position += int(length)
+        vectors = np.frombuffer(body, dtype=np.float32, offset=position).reshape(
+            count, self.dimension
+        )
+        return LogRecord(
+            lsn=lsn, op=op, document_ids=document_ids, records=records, vectors=vectors
+        )
+
+
+class WriterLock:
+    """Exclusive, process-wide lock held by the single writer of an index directory."""
+
+    def __init__(self, path: Path):
+        """
+        Initialize writer lock.
+
+        Args:
+            path: Lock file path
+        """
+        self.path = path
+        self._file = None
+
+    @property
+    def held(self) -> bool:
+        """Whether this process holds the lock."""
+        return self._file is not None
+
+    def acquire(self, timeout: float = 0.0) -> None:
+        """
+        Take the lock, waiting up to ``timeout`` seconds for another writer.
+
+        Args:
+            timeout: Seconds to wait before giving up
+
+        Raises:
+            RuntimeError: If another process still holds the lock
+        """
+        if self._file is not None:
+            return
+
+        f = open(self.path, "a+")
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError as exc:
+                if time.monotonic() >= deadline:
+                    f.close()
+                    raise RuntimeError(
+                        f"Another process is writing to the FAISS index at {self.path.parent}"
+                    ) from exc
+                time.sleep(0.05)
+
+        f.seek(0)
+        f.truncate()
+        f.write(str(os.getpid()))
+        f.flush()
+        self._file = f
+
+    def release(self) -> None:
+        """Release the lock."""
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+
+class _GrowableArray:
+    """One-dimensional NumPy array with amortized appends."""
+
+    def __init__(self, dtype: Any, data: Optional[np.ndarray] = None):
+        self._data = np.asarray(data if data is not None else [], dtype=dtype)
+        self._size = len(self._data)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def view(self) -> np.ndarray:
+        """Filled part of the array."""
+        return self._data[: self._size]
+
+    def extend(self, values: Any) -> None:
+        """Append values, doubling capacity when full."""
+        values = np.asarray(values, dtype=self._data.dtype)
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data), 1024), dtype=self._data.dtype)
+            grown[: self._size] = self._data[: self._size]
+            self._data = grown
+        self._data[self._size : needed] = values
+        self._size = needed
+
+
+def id_hash(document_id: str) -> int:
+    """Stable 64-bit hash of a document id."""
+    digest = hashlib.blake2b(document_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class DocumentTable:
+    """
+    Compact row-oriented document store for the FAISS adapter.
+
+    Row ``i`` describes FAISS row ``i``. Document ids live in a string table
+    (one UTF-8 blob plus an offset array) and records in a second blob, so a
+    million documents cost a handful of NumPy arrays instead of a million
+    ``Document`` objects and two dicts. Id-to-row lookups go through a sorted
+    array of 64-bit id hashes, with recent inserts kept in a small dict until
+    they are merged in.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty document table."""
+        self._id_blob = bytearray()
+        self._id_offsets = _GrowableArray(np.int64, [0])
+        self._record_blob = bytearray()
+        self._record_offsets = _GrowableArray(np.int64, [0])
+        self._alive = _GrowableArray(np.bool_)
+        self._lookup_keys = np.empty(0, dtype=np.uint64)
+        self._lookup_rows = np.empty(0, dtype=np.int64)
+        self._recent: Dict[str, int] = {}
+        self._live_count = 0
+
+    def __len__(self) -> int:
+        """Number of rows, including removed ones."""
+        return len(self._alive)
+
+    @property
+    def live_count(self) -> int:
+        """Number of rows holding a live document."""
+        return self._live_count
+
+    @property
+    def alive(self) -> np.ndarray:
+        """Boolean mask of live rows."""
+        return self._alive.view
+
+    def append(self, document_ids: Sequence[str], records: Sequence[bytes]) -> List[int]:
+        """
+        Append one row per document; rows already holding an id are removed.
+
+        Args:
+            document_ids: Document ids
+            records: Encoded records, aligned with document_ids
+
+        Returns:
+            Rows that were replaced
+        """
+        replaced = [row for row in self.rows_of(list(dict.fromkeys(document_ids))) if row >= 0]
+        for row in replaced:
+            self.remove(row)
+
+        first_row = len(self)
+        encoded_ids = [document_id.encode("utf-8") for document_id in document_ids]
+        self._id_blob += b"".join(encoded_ids)
+        self._record_blob += b"".join(records)
+        self._id_offsets.extend(
+            self._id_offsets.view[-1] + np.cumsum([len(value) for value in encoded_ids])
+        )
+        self._record_offsets.extend(
+            self._record_offsets.view[-1] + np.cumsum([len(value) for value in records])
+        )
+
+        # A document repeated within the batch keeps only its last row
+        latest = {document_id: row for row, document_id in enumerate(document_ids, first_row)}
+        alive = np.zeros(len(document_ids), dtype=np.bool_)
+        alive[np.fromiter(latest.values(), dtype=np.int64, count=len(latest)) - first_row] = True
+        self._alive.extend(alive)
+        replaced.extend(first_row + np.flatnonzero(~alive))
+
+        self._recent.update(latest)
+        self._live_count += len(latest)
+        if len(self._recent) > max(1024, len(self._lookup_keys) // 8):
+            self._merge_recent()
+        return [int(row) for row in replaced]
+
+    def remove(self, row: int) -> None:
+        """Mark a row as removed."""
+        if self._alive.view[row]:
+            self._alive.view[row] = False
+            self._live_count -= 1
+            document_id = self.id_at(row)
+            if self._recent.get(document_id) == row:
+                del self._recent[document_id]
+
+    def row_of(self, document_id: str) -> Optional[int]:
+        """Live row holding a document id, if any."""
+        row = self.rows_of([document_id])[0]
+        return int(row) if row >= 0 else None
+
+    def rows_of(self, document_ids: Sequence[str]) -> np.ndarray:
+        """Live rows holding each document id, -1 where there is none."""
+        rows = np.full(len(document_ids), -1, dtype=np.int64)
+        alive = self._alive.view
+        pending = []
+        for position, document_id in enumerate(document_ids):
+            row = self._recent.get(document_id)
+            if row is None:
+                pending.append(position)
+            elif alive[row]:
+                rows[position] = row
+
+        if pending and len(self._lookup_keys):
+            keys = np.fromiter(
+                (id_hash(document_ids[position]) for position in pending),
+                dtype=np.uint64,
+                count=len(pending),
+            )
+            starts = np.searchsorted(self._lookup_keys, keys, side="left")
+            ends = np.searchsorted(self._lookup_keys, keys, side="right")
+            for position, start, end in zip(pending, starts, ends):
+                for row in self._lookup_rows[start:end]:
+                    if alive[row] and self.id_at(int(row)) == document_ids[position]:
+                        rows[position] = row
+                        break
+        return rows
+
+    def id_at(self, row: int) -> str:
+        """Document id stored in a row."""
+        offsets = self._id_offsets.view
+        return bytes(self._id_blob[offsets[row] : offsets[row + 1]]).decode("utf-8")
+
+    def record_at(self, row: int) -> bytes:
+        """Encoded record stored in a row."""
+        offsets = self._record_offsets.view
+        return bytes(self._record_blob[offsets[row] : offsets[row + 1]])
+
+    def live_rows(self) -> np.ndarray:
+        """Rows holding a live document."""
+        return np.flatnonzero(self._alive.view)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        """Fraction of rows that hold a removed document."""
+        if not len(self):
+            return 0.0
+        return 1.0 - self._live_count / len(self)
+
+    def compacted(self) -> "DocumentTable":
+        """Copy of the table holding only live rows, renumbered from zero in row order."""
+        rows = self.live_rows()
+        table = DocumentTable()
+        table.append(
+            [self.id_at(int(row)) for row in rows],
+            [self.record_at(int(row)) for row in rows],
+        )
+        return table
+
+    def save(self, directory: Path) -> None:
+        """Write the table columns into a snapshot directory."""
+        self._merge_recent()
+        alive = self._alive.view
+        with open(directory / IDS_FILE, "wb") as f:
+            f.write(self._id_blob)
+        np.save(directory / ID_OFFSETS_FILE, self._id_offsets.view)
+
+        # Removed rows keep their slot but drop their record bytes
+        offsets = self._record_offsets.view
+        lengths = np.where(alive, np.diff(offsets), 0)
+        with open(directory / RECORDS_FILE, "wb") as f:
+            for row in np.flatnonzero(alive):
+                f.write(self._record_blob[offsets[row] : offsets[row + 1]])
+        np.save(directory / OFFSETS_FILE, np.concatenate([[0], np.cumsum(lengths)]))
+        np.save(directory / ALIVE_FILE, alive)
+
+        live = alive[self._lookup_rows] if len(self._lookup_rows) else np.zeros(0, dtype=bool)
+        np.save(directory / LOOKUP_KEYS_FILE, self._lookup_keys[live])
+        np.save(directory / LOOKUP_ROWS_FILE, self._lookup_rows[live])
+
+    @classmethod
+    def load(
+        cls, directory: Path, mmap_mode: bool = False, live_count: Optional[int] = None
+    ) -> "DocumentTable":
+        """
+        Read table columns from a snapshot directory.
+
+        Args:
+            directory: Snapshot directory
+            mmap_mode: Map the columns read-only instead of reading them into
+                memory; the table must not be modified afterwards
+            live_count: Live rows, as recorded in the manifest (counted from
+                the alive mask if not given)
+
+        Returns:
+            Loaded document table
+        """
+        table = cls()
+        mode = "r" if mmap_mode else None
+        if mmap_mode:
+            table._id_blob = _map_file(directory / IDS_FILE)
+            table._record_blob = _map_file(directory / RECORDS_FILE)
+        else:
+            with open(directory / IDS_FILE, "rb") as f:
+                table._id_blob = bytearray(f.read())
+            with open(directory / RECORDS_FILE, "rb") as f:
+                table._record_blob = bytearray(f.read())
+        table._id_offsets = _GrowableArray(
+            np.int64, np.load(directory / ID_OFFSETS_FILE, mmap_mode=mode)
+        )
+        table._record_offsets = _GrowableArray(
+            np.int64, np.load(directory / OFFSETS_FILE, mmap_mode=mode)
+        )
+        table._alive = _GrowableArray(np.bool_, np.load(directory / ALIVE_FILE, mmap_mode=mode))
+        table._lookup_keys = np.load(directory / LOOKUP_KEYS_FILE, mmap_mode=mode)
+        table._lookup_rows = np.load(directory / LOOKUP_ROWS_FILE, mmap_mode=mode)
+        if live_count is None:
+            live_count = int(np.count_nonzero(table._alive.view))
+        table._live_count = live_count
+        return table
+
+    def _merge_recent(self) -> None:
+        """Fold recent inserts into the sorted hash lookup."""
+        if not self._recent:
+            return
+        recent_keys = np.fromiter(
+            (id_hash(document_id) for document_id in self._recent),
+            dtype=np.uint64,
+            count=len(self._recent),
+        )
+        recent_rows = np.fromiter(self._recent.values(), dtype=np.int64, count=len(self._recent))
+        keys = np.concatenate([self._lookup_keys, recent_keys])
+        rows = np.concatenate([self._lookup_rows, recent_rows])
+        keep = self._alive.view[rows]
+        order = np.argsort(keys[keep], kind="stable")
+        self._lookup_keys = keys[keep][order]
+        self._lookup_rows = rows[keep][order]
+        self._recent.clear()
+
+
+def read_current_snapshot(root: Path, mmap_mode: bool = False) -> Optional[Snapshot]:
+    """
+    Load the snapshot named by the ``CURRENT`` pointer.
+
+    Args:
+        root: Index directory
+        mmap_mode: Map the index and table read-only, so processes on one node
+            share the page cache and load time does not grow with the corpus
+
+    Returns:
+        Snapshot if one has been written, None otherwise
+    """
+    generation = current_generation(root)
+    if generation is None:
+        return None
+
+    directory = root / generation
+    with open(directory / MANIFEST_FILE, "r") as f:
+        manifest = json.load(f)
+
+    index = faiss.read_index(str(directory / INDEX_FILE), MMAP_IO_FLAGS if mmap_mode else 0)
+    return Snapshot(
+        lsn=manifest["lsn"],
+        index=index,
+        table=DocumentTable.load(
+            directory, mmap_mode=mmap_mode, live_count=manifest["live_count"]
+        ),
+        directory=directory,
+    )
+
+
+def current_generation(root: Path) -> Optional[str]:
+    """
+    Name of the snapshot directory the ``CURRENT`` pointer names.
+
+    Args:
+        root: Index directory
+
+    Returns:
+        Directory name, or None before the first snapshot
+    """
+    try:
+        return (root / CURRENT_FILE).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def write_snapshot(
+    root: Path,
+    lsn: int,
+    index: faiss.Index,
+    table: DocumentTable,
+    filters: Optional["MetadataIndex"] = None,
+    keep_generations: int = 1,
+    lexical: Optional["LexicalIndex"] = None,
+) -> Path:
+    """
+    Write a snapshot as a new generation and atomically make it current.
+
+    Args:
+        root: Index directory
+        lsn: Last log sequence number covered by the snapshot
+        index: FAISS index to persist
+        table: Document table aligned with the index rows
+        filters: Metadata index over the table rows
+        keep_generations: Number of most recent generations to keep on disk
+        lexical: BM25 keyword index over the table rows
+
+    Returns:
+        Path of the new snapshot directory
+    """
+    generations = _generation_numbers(root)
+    generation = max(generations, default=0) + 1
+    name = f"{GENERATION_PREFIX}{generation:012d}"
+    directory = root / name
+    staging = root / f"{name}.tmp"
+    if staging.exists():
+        shutil.rmtree(staging)
+    staging.mkdir(parents=True)
+
+    faiss.write_index(index, str(staging / INDEX_FILE))
+    table.save(staging)
+    if filters is not None:
+        filters.save(staging, table.alive)
+    if lexical is not None:
+        lexical.save(staging, table.alive)
+    with open(staging / MANIFEST_FILE, "w") as f:
+        json.dump(
+            {
+                "format_version": FORMAT_VERSION,
+                "generation": generation,
+                "lsn": lsn,
+                "count": len(table),
+                "live_count": table.live_count,
+            },
+            f,
+        )
+
+    for path in staging.iterdir():
+        _fsync_path(path)
+    os.replace(staging, directory)
+    _fsync_path(root)
+
+    _replace_file(root / CURRENT_FILE, name)
+    _remove_stale_snapshots(root, keep=max(keep_generations, 1))
+    return directory
+
+
+def _map_file(path: Path) -> Any:
+    """Map a file read-only; slicing the result yields bytes."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""  # Empty files cannot be mapped
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _replace_file(path: Path, content: str) -> None:
+    """Atomically replace a small text file."""
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    _fsync_path(path.parent)
+
+
+def _generation_numbers(root: Path) -> List[int]:
+    """Numbers of the generation directories in an index directory."""
+    numbers = []
+    for path in root.glob(f"{GENERATION_PREFIX}*"):
+        suffix = path.name[len(GENERATION_PREFIX) :]
+        if suffix.isdigit() and path.is_dir():
+            numbers.append(int(suffix))
+    return numbers
+
+
+def _remove_stale_snapshots(root: Path, keep: int) -> None:
+    """Remove all but the ``keep`` newest generations."""
+    retained = set(sorted(_generation_numbers(root))[-keep:])
+    for path in root.glob(f"{GENERATION_PREFIX}*"):
+        suffix = path.name[len(GENERATION_PREFIX) :]
+        if path.is_dir() and not (suffix.isdigit() and int(suffix) in retained):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _fsync_path(path: Path) -> None:
+    """Flush a file or directory entry to disk."""
+    flags = os.O_RDONLY
+    if hasattr(os, "O_DIRECTORY") and path.is_dir():
+        flags |= os.O_DIRECTORY
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        # Some platforms do not support fsync on directories
+        pass
+    finally:
+        os.close(fd)
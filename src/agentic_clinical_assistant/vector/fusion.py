@@ -0,0 +1,104 @@
+"""Fuse ranked results from several vector backends.
+
+Backends score on different scales (FAISS ``1 - d/10``, Weaviate
+``1 - distance``, Pinecone its own metric), so their raw scores cannot be
+compared or averaged. Reciprocal-rank fusion uses ranks only; score fusion
+min-max normalizes each backend's list before summing.
+"""
+
+from enum import Enum
+from typing import Dict, List, Optional
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.vector.base import SearchHit
+
+
+class FusionMethod(str, Enum):
+    """Ways of fusing per-backend result lists."""
+
+    RRF = "rrf"
+    SCORE = "score"
+
+
+def _key(result: SearchHit) -> str:
+    """Identity of a document across backends, which store it under the same id."""
+    return result.id
+
+
+def _ranked(
+    scores: Dict[str, float], results: Dict[str, SearchHit], top_k: int
+) -> List[SearchHit]:
+    """Top results by fused score, carrying the fused score."""
+    ranked = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    return [results[key].with_score(scores[key]) for key in ranked]
+
+
+def reciprocal_rank_fusion(
+    results_list: List[List[SearchHit]], top_k: int, k: Optional[int] = None
+) -> List[SearchHit]:
+    """
+    Fuse result lists by summing ``1 / (k + rank)`` over the lists holding each document.
+
+    Args:
+        results_list: One ranked result list per backend
+        top_k: Number of results to return
+        k: Rank damping constant (default: ``VECTOR_RRF_K``)
+
+    Returns:
+        Fused results, best first
+    """
+    k = settings.VECTOR_RRF_K if k is None else k
+    scores: Dict[str, float] = {}
+    results: Dict[str, SearchHit] = {}
+    for backend_results in results_list:
+        for rank, result in enumerate(backend_results, start=1):
+            key = _key(result)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            results.setdefault(key, result)
+    return _ranked(scores, results, top_k)
+
+
+def normalized_score_fusion(results_list: List[List[SearchHit]], top_k: int) -> List[SearchHit]:
+    """
+    Fuse result lists by summing min-max normalized scores.
+
+    Args:
+        results_list: One ranked result list per backend
+        top_k: Number of results to return
+
+    Returns:
+        Fused results, best first
+    """
+    scores: Dict[str, float] = {}
+    results: Dict[str, SearchHit] = {}
+    for backend_results in results_list:
+        if not backend_results:
+            continue
+        low = min(result.score for result in backend_results)
+        high = max(result.score for result in backend_results)
+        for result in backend_results:
+            key = _key(result)
+            normalized = (result.score - low) / (high - low) if high > low else 1.0
+            scores[key] = scores.get(key, 0.0) + normalized
+            results.setdefault(key, result)
+    return _ranked(scores, results, top_k)
+
+
+def fuse_results(
+    results_list: List[List[SearchHit]], top_k: int, method: Optional[str] = None
+) -> List[SearchHit]:
+    """
+    Fuse per-backend results for one query.
+
+    Args:
+        results_list: One ranked result list per backend
+        top_k: Number of results to return
+        method: "rrf" or "score" (default: ``VECTOR_FUSION_METHOD``)
+
+    Returns:
+        Fused results, best first
+    """
+    method = FusionMethod(method or settings.VECTOR_FUSION_METHOD)
+    if method == FusionMethod.SCORE:
+        return normalized_score_fusion(results_list, top_k)
+    return reciprocal_rank_fusion(results_list, top_k)
@@ -0,0 +1,65 @@
+"""Plan embedding batches by token length.
+
+A transformer pads every text in a batch to the longest one, so a batch that
+mixes short queries with long policy paragraphs spends most of its compute on
+padding. ``token_buckets`` sorts texts by token count and cuts the sorted run
+into buckets whose padded size (rows times longest text) stays within a token
+budget: short texts travel in wide batches, long ones in narrow batches.
+
+Texts longer than the model's maximum sequence length are truncated by the
+model, losing their tail. ``token_windows`` instead splits the token ids of
+such a text into overlapping windows of at most that length; each window is
+embedded and the window embeddings are averaged.
+"""
+
+from typing import List, Sequence
+
+
+def token_buckets(lengths: Sequence[int], token_budget: int) -> List[List[int]]:
+    """
+    Group texts into buckets of similar length within a token budget.
+
+    Args:
+        lengths: Token count of each text, special tokens included
+        token_budget: Largest rows x longest-length product of a bucket; a text
+            longer than the budget gets a bucket of its own
+
+    Returns:
+        Buckets of text positions, shortest texts first
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    buckets: List[List[int]] = []
+    bucket: List[int] = []
+    for position in order:
+        # Sorted ascending, so the incoming text is the longest of the bucket
+        if bucket and (len(bucket) + 1) * lengths[position] > token_budget:
+            buckets.append(bucket)
+            bucket = []
+        bucket.append(position)
+    if bucket:
+        buckets.append(bucket)
+    return buckets
+
+
+def token_windows(token_ids: Sequence[int], capacity: int, overlap: int) -> List[Sequence[int]]:
+    """
+    Split token ids into overlapping windows that each fit the model.
+
+    Args:
+        token_ids: Token ids of one text, without special tokens
+        capacity: Most ids per window
+        overlap: Ids shared by consecutive windows (clamped below ``capacity``)
+
+    Returns:
+        Windows in text order; a single window if the ids fit
+    """
+    if len(token_ids) <= capacity:
+        return [token_ids]
+    stride = capacity - min(max(overlap, 0), capacity - 1)
+    windows = []
+    start = 0
+    while True:
+        windows.append(token_ids[start : start + capacity])
+        if start + capacity >= len(token_ids):
+            return windows
+        start += stride
@@ -1,14 +1,37 @@
 """Vector database manager with unified interface and backend selection."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import contextlib
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, TypeVar
 
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from agentic_clinical_assistant.config import settings
-from agentic_clinical_assistant.vector.base import Document, SearchResult, VectorDB, VectorDBBackend
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
+from agentic_clinical_assistant.vector.base import (
+    Document,
+    EmbeddingLike,
+    QueryMatrix,
+    SearchHit,
+    VectorDB,
+    VectorDBBackend,
+)
+from agentic_clinical_assistant.vector.cache import SearchCache
+from agentic_clinical_assistant.vector.dedup import forget_documents
+from agentic_clinical_assistant.vector.executor import run_blocking
 from agentic_clinical_assistant.vector.faiss_adapter import FAISSAdapter
+from agentic_clinical_assistant.vector.fusion import fuse_results
 from agentic_clinical_assistant.vector.pinecone_adapter import PineconeAdapter
+from agentic_clinical_assistant.vector.routing import BackendRouter
 from agentic_clinical_assistant.vector.weaviate_adapter import WeaviateAdapter
+from agentic_clinical_assistant.vector.write_counter import WriteCounter
+
+T = TypeVar("T")
+BackendCall = Callable[[VectorDB], Awaitable[T]]
+
+# Cache scope of searches that name no backend and may be served by any
+ROUTED_SCOPE = "routed"
 
 
 class VectorDBManager:
@@ -19,36 +42,115 @@ class VectorDBManager:
         self.adapters: Dict[VectorDBBackend, VectorDB] = {}
         self.default_backend = VectorDBBackend(settings.DEFAULT_VECTOR_BACKEND)
         self.enable_multi_backend = settings.ENABLE_MULTI_BACKEND_RETRIEVAL
-
-    async def initialize(self, backends: Optional[List[VectorDBBackend]] = None) -> None:
+        self.router = BackendRouter()
+        # Registered adapters that have not connected yet (lazy mode)
+        self._pending: Set[VectorDBBackend] = set()
+        self._connecting: Dict[VectorDBBackend, asyncio.Future] = {}
+        # Adapters that failed to connect, retried by the health probe
+        self.unavailable: Dict[VectorDBBackend, VectorDB] = {}
+        self._health_probe: Optional[asyncio.Task] = None
+        self.cache = SearchCache()
+        # Bumped by every write through the manager, invalidating cached results
+        self._write_epochs: Dict[VectorDBBackend, int] = {}
+        # Writes through managers in other processes, such as ingestion workers
+        self.write_counter = WriteCounter() if settings.VECTOR_CACHE_WRITE_COUNTER else None
+
+    async def initialize(
+        self, backends: Optional[List[VectorDBBackend]] = None, lazy: Optional[bool] = None
+    ) -> None:
         """
         Initialize vector database adapters.
 
+        Backends connect concurrently, each within
+        ``VECTOR_INIT_TIMEOUT_SECONDS``, so startup waits for the slowest
+        backend at most that long. In lazy mode adapters are only registered
+        and connect on first use. Backends that fail to connect are retried by
+        a background health probe every ``VECTOR_HEALTH_PROBE_INTERVAL_SECONDS``.
+
         Args:
             backends: List of backends to initialize (default: all)
+            lazy: Connect on first use (default: ``VECTOR_LAZY_INIT``)
         """
+        lazy = settings.VECTOR_LAZY_INIT if lazy is None else lazy
         if backends is None:
             backends = [VectorDBBackend.FAISS, VectorDBBackend.PINECONE, VectorDBBackend.WEAVIATE]
 
         for backend in backends:
-            if backend == VectorDBBackend.FAISS:
-                adapter = FAISSAdapter()
-            elif backend == VectorDBBackend.PINECONE:
-                if settings.PINECONE_API_KEY:
-                    adapter = PineconeAdapter()
-                else:
-                    continue  # Skip if no API key
-            elif backend == VectorDBBackend.WEAVIATE:
-                adapter = WeaviateAdapter()
-            else:
-                continue
-
-            try:
-                await adapter.initialize()
+            adapter = self._create_adapter(backend)
+            if adapter is not None:
                 self.adapters[backend] = adapter
-            except Exception as e:
-                # Log error but continue with other backends
-                print(f"Warning: Failed to initialize {backend.value}: {e}")
+                self._pending.add(backend)
+
+        if not lazy:
+            await asyncio.gather(
+                *(self._ensure_connected(backend) for backend in list(self._pending)),
+                return_exceptions=True,
+            )
+        self._start_health_probe()
+
+    @staticmethod
+    def _create_adapter(backend: VectorDBBackend) -> Optional[VectorDB]:
+        """Construct the adapter of a backend, or None if it is not configured."""
+        if backend == VectorDBBackend.FAISS:
+            return FAISSAdapter()
+        if backend == VectorDBBackend.PINECONE:
+            # Skip if no API key
+            return PineconeAdapter() if settings.PINECONE_API_KEY else None
+        if backend == VectorDBBackend.WEAVIATE:
+            return WeaviateAdapter()
+        return None
+
+    async def _ensure_connected(self, backend: VectorDBBackend) -> None:
+        """Connect a registered adapter on first use; concurrent callers share one attempt."""
+        if backend not in self._pending:
+            return
+        task = self._connecting.get(backend)
+        if task is None:
+            task = self._connecting[backend] = asyncio.ensure_future(self._connect(backend))
+        # A caller giving up (timeout, hedge) must not cancel the attempt for the others
+        await asyncio.shield(task)
+
+    async def _connect(self, backend: VectorDBBackend) -> None:
+        """Initialize an adapter within the timeout, moving it to unavailable on failure."""
+        adapter = self.adapters.get(backend) or self.unavailable[backend]
+        try:
+            await asyncio.wait_for(
+                adapter.initialize(), timeout=settings.VECTOR_INIT_TIMEOUT_SECONDS
+            )
+        except Exception as e:
+            # Log error but continue with other backends
+            print(f"Warning: Failed to initialize {backend.value}: {e!r}")
+            self.adapters.pop(backend, None)
+            self.unavailable[backend] = adapter
+            raise
+        else:
+            self.adapters[backend] = adapter
+            self.unavailable.pop(backend, None)
+        finally:
+            self._pending.discard(backend)
+            self._connecting.pop(backend, None)
+
+    def _start_health_probe(self) -> None:
+        """Start the background reconnect loop, once."""
+        if self._health_probe is None and settings.VECTOR_HEALTH_PROBE_INTERVAL_SECONDS > 0:
+            self._health_probe = asyncio.ensure_future(self._probe_health())
+
+    async def _probe_health(self) -> None:
+        """Reconnect failed adapters every VECTOR_HEALTH_PROBE_INTERVAL_SECONDS."""
+        while True:
+            await asyncio.sleep(settings.VECTOR_HEALTH_PROBE_INTERVAL_SECONDS)
+            # Failures stay unavailable until the next round
+            await asyncio.gather(
+                *(self._connect(backend) for backend in list(self.unavailable)),
+                return_exceptions=True,
+            )
+
+    async def _ready_adapter(self, backend: Optional[VectorDBBackend] = None) -> VectorDB:
+        """Adapter for a backend, connecting it first if it was registered lazily."""
+        backend = backend or self.default_backend
+        self.get_adapter(backend)
+        await self._ensure_connected(backend)
+        return self.get_adapter(backend)
 
     def get_adapter(self, backend: Optional[VectorDBBackend] = None) -> VectorDB:
         """
@@ -83,123 +185,473 @@ class VectorDBManager:
         Returns:
             List of document IDs
         """
-        adapter = self.get_adapter(backend)
-        return await adapter.add_documents(documents, batch_size=batch_size)
+        adapter = await self._ready_adapter(backend)
+        try:
+            return await adapter.add_documents(documents, batch_size=batch_size)
+        finally:
+            await self._record_write(adapter.backend)
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
     async def search(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingLike,
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         backend: Optional[VectorDBBackend] = None,
         **kwargs: Any,
-    ) -> List[SearchResult]:
+    ) -> List[SearchHit]:
         """
         Search for similar documents.
 
+        With ``VECTOR_CACHE_ENABLED`` a repeated search is answered from the
+        result cache; see ``get_cached`` to skip embedding the query as well.
+
         Args:
             query_embedding: Query vector embedding
             top_k: Number of results to return
             filters: Metadata filters
             backend: Backend to use (None = use default or multi-backend)
-            **kwargs: Additional backend-specific parameters
+            **kwargs: Additional backend-specific parameters; ``query_text``
+                keys the cache entry when given
 
         Returns:
             List of search results
         """
-        if backend is not None:
-            # Single backend search
-            adapter = self.get_adapter(backend)
-            return await adapter.search(query_embedding, top_k=top_k, filters=filters, **kwargs)
+        if not settings.VECTOR_CACHE_ENABLED:
+            return await self._search(query_embedding, top_k, filters, backend, **kwargs)
+
+        if self.write_counter is not None:
+            await self.write_counter.refresh([name.value for name in self.adapters])
+        scope, token = self._cache_scope(backend)
+        if token is None:
+            return await self._search(query_embedding, top_k, filters, backend, **kwargs)
+        query_text = kwargs.get("query_text")
+        options = {key: value for key, value in kwargs.items() if key != "query_text"}
+        cache_args = (scope, token, top_k, filters, options)
+        cached = self.cache.lookup(
+            *cache_args, query_embedding=query_embedding, query_text=query_text
+        )
+        if cached is not None:
+            return cached
+
+        results = await self._search(query_embedding, top_k, filters, backend, **kwargs)
+        self.cache.store(
+            *cache_args, results, query_embedding=query_embedding, query_text=query_text
+        )
+        return results
+
+    def get_cached(
+        self,
+        query_text: str,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        backend: Optional[VectorDBBackend] = None,
+        **kwargs: Any,
+    ) -> Optional[List[SearchHit]]:
+        """
+        Look a query up in the result cache by its text, before embedding it.
+
+        Matches entries stored by ``search`` calls that passed the same
+        ``query_text`` and parameters.
+
+        Args:
+            query_text: Query text
+            top_k: Number of results
+            filters: Metadata filters
+            backend: Backend (None = default or multi-backend)
+            **kwargs: The other search parameters
 
-        if self.enable_multi_backend and len(self.adapters) > 1:
-            # Multi-backend search - query all and merge results
+        Returns:
+            Cached results, or None when the cache is disabled or misses
+        """
+        if not settings.VECTOR_CACHE_ENABLED:
+            return None
+        scope, token = self._cache_scope(backend)
+        if token is None:
+            return None
+        return self.cache.lookup(scope, token, top_k, filters, kwargs, query_text=query_text)
+
+    async def _search(
+        self,
+        query_embedding: EmbeddingLike,
+        top_k: int,
+        filters: Optional[Dict[str, Any]],
+        backend: Optional[VectorDBBackend],
+        **kwargs: Any,
+    ) -> List[SearchHit]:
+        """Search one backend, or several when multi-backend retrieval applies."""
+        if backend is None and self.enable_multi_backend and len(self.adapters) > 1:
+            # Multi-backend search - query all and fuse results
             return await self._multi_backend_search(
                 query_embedding, top_k=top_k, filters=filters, **kwargs
             )
 
-        # Default backend search
-        adapter = self.get_adapter()
-        return await adapter.search(query_embedding, top_k=top_k, filters=filters, **kwargs)
+        def call(adapter: VectorDB) -> Awaitable[List[SearchHit]]:
+            return adapter.search(query_embedding, top_k=top_k, filters=filters, **kwargs)
+
+        return await self._routed("search", call, backend)
+
+    def _cache_scope(
+        self, backend: Optional[VectorDBBackend]
+    ) -> Tuple[str, Optional[Tuple[Any, ...]]]:
+        """
+        Cache scope of a search and its current validity token.
+
+        A search naming no backend may be answered by any of them, so its
+        token covers every registered backend. The token is None, and the
+        cache must not be used, while the shared write counters are unknown.
+        """
+        backends = [backend] if backend is not None else sorted(self.adapters, key=lambda b: b.value)
+        scope = backend.value if backend is not None else ROUTED_SCOPE
+        token = []
+        for name in backends:
+            shared = None
+            if self.write_counter is not None:
+                shared = self.write_counter.count(name.value)
+                if shared is None:
+                    return scope, None
+            token.append(
+                (
+                    name.value,
+                    self._write_epochs.get(name, 0),
+                    shared,
+                    self.adapters[name].cache_token() if name in self.adapters else None,
+                )
+            )
+        return scope, tuple(token)
+
+    async def _record_write(self, backend: VectorDBBackend) -> None:
+        """Invalidate cached results that a write to a backend may have changed."""
+        self._write_epochs[backend] = self._write_epochs.get(backend, 0) + 1
+        if self.write_counter is not None:
+            await self.write_counter.increment(backend.value)
+
+    async def search_batch(
+        self,
+        query_embeddings: QueryMatrix,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        backend: Optional[VectorDBBackend] = None,
+        **kwargs: Any,
+    ) -> List[List[SearchHit]]:
+        """
+        Search for similar documents for several queries at once.
+
+        Args:
+            query_embeddings: 2-D float32 array with one query embedding per row
+            top_k: Number of results to return per query
+            filters: Metadata filters applied to every query
+            backend: Backend to use (None = use default or multi-backend)
+            **kwargs: Additional backend-specific parameters
+
+        Returns:
+            One list of search results per query, in query order
+        """
+        def call(adapter: VectorDB) -> Awaitable[List[List[SearchHit]]]:
+            return adapter.search_batch(query_embeddings, top_k=top_k, filters=filters, **kwargs)
+
+        if backend is not None or not (self.enable_multi_backend and len(self.adapters) > 1):
+            return await self._routed("search_batch", call, backend)
+
+        if settings.VECTOR_HEDGED_REQUESTS:
+            batch = await self._hedged_search(
+                "search_batch",
+                call,
+                top_k,
+                lambda answer: min((len(results) for results in answer), default=0),
+            )
+            return batch or [[] for _ in range(len(query_embeddings))]
+
+        # Each backend answers the whole batch; results are fused per query
+        batches = await self._gather("search_batch", call)
+        if not batches:
+            return [[] for _ in range(len(query_embeddings))]
+        return [fuse_results(list(query_results), top_k) for query_results in zip(*batches)]
 
     async def _multi_backend_search(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingLike,
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         **kwargs: Any,
-    ) -> List[SearchResult]:
-        """Search across multiple backends and merge results."""
-        import asyncio
-
-        # Query all backends in parallel
-        tasks = [
-            adapter.search(query_embedding, top_k=top_k, filters=filters, **kwargs)
-            for adapter in self.adapters.values()
+    ) -> List[SearchHit]:
+        """
+        Search across multiple backends.
+
+        By default every backend is queried and the answers that arrive within
+        ``VECTOR_BACKEND_TIMEOUT_SECONDS`` are fused. With
+        ``VECTOR_HEDGED_REQUESTS`` the first backend answering with enough
+        results wins instead.
+        """
+        def call(adapter: VectorDB) -> Awaitable[List[SearchHit]]:
+            return adapter.search(query_embedding, top_k=top_k, filters=filters, **kwargs)
+
+        if settings.VECTOR_HEDGED_REQUESTS:
+            return await self._hedged_search("search", call, top_k, len) or []
+        return fuse_results(await self._gather("search", call), top_k)
+
+    async def _routed(
+        self, request_type: str, call: BackendCall, backend: Optional[VectorDBBackend] = None
+    ) -> T:
+        """
+        Run a call on the best candidate backend within the request deadline.
+
+        A failed attempt is retried at once on the next candidate (the same
+        backend when there is only one) as long as the time left before
+        ``VECTOR_REQUEST_DEADLINE_SECONDS`` exceeds that backend's expected
+        latency and the retry budget has a token. Backends with an open
+        circuit are skipped, and each attempt is cut off at
+        ``VECTOR_BACKEND_TIMEOUT_SECONDS``; both apply only when there is a
+        choice of backend (adaptive routing, or several candidates). A lone
+        backend is always called and runs to completion, since failing fast
+        leaves nothing to fall back on.
+
+        Args:
+            request_type: Kind of request, for per-type latency tracking
+            call: Issues the request to an adapter
+            backend: Backend to use (None = default, or fastest with adaptive routing)
+
+        Returns:
+            The backend's answer
+        """
+        deadline = time.monotonic() + settings.VECTOR_REQUEST_DEADLINE_SECONDS
+        candidates = self._candidates(request_type, backend)
+        guarded = settings.VECTOR_ADAPTIVE_ROUTING or len(candidates) > 1
+        self.router.budget.deposit()
+        error: Optional[Exception] = None
+        attempt = 0
+        while True:
+            if guarded:
+                target = self._next_allowed(candidates, attempt)
+                timeout = deadline - time.monotonic()
+            else:
+                target, timeout = candidates[0], None
+            if target is None:
+                raise RuntimeError(
+                    f"No vector backend available for {request_type}: circuit open"
+                ) from error
+            try:
+                return await self._call(target, call, request_type, timeout, guarded)
+            except (ValueError, TypeError):
+                raise
+            except Exception as e:
+                error = e
+
+            attempt += 1
+            retry_on = candidates[attempt % len(candidates)].value
+            remaining = deadline - time.monotonic()
+            if remaining <= self.router.expected_latency(retry_on, request_type):
+                raise error
+            if not self.router.budget.withdraw():
+                raise error
+
+    def _candidates(
+        self, request_type: str, backend: Optional[VectorDBBackend] = None
+    ) -> List[VectorDBBackend]:
+        """Backends a single-backend request may use, best first."""
+        if backend is not None:
+            self.get_adapter(backend)
+            return [backend]
+        if settings.VECTOR_ADAPTIVE_ROUTING and self.adapters:
+            return self._ranked(request_type)
+        self.get_adapter()
+        return [self.default_backend]
+
+    def _ranked(self, request_type: str) -> List[VectorDBBackend]:
+        """All backends ranked by the router, the default backend winning ties."""
+        backends = list(self.adapters)
+        if self.default_backend in backends:
+            backends.remove(self.default_backend)
+            backends.insert(0, self.default_backend)
+        ranked = self.router.rank([backend.value for backend in backends], request_type)
+        return [VectorDBBackend(name) for name in ranked]
+
+    def _next_allowed(
+        self, candidates: List[VectorDBBackend], start: int
+    ) -> Optional[VectorDBBackend]:
+        """First candidate from position start (wrapping) whose circuit lets a call through."""
+        for offset in range(len(candidates)):
+            backend = candidates[(start + offset) % len(candidates)]
+            if self.router.allow(backend.value):
+                return backend
+        return None
+
+    async def _call(
+        self,
+        backend: VectorDBBackend,
+        call: BackendCall,
+        request_type: str,
+        timeout: Optional[float] = None,
+        guarded: bool = True,
+    ) -> T:
+        """
+        Run one backend call, reporting its outcome to the router.
+
+        Args:
+            backend: Backend to call
+            call: Issues the request to an adapter
+            request_type: Kind of request, for per-type latency tracking
+            timeout: Seconds allowed, capped at ``VECTOR_BACKEND_TIMEOUT_SECONDS``
+            guarded: Enforce the timeout; unguarded calls run to completion
+        """
+        timeout = settings.VECTOR_BACKEND_TIMEOUT_SECONDS if timeout is None else timeout
+        timeout = max(0.0, min(timeout, settings.VECTOR_BACKEND_TIMEOUT_SECONDS))
+
+        async def connect_and_call() -> T:
+            await self._ensure_connected(backend)
+            return await call(self.adapters[backend])
+
+        start = time.perf_counter()
+        try:
+            if guarded:
+                answer = await asyncio.wait_for(connect_and_call(), timeout=timeout)
+            else:
+                answer = await connect_and_call()
+        except (ValueError, TypeError):
+            # Bad requests say nothing about the backend's health
+            raise
+        except Exception:
+            self.router.record_failure(backend.value, time.perf_counter() - start)
+            raise
+        self.router.record_success(backend.value, request_type, time.perf_counter() - start)
+        return answer
+
+    async def _gather(self, request_type: str, call: BackendCall) -> List[T]:
+        """Call every backend whose circuit allows it, keeping the answers that arrive in time."""
+        backends = [backend for backend in self.adapters if self.router.allow(backend.value)]
+        answers = await asyncio.gather(
+            *(self._call(backend, call, request_type) for backend in backends),
+            return_exceptions=True,
+        )
+        return [answer for answer in answers if not isinstance(answer, BaseException)]
+
+    async def _hedged_search(
+        self, request_type: str, call: BackendCall, top_k: int, size: Callable[[T], int]
+    ) -> Optional[T]:
+        """
+        Query backends one at a time, hedging while the latest one is slow.
+
+        The best-ranked backend is queried first. Whenever the latest request
+        outlives its backend's p95 latency, fails, or answers with fewer than
+        ``top_k`` results, the next backend is queried as well.
+
+        Args:
+            request_type: Kind of request, for per-type latency tracking
+            call: Issues the query to an adapter
+            top_k: Results per query that make an answer complete
+            size: Results per query in an answer
+
+        Returns:
+            The first complete answer, else the fullest one, or None if every backend failed
+        """
+        queue = [
+            backend for backend in self._ranked(request_type) if self.router.allow(backend.value)
         ]
-        results_list = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Merge results
-        all_results: Dict[str, SearchResult] = {}
-        for results in results_list:
-            if isinstance(results, Exception):
-                continue
-            for result in results:
-                doc_hash = result.doc_hash
-                if doc_hash not in all_results:
-                    all_results[doc_hash] = result
-                else:
-                    # Average scores if same document found in multiple backends
-                    existing = all_results[doc_hash]
-                    all_results[doc_hash] = SearchResult(
-                        document=result.document,
-                        score=(existing.score + result.score) / 2.0,
-                        doc_hash=doc_hash,
-                    )
-
-        # Sort by score and return top_k
-        sorted_results = sorted(all_results.values(), key=lambda x: x.score, reverse=True)
-        return sorted_results[:top_k]
+        pending: Dict[asyncio.Future, VectorDBBackend] = {}
+        answers: List[T] = []
+        try:
+            while queue or pending:
+                delay = None
+                if queue:
+                    backend = queue.pop(0)
+                    if pending:
+                        MetricsCollector.record_hedged_request(backend.value)
+                    pending[asyncio.ensure_future(self._call(backend, call, request_type))] = backend
+                    if queue:
+                        delay = self._hedge_delay(backend)
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    pending.pop(task)
+                    if task.exception() is not None:
+                        continue
+                    answer = task.result()
+                    if size(answer) >= top_k:
+                        return answer
+                    answers.append(answer)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return max(answers, key=size) if answers else None
+
+    def _hedge_delay(self, backend: VectorDBBackend) -> float:
+        """How long to wait for a backend before hedging: its p95 latency once known."""
+        p95 = self.router.latency.percentile(backend.value, 95)
+        return p95 if p95 is not None else settings.VECTOR_HEDGE_DELAY_SECONDS
 
     async def delete_documents(
         self, document_ids: List[str], backend: Optional[VectorDBBackend] = None
     ) -> None:
-        """Delete documents from vector database."""
-        adapter = self.get_adapter(backend)
-        await adapter.delete_documents(document_ids)
+        """
+        Delete documents from vector database.
+
+        The documents are also forgotten by the backend's doc-hash index, so
+        ingesting them again stores them instead of skipping them.
+        """
+        adapter = await self._ready_adapter(backend)
+        try:
+            await adapter.delete_documents(document_ids)
+        finally:
+            await self._record_write(adapter.backend)
+            await run_blocking(
+                adapter.backend.value, forget_documents, adapter.backend.value, document_ids
+            )
 
     async def get_document(
         self, document_id: str, backend: Optional[VectorDBBackend] = None
     ) -> Optional[Document]:
         """Get document by ID."""
-        adapter = self.get_adapter(backend)
+        adapter = await self._ready_adapter(backend)
         return await adapter.get_document(document_id)
 
+    async def get_documents(
+        self, document_ids: List[str], backend: Optional[VectorDBBackend] = None
+    ) -> List[Document]:
+        """Get documents by ID in bulk."""
+        adapter = await self._ready_adapter(backend)
+        return await adapter.get_documents(document_ids)
+
     async def update_document(
         self, document: Document, backend: Optional[VectorDBBackend] = None
     ) -> None:
         """Update document in vector database."""
-        adapter = self.get_adapter(backend)
-        await adapter.update_document(document)
+        adapter = await self._ready_adapter(backend)
+        try:
+            await adapter.update_document(document)
+        finally:
+            await self._record_write(adapter.backend)
 
     async def get_stats(
         self, backend: Optional[VectorDBBackend] = None
     ) -> Dict[str, Any]:
         """Get database statistics."""
         if backend:
-            adapter = self.get_adapter(backend)
+            adapter = await self._ready_adapter(backend)
             return await adapter.get_stats()
 
-        # Return stats for all backends
+        # Return stats for connected backends; lazily registered ones are not connected for this
         all_stats = {}
-        for backend_name, adapter in self.adapters.items():
-            all_stats[backend_name.value] = await adapter.get_stats()
+        for backend_name, adapter in list(self.adapters.items()):
+            if backend_name not in self._pending:
+                all_stats[backend_name.value] = await adapter.get_stats()
         return all_stats
 
     async def close(self) -> None:
-        """Close all adapter connections."""
-        for adapter in self.adapters.values():
-            await adapter.close()
+        """Stop the health probe and close all adapter connections."""
+        if self._health_probe is not None:
+            self._health_probe.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._health_probe
+            self._health_probe = None
+
+        for backend, adapter in self.adapters.items():
+            if backend not in self._pending:
+                await adapter.close()
         self.adapters.clear()
+        self.unavailable.clear()
+        self._pending.clear()
+        if self.write_counter is not None:
+            await self.write_counter.close()
 
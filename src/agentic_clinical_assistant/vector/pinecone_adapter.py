@@ -1,21 +1,38 @@
 """Pinecone vector database adapter."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import json
+from typing import Any, Dict, Iterator, List, Optional
 
 from pinecone import Pinecone, ServerlessSpec
 
 from agentic_clinical_assistant.config import settings
-from agentic_clinical_assistant.vector.base import Document, SearchResult, VectorDB, VectorDBBackend
+from agentic_clinical_assistant.vector.base import (
+    Document,
+    EmbeddingLike,
+    QueryMatrix,
+    SearchHit,
+    VectorDB,
+    VectorDBBackend,
+    as_embedding,
+    as_query_matrix,
+)
 
 
 class PineconeAdapter(VectorDB):
-    """Pinecone vector database adapter."""
+    """
+    Pinecone vector database adapter.
+
+    The Pinecone client is synchronous, so its requests run on the shared
+    vector-backend thread pool.
+    """
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         environment: Optional[str] = None,
         index_name: Optional[str] = None,
+        host: Optional[str] = None,
     ):
         """
         Initialize Pinecone adapter.
@@ -24,11 +41,13 @@ class PineconeAdapter(VectorDB):
             api_key: Pinecone API key
             environment: Pinecone environment/region
             index_name: Name of the Pinecone index
+            host: Data-plane host of the index; skips looking the index up
         """
         super().__init__(VectorDBBackend.PINECONE)
         self.api_key = api_key or settings.PINECONE_API_KEY
         self.environment = environment or settings.PINECONE_ENVIRONMENT
         self.index_name = index_name or settings.PINECONE_INDEX_NAME
+        self.host = host or settings.PINECONE_INDEX_HOST
         self.pc: Optional[Pinecone] = None
         self.index = None
 
@@ -37,7 +56,16 @@ class PineconeAdapter(VectorDB):
         if not self.api_key:
             raise ValueError("Pinecone API key is required")
 
+        await self._run_blocking(self._connect)
+
+    def _connect(self) -> None:
+        """Create the client, and the index if it does not exist yet."""
         self.pc = Pinecone(api_key=self.api_key)
+        # Enough pooled connections for concurrent upsert batches and queries
+        pool_threads = max(settings.PINECONE_UPSERT_CONCURRENCY, settings.VECTOR_BACKEND_CONCURRENCY)
+        if self.host:
+            self.index = self.pc.Index(host=self.host, pool_threads=pool_threads)
+            return
 
         # Check if index exists, create if not
         indexes_response = self.pc.list_indexes()
@@ -64,55 +92,97 @@ class PineconeAdapter(VectorDB):
                 spec=ServerlessSpec(cloud="aws", region=self.environment),
             )
 
-        self.index = self.pc.Index(self.index_name)
+        self.index = self.pc.Index(self.index_name, pool_threads=pool_threads)
 
     async def add_documents(
         self, documents: List[Document], batch_size: Optional[int] = None
     ) -> List[str]:
-        """Add documents to Pinecone index."""
+        """
+        Upsert documents to Pinecone, several batches at a time.
+
+        A batch holds at most ``batch_size`` vectors (default
+        ``PINECONE_UPSERT_BATCH_SIZE``) and is cut early once its payload
+        would pass ``PINECONE_UPSERT_MAX_BYTES``, so documents with large
+        metadata still fit Pinecone's request size limit. Up to
+        ``PINECONE_UPSERT_CONCURRENCY`` batches are in flight while the next
+        ones are built. A failed batch is resent on its own, up to
+        ``PINECONE_UPSERT_RETRIES`` times.
+        """
         if self.index is None:
             await self.initialize()
 
         if self.index is None:
             raise RuntimeError("Index not initialized")
 
-        batch_size = batch_size or 100
-        document_ids = []
-
-        # Prepare vectors for Pinecone
-        vectors = []
         for doc in documents:
             if doc.embedding is None:
                 raise ValueError(f"Document {doc.id} missing embedding")
 
+        batch_size = batch_size or settings.PINECONE_UPSERT_BATCH_SIZE
+        in_flight = asyncio.Semaphore(settings.PINECONE_UPSERT_CONCURRENCY)
+        tasks = []
+        for batch in self._upsert_batches(documents, batch_size):
+            await in_flight.acquire()
+            task = asyncio.ensure_future(self._upsert_batch(batch))
+            task.add_done_callback(lambda _: in_flight.release())
+            tasks.append(task)
+
+        outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+        failures = [outcome for outcome in outcomes if isinstance(outcome, BaseException)]
+        if failures:
+            raise RuntimeError(
+                f"{len(failures)} of {len(tasks)} Pinecone upsert batches failed"
+            ) from failures[0]
+
+        return [doc.id for doc in documents]
+
+    @staticmethod
+    def _upsert_batches(
+        documents: List[Document], batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Group documents into upsert batches bounded by count and payload size."""
+        max_bytes = settings.PINECONE_UPSERT_MAX_BYTES
+        batch: List[Dict[str, Any]] = []
+        batch_bytes = 0
+        for doc in documents:
             # Pinecone format: (id, vector, metadata)
-            vectors.append(
-                {
-                    "id": doc.id,
-                    "values": doc.embedding,
-                    "metadata": {
-                        **doc.metadata,
-                        "text": doc.text,
-                        "doc_hash": doc.doc_hash or "",
-                    },
-                }
-            )
-            document_ids.append(doc.id)
-
-        # Upsert in batches
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i : i + batch_size]
-            self.index.upsert(vectors=batch)
-
-        return document_ids
+            vector = {
+                "id": doc.id,
+                "values": doc.embedding.tolist(),
+                "metadata": {
+                    **doc.metadata,
+                    "text": doc.text,
+                    "doc_hash": doc.doc_hash or "",
+                },
+            }
+            size = len(json.dumps(vector, separators=(",", ":"), default=str))
+            if batch and (len(batch) >= batch_size or batch_bytes + size > max_bytes):
+                yield batch
+                batch, batch_bytes = [], 0
+            batch.append(vector)
+            batch_bytes += size
+        if batch:
+            yield batch
+
+    async def _upsert_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Upsert one batch, resending only this batch when it fails."""
+        retries = settings.PINECONE_UPSERT_RETRIES
+        for attempt in range(retries + 1):
+            try:
+                await self._run_blocking(self.index.upsert, vectors=batch)
+                return
+            except Exception:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(settings.PINECONE_UPSERT_RETRY_BACKOFF_SECONDS * 2**attempt)
 
     async def search(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingLike,
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         **kwargs: Any,
-    ) -> List[SearchResult]:
+    ) -> List[SearchHit]:
         """Search for similar documents in Pinecone."""
         if self.index is None:
             await self.initialize()
@@ -120,24 +190,67 @@ class PineconeAdapter(VectorDB):
         if self.index is None:
             raise RuntimeError("Index not initialized")
 
-        # Build filter expression for Pinecone
-        filter_dict = None
-        if filters:
-            filter_dict = {}
-            for key, value in filters.items():
-                if isinstance(value, list):
-                    filter_dict[key] = {"$in": value}
-                else:
-                    filter_dict[key] = value
-
         # Query Pinecone
-        query_response = self.index.query(
-            vector=query_embedding,
+        query_response = await self._run_blocking(
+            self.index.query,
+            # The request body is JSON, so the vector becomes a list here
+            vector=as_embedding(query_embedding).tolist(),
             top_k=top_k,
             include_metadata=True,
-            filter=filter_dict,
+            filter=self._build_filter(filters),
         )
+        return self._parse_matches(query_response)
+
+    async def search_batch(
+        self,
+        query_embeddings: QueryMatrix,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> List[List[SearchHit]]:
+        """
+        Search Pinecone for several queries, issuing the queries concurrently.
+
+        Pinecone queries take one vector each, so the batch is sent as
+        parallel requests, at most ``VECTOR_BACKEND_CONCURRENCY`` at a time.
+        """
+        if self.index is None:
+            await self.initialize()
+
+        if self.index is None:
+            raise RuntimeError("Index not initialized")
+
+        query_vectors = as_query_matrix(query_embeddings)
+        filter_dict = self._build_filter(filters)
+
+        async def query(vector: List[float]) -> List[SearchHit]:
+            query_response = await self._run_blocking(
+                self.index.query,
+                vector=vector,
+                top_k=top_k,
+                include_metadata=True,
+                filter=filter_dict,
+            )
+            return self._parse_matches(query_response)
+
+        return list(await asyncio.gather(*(query(vector.tolist()) for vector in query_vectors)))
 
+    @staticmethod
+    def _build_filter(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Build filter expression for Pinecone."""
+        if not filters:
+            return None
+        filter_dict = {}
+        for key, value in filters.items():
+            if isinstance(value, list):
+                filter_dict[key] = {"$in": value}
+            else:
+                filter_dict[key] = value
+        return filter_dict
+
+    @staticmethod
+    def _parse_matches(query_response: Any) -> List[SearchHit]:
+        """Convert a Pinecone query response into search results."""
         results = []
         # Handle both dict and object responses
         matches = query_response.matches if hasattr(query_response, 'matches') else query_response.get('matches', [])
@@ -153,18 +266,13 @@ class PineconeAdapter(VectorDB):
                 match_metadata = match.metadata if hasattr(match, 'metadata') else {}
             
             metadata = match_metadata or {}
-            doc = Document(
-                id=match_id,
-                text=metadata.get("text", ""),
-                metadata={k: v for k, v in metadata.items() if k not in ("text", "doc_hash")},
-                doc_hash=metadata.get("doc_hash"),
-            )
-
             results.append(
-                SearchResult(
-                    document=doc,
-                    score=float(match_score),
-                    doc_hash=doc.doc_hash or "",
+                SearchHit(
+                    match_id,
+                    float(match_score),
+                    text=metadata.get("text", ""),
+                    metadata={k: v for k, v in metadata.items() if k not in ("text", "doc_hash")},
+                    doc_hash=metadata.get("doc_hash"),
                 )
             )
 
@@ -179,24 +287,49 @@ class PineconeAdapter(VectorDB):
             raise RuntimeError("Index not initialized")
 
         # Pinecone delete by IDs
-        self.index.delete(ids=document_ids)
+        await self._run_blocking(self.index.delete, ids=document_ids)
 
     async def get_document(self, document_id: str) -> Optional[Document]:
         """Get document by ID from Pinecone."""
+        documents = await self.get_documents([document_id])
+        return documents[0] if documents else None
+
+    async def get_documents(self, document_ids: List[str]) -> List[Document]:
+        """
+        Fetch documents by ID, ``PINECONE_FETCH_BATCH_SIZE`` ids per request, concurrently.
+
+        Args:
+            document_ids: Document IDs
+
+        Returns:
+            Documents found, in the order of their IDs
+        """
         if self.index is None:
             await self.initialize()
 
         if self.index is None:
             raise RuntimeError("Index not initialized")
 
-        # Fetch by ID
-        fetch_response = self.index.fetch(ids=[document_id])
-        # Handle both dict and object responses
-        vectors = fetch_response.vectors if hasattr(fetch_response, 'vectors') else fetch_response.get('vectors', {})
-        if document_id not in vectors:
-            return None
+        unique_ids = list(dict.fromkeys(document_ids))
+        chunk_size = settings.PINECONE_FETCH_BATCH_SIZE
+        responses = await asyncio.gather(
+            *(
+                self._run_blocking(self.index.fetch, ids=unique_ids[start : start + chunk_size])
+                for start in range(0, len(unique_ids), chunk_size)
+            )
+        )
 
-        vector_data = vectors[document_id]
+        found: Dict[str, Document] = {}
+        for fetch_response in responses:
+            # Handle both dict and object responses
+            vectors = fetch_response.vectors if hasattr(fetch_response, 'vectors') else fetch_response.get('vectors', {})
+            for vector_id, vector_data in vectors.items():
+                found[vector_id] = self._parse_vector(vector_id, vector_data)
+        return [found[doc_id] for doc_id in unique_ids if doc_id in found]
+
+    @staticmethod
+    def _parse_vector(document_id: str, vector_data: Any) -> Document:
+        """Convert a fetched Pinecone vector into a document."""
         # Handle both dict and object vector data
         if isinstance(vector_data, dict):
             vector_values = vector_data.get('values', [])
@@ -204,7 +337,7 @@ class PineconeAdapter(VectorDB):
         else:
             vector_values = vector_data.values if hasattr(vector_data, 'values') else []
             vector_metadata = vector_data.metadata if hasattr(vector_data, 'metadata') else {}
-        
+
         metadata = vector_metadata or {}
 
         return Document(
@@ -227,7 +360,7 @@ class PineconeAdapter(VectorDB):
         if self.index is None:
             return {"backend": self.backend.value}
 
-        stats = self.index.describe_index_stats()
+        stats = await self._run_blocking(self.index.describe_index_stats)
         # Handle both dict and object responses
         if isinstance(stats, dict):
             total_vectors = stats.get('total_vector_count', 0)
@@ -0,0 +1,271 @@
+"""Latency-aware routing across vector backends.
+
+``BackendRouter`` keeps, per backend, an EWMA of latency for each request type
+and an EWMA error rate, and trips a circuit breaker after repeated failures.
+It ranks healthy backends by expected cost (latency plus an error-rate
+penalty), and retries draw from a ``RetryBudget`` so failures cannot multiply
+load.
+"""
+
+import time
+from collections import deque
+from enum import Enum
+from typing import Deque, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
+
+# Percentiles from fewer samples are too noisy to hedge on
+MIN_LATENCY_SAMPLES = 20
+
+# Retries a burst of failures may spend before the budget refills
+RETRY_BUDGET_CAP = 10.0
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per backend."""
+
+    def __init__(self, window: Optional[int] = None):
+        """
+        Initialize latency tracker.
+
+        Args:
+            window: Samples kept per backend (default: ``VECTOR_LATENCY_WINDOW``)
+        """
+        self.window = window or settings.VECTOR_LATENCY_WINDOW
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, backend: str, seconds: float) -> None:
+        """
+        Record the latency of one call.
+
+        Args:
+            backend: Backend name
+            seconds: Call latency in seconds
+        """
+        samples = self._samples.get(backend)
+        if samples is None:
+            samples = self._samples[backend] = deque(maxlen=self.window)
+        samples.append(seconds)
+
+    def percentile(self, backend: str, q: float) -> Optional[float]:
+        """
+        Latency percentile of a backend over the window.
+
+        Args:
+            backend: Backend name
+            q: Percentile, 0-100
+
+        Returns:
+            Latency in seconds, or None with fewer than ``MIN_LATENCY_SAMPLES`` samples
+        """
+        samples = self._samples.get(backend)
+        if samples is None or len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return float(np.percentile(samples, q))
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states; the values are exported as gauge levels."""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+CIRCUIT_LEVELS = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Stop calling a backend after consecutive failures.
+
+    After ``VECTOR_CIRCUIT_FAILURE_THRESHOLD`` consecutive failures the circuit
+    opens. Once ``VECTOR_CIRCUIT_RESET_SECONDS`` have passed a single probe is
+    let through (half-open): success closes the circuit, failure reopens it.
+    A probe that never reports back (a cancelled call) is replaced by another
+    after the same interval.
+    """
+
+    def __init__(self) -> None:
+        """Initialize a closed circuit."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        """Whether a call may go through now, admitting the half-open probe."""
+        if self.state == CircuitState.CLOSED:
+            return True
+        if time.monotonic() - self.opened_at >= settings.VECTOR_CIRCUIT_RESET_SECONDS:
+            self.state = CircuitState.HALF_OPEN
+            self.opened_at = time.monotonic()
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit at the threshold or on a failed probe."""
+        self.failures += 1
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= settings.VECTOR_CIRCUIT_FAILURE_THRESHOLD
+        ):
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of requests.
+
+    Every request deposits ``VECTOR_RETRY_BUDGET_RATIO`` tokens, up to
+    ``RETRY_BUDGET_CAP``, and every retry spends one.
+    """
+
+    def __init__(self, ratio: Optional[float] = None):
+        """
+        Initialize a full budget.
+
+        Args:
+            ratio: Retries earned per request (default: ``VECTOR_RETRY_BUDGET_RATIO``)
+        """
+        self.ratio = settings.VECTOR_RETRY_BUDGET_RATIO if ratio is None else ratio
+        self.tokens = RETRY_BUDGET_CAP
+
+    def deposit(self) -> None:
+        """Credit one request."""
+        self.tokens = min(RETRY_BUDGET_CAP, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend a token on a retry; False when the budget is exhausted."""
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class BackendRouter:
+    """Rank vector backends by observed latency and error rate."""
+
+    def __init__(self) -> None:
+        """Initialize router state."""
+        self.latency = LatencyTracker()
+        self.budget = RetryBudget()
+        self._ewma_latency: Dict[Tuple[str, str], float] = {}
+        self._error_rate: Dict[str, float] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def breaker(self, backend: str) -> CircuitBreaker:
+        """Circuit breaker of a backend."""
+        breaker = self._breakers.get(backend)
+        if breaker is None:
+            breaker = self._breakers[backend] = CircuitBreaker()
+        return breaker
+
+    def allow(self, backend: str) -> bool:
+        """Whether the circuit of a backend lets a call through."""
+        breaker = self.breaker(backend)
+        allowed = breaker.allow()
+        MetricsCollector.set_circuit_state(backend, CIRCUIT_LEVELS[breaker.state])
+        return allowed
+
+    def record_success(self, backend: str, request_type: str, seconds: float) -> None:
+        """
+        Record a successful call.
+
+        Args:
+            backend: Backend name
+            request_type: Kind of request, e.g. "search" or "search_batch"
+            seconds: Call latency in seconds
+        """
+        alpha = settings.VECTOR_ROUTING_EWMA_ALPHA
+        key = (backend, request_type)
+        previous = self._ewma_latency.get(key)
+        self._ewma_latency[key] = (
+            seconds if previous is None else alpha * seconds + (1 - alpha) * previous
+        )
+        self._error_rate[backend] = (1 - alpha) * self._error_rate.get(backend, 0.0)
+        self.latency.record(backend, seconds)
+        self.breaker(backend).record_success()
+        MetricsCollector.set_circuit_state(backend, CIRCUIT_LEVELS[CircuitState.CLOSED])
+
+    def record_failure(self, backend: str, seconds: float) -> None:
+        """
+        Record a failed or timed-out call.
+
+        Args:
+            backend: Backend name
+            seconds: Time spent before the call failed
+        """
+        alpha = settings.VECTOR_ROUTING_EWMA_ALPHA
+        self._error_rate[backend] = alpha + (1 - alpha) * self._error_rate.get(backend, 0.0)
+        self.latency.record(backend, seconds)
+        breaker = self.breaker(backend)
+        breaker.record_failure()
+        MetricsCollector.set_circuit_state(backend, CIRCUIT_LEVELS[breaker.state])
+
+    def expected_latency(self, backend: str, request_type: str) -> float:
+        """EWMA latency of a backend for a request type, 0.0 before its first call."""
+        return self._ewma_latency.get((backend, request_type), 0.0)
+
+    def cost(self, backend: str, request_type: str) -> float:
+        """Expected latency plus the error rate times a timeout, the price of a failed attempt."""
+        penalty = self._error_rate.get(backend, 0.0) * settings.VECTOR_BACKEND_TIMEOUT_SECONDS
+        return self.expected_latency(backend, request_type) + penalty
+
+    def rank(self, backends: Sequence[str], request_type: str) -> List[str]:
+        """
+        Order backends from cheapest to most expensive, open circuits last.
+
+        Ties keep the given order, so unmeasured backends are tried in
+        preference order before the router has latencies for them.
+
+        Args:
+            backends: Candidate backends in preference order
+            request_type: Kind of request
+
+        Returns:
+            Backends, best first
+        """
+        ranked = sorted(
+            backends,
+            key=lambda backend: (
+                self.breaker(backend).state == CircuitState.OPEN,
+                self.cost(backend, request_type),
+            ),
+        )
+        self.publish_weights(backends, request_type)
+        return ranked
+
+    def weights(self, backends: Sequence[str], request_type: str) -> Dict[str, float]:
+        """
+        Routing weights: inverse expected cost, normalized; open circuits get none.
+
+        Args:
+            backends: Candidate backends
+            request_type: Kind of request
+
+        Returns:
+            Weight per backend, summing to 1 when any backend is healthy
+        """
+        inverse = {}
+        for backend in backends:
+            if self.breaker(backend).state == CircuitState.OPEN:
+                inverse[backend] = 0.0
+            else:
+                # Unmeasured backends weigh in as if they answered in a millisecond
+                inverse[backend] = 1.0 / max(self.cost(backend, request_type), 1e-3)
+        total = sum(inverse.values())
+        return {backend: value / total if total else 0.0 for backend, value in inverse.items()}
+
+    def publish_weights(self, backends: Sequence[str], request_type: str) -> None:
+        """Export the routing weights of backends as metrics."""
+        for backend, weight in self.weights(backends, request_type).items():
+            MetricsCollector.set_routing_weight(backend, request_type, weight)
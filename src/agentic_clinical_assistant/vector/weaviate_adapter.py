@@ -1,16 +1,56 @@
 """Weaviate vector database adapter."""
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import time
+from enum import Enum
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+import numpy as np
 import weaviate
-from weaviate.classes.query import MetadataQuery
+from pydantic import BaseModel
+from weaviate.classes.query import Filter, MetadataQuery
 
 from agentic_clinical_assistant.config import settings
-from agentic_clinical_assistant.vector.base import Document, SearchResult, VectorDB, VectorDBBackend
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
+from agentic_clinical_assistant.vector.base import (
+    Document,
+    EmbeddingLike,
+    QueryMatrix,
+    SearchHit,
+    VectorDB,
+    VectorDBBackend,
+    as_query_matrix,
+)
+
+
+class WeaviateBatchMode(str, Enum):
+    """Batching strategies of the Weaviate client."""
+
+    FIXED = "fixed"
+    RATE_LIMIT = "rate_limit"
+    DYNAMIC = "dynamic"
+
+
+class IngestReport(BaseModel):
+    """Outcome of a Weaviate ingestion run."""
+
+    imported: List[str] = []
+    failed: Dict[str, str] = {}  # document ID -> last error message
+    seconds: float = 0.0
+
+    @property
+    def objects_per_second(self) -> float:
+        """Imported objects per second of wall time."""
+        return len(self.imported) / self.seconds if self.seconds > 0 else 0.0
 
 
 class WeaviateAdapter(VectorDB):
-    """Weaviate vector database adapter with hybrid search support."""
+    """
+    Weaviate vector database adapter with hybrid search support.
+
+    The Weaviate client is synchronous, so its requests run on the shared
+    vector-backend thread pool.
+    """
 
     def __init__(
         self,
@@ -34,6 +74,10 @@ class WeaviateAdapter(VectorDB):
 
     async def initialize(self) -> None:
         """Initialize Weaviate connection and create schema if needed."""
+        await self._run_blocking(self._connect)
+
+    def _connect(self) -> None:
+        """Connect, and create the collection if it does not exist yet."""
         # Create client
         if self.api_key:
             auth = weaviate.auth.AuthApiKey(api_key=self.api_key)
@@ -73,24 +117,145 @@ class WeaviateAdapter(VectorDB):
     async def add_documents(
         self, documents: List[Document], batch_size: Optional[int] = None
     ) -> List[str]:
-        """Add documents to Weaviate."""
+        """
+        Add documents to Weaviate.
+
+        Objects the server rejects are resent on their own, up to
+        ``WEAVIATE_BATCH_RETRIES`` times.
+
+        Args:
+            documents: Documents with embeddings
+            batch_size: Objects per batch request (default: ``WEAVIATE_BATCH_SIZE``)
+
+        Returns:
+            Document IDs
+
+        Raises:
+            RuntimeError: If some objects still failed after the retries
+        """
         if self.client is None:
             await self.initialize()
 
         if self.client is None:
             raise RuntimeError("Weaviate client not initialized")
 
-        collection = self.client.collections.get(self.class_name)
-        document_ids = []
+        for doc in documents:
+            if doc.embedding is None:
+                raise ValueError(f"Document {doc.id} missing embedding")
+
+        start = time.perf_counter()
+        imported, failed = await self._ingest_chunk(documents, batch_size or settings.WEAVIATE_BATCH_SIZE)
+        MetricsCollector.record_ingest(
+            self.backend.value, len(imported), len(failed), time.perf_counter() - start
+        )
+        if failed:
+            doc_id, message = next(iter(failed.items()))
+            raise RuntimeError(
+                f"{len(failed)} of {len(documents)} objects failed to import into Weaviate "
+                f"(first: {doc_id}: {message})"
+            )
+        return [doc.id for doc in documents]
 
-        batch_size = batch_size or 100
+    async def ingest_stream(
+        self, documents: AsyncIterator[Document], batch_size: Optional[int] = None
+    ) -> IngestReport:
+        """
+        Import documents as they arrive from an async iterator.
 
-        # Prepare objects for Weaviate
-        with collection.batch.dynamic() as batch:
-            for doc in documents:
+        Documents are grouped into chunks of ``batch_size``; one chunk is
+        imported while the next is read. Failed objects are retried like in
+        ``add_documents``, and whatever still fails is reported instead of
+        raised, so a long import is not lost to a few bad objects.
+
+        Args:
+            documents: Async iterator of documents with embeddings
+            batch_size: Objects per chunk and batch request (default: ``WEAVIATE_BATCH_SIZE``)
+
+        Returns:
+            Imported IDs, failures by document ID, and throughput
+        """
+        if self.client is None:
+            await self.initialize()
+
+        if self.client is None:
+            raise RuntimeError("Weaviate client not initialized")
+
+        batch_size = batch_size or settings.WEAVIATE_BATCH_SIZE
+        report = IngestReport()
+        start = time.perf_counter()
+        pending: Optional[asyncio.Future] = None
+
+        async def collect() -> None:
+            imported, failed = await pending
+            report.imported.extend(imported)
+            report.failed.update(failed)
+
+        chunk: List[Document] = []
+        try:
+            async for doc in documents:
                 if doc.embedding is None:
                     raise ValueError(f"Document {doc.id} missing embedding")
+                chunk.append(doc)
+                if len(chunk) >= batch_size:
+                    if pending is not None:
+                        await collect()
+                    pending = asyncio.ensure_future(self._ingest_chunk(chunk, batch_size))
+                    chunk = []
+            if pending is not None:
+                await collect()
+            if chunk:
+                pending = asyncio.ensure_future(self._ingest_chunk(chunk, batch_size))
+                await collect()
+        except BaseException:
+            # Let the chunk in flight finish before the error propagates
+            if pending is not None and not pending.done():
+                await asyncio.gather(pending, return_exceptions=True)
+            raise
+
+        report.seconds = time.perf_counter() - start
+        MetricsCollector.record_ingest(
+            self.backend.value, len(report.imported), len(report.failed), report.seconds
+        )
+        return report
+
+    async def _ingest_chunk(
+        self, documents: List[Document], batch_size: int
+    ) -> Tuple[List[str], Dict[str, str]]:
+        """
+        Import documents, resending only the objects that failed.
 
+        Returns:
+            Imported IDs in input order, and error messages of objects that still failed
+        """
+        remaining = documents
+        failed: Dict[str, str] = {}
+        for _ in range(settings.WEAVIATE_BATCH_RETRIES + 1):
+            failed = await self._run_blocking(self._add, remaining, batch_size)
+            if not failed:
+                break
+            remaining = [doc for doc in remaining if doc.id in failed]
+        return [doc.id for doc in documents if doc.id not in failed], failed
+
+    def _batch(self, collection: Any, batch_size: int) -> Any:
+        """Batch context of the configured ``WEAVIATE_BATCH_MODE``."""
+        mode = WeaviateBatchMode(settings.WEAVIATE_BATCH_MODE)
+        if mode == WeaviateBatchMode.RATE_LIMIT:
+            return collection.batch.rate_limit(
+                requests_per_minute=settings.WEAVIATE_BATCH_REQUESTS_PER_MINUTE
+            )
+        if mode == WeaviateBatchMode.DYNAMIC:
+            return collection.batch.dynamic()
+        return collection.batch.fixed_size(
+            batch_size=batch_size,
+            concurrent_requests=settings.WEAVIATE_BATCH_CONCURRENT_REQUESTS,
+        )
+
+    def _add(self, documents: List[Document], batch_size: int) -> Dict[str, str]:
+        """Send documents through one batch context, returning failures by document ID."""
+        collection = self.client.collections.get(self.class_name)
+
+        with self._batch(collection, batch_size) as batch:
+            for doc in documents:
                 # Weaviate object
                 batch.add_object(
                     properties={
@@ -101,18 +266,18 @@ class WeaviateAdapter(VectorDB):
                     vector=doc.embedding,
                     uuid=doc.id,
                 )
-                document_ids.append(doc.id)
 
-        return document_ids
+        # The failures of a batch context stay readable until the next one opens
+        return {str(error.object_.uuid): error.message for error in collection.batch.failed_objects}
 
     async def search(
         self,
-        query_embedding: List[float],
+        query_embedding: EmbeddingLike,
         top_k: int = 10,
         filters: Optional[Dict[str, Any]] = None,
         retrieval_mode: str = "vector",
         **kwargs: Any,
-    ) -> List[SearchResult]:
+    ) -> List[SearchHit]:
         """
         Search for similar documents in Weaviate.
 
@@ -130,78 +295,145 @@ class WeaviateAdapter(VectorDB):
             raise RuntimeError("Weaviate client not initialized")
 
         collection = self.client.collections.get(self.class_name)
+        response = await self._run_blocking(
+            self._query,
+            collection,
+            query_embedding,
+            top_k,
+            self._build_where(filters),
+            retrieval_mode,
+            kwargs.get("query_text", ""),
+        )
+        return self._parse_objects(response)
+
+    async def search_batch(
+        self,
+        query_embeddings: QueryMatrix,
+        top_k: int = 10,
+        filters: Optional[Dict[str, Any]] = None,
+        retrieval_mode: str = "vector",
+        **kwargs: Any,
+    ) -> List[List[SearchHit]]:
+        """
+        Search Weaviate for several queries, issuing the queries concurrently.
+
+        Each query is a separate request, at most ``VECTOR_BACKEND_CONCURRENCY``
+        in flight at a time.
+
+        Args:
+            query_embeddings: 2-D float32 array with one query vector per row
+            top_k: Number of results per query
+            filters: Metadata filters applied to every query
+            retrieval_mode: "vector", "hybrid", or "keyword"
+            **kwargs: ``query_texts`` gives one keyword query per row for
+                hybrid and keyword modes
+        """
+        if self.client is None:
+            await self.initialize()
+
+        if self.client is None:
+            raise RuntimeError("Weaviate client not initialized")
+
+        query_vectors = as_query_matrix(query_embeddings)
+        query_texts = kwargs.get("query_texts") or [""] * len(query_vectors)
+        if len(query_texts) != len(query_vectors):
+            raise ValueError("query_texts must have one entry per query embedding")
+
+        collection = self.client.collections.get(self.class_name)
+        where_filter = self._build_where(filters)
+
+        async def query(vector: np.ndarray, query_text: str) -> List[SearchHit]:
+            response = await self._run_blocking(
+                self._query, collection, vector, top_k, where_filter, retrieval_mode, query_text
+            )
+            return self._parse_objects(response)
+
+        return list(
+            await asyncio.gather(
+                *(query(vector, text) for vector, text in zip(query_vectors, query_texts))
+            )
+        )
 
-        # Build where filter
-        where_filter = None
-        if filters:
-            # Weaviate uses GraphQL-style filters
-            conditions = []
-            for key, value in filters.items():
-                if isinstance(value, list):
-                    conditions.append(
-                        {
-                            "path": [key],
-                            "operator": "ContainsAny",
-                            "valueText": value,
-                        }
-                    )
-                else:
-                    conditions.append(
-                        {
-                            "path": [key],
-                            "operator": "Equal",
-                            "valueText": str(value),
-                        }
-                    )
-            if conditions:
-                where_filter = {"operator": "And", "operands": conditions}
-
-        # Perform search based on mode
+    @staticmethod
+    def _build_where(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Build a where filter from metadata filters."""
+        if not filters:
+            return None
+
+        # Weaviate uses GraphQL-style filters
+        conditions = []
+        for key, value in filters.items():
+            if isinstance(value, list):
+                conditions.append(
+                    {
+                        "path": [key],
+                        "operator": "ContainsAny",
+                        "valueText": value,
+                    }
+                )
+            else:
+                conditions.append(
+                    {
+                        "path": [key],
+                        "operator": "Equal",
+                        "valueText": str(value),
+                    }
+                )
+        return {"operator": "And", "operands": conditions}
+
+    @staticmethod
+    def _query(
+        collection: Any,
+        query_embedding: EmbeddingLike,
+        top_k: int,
+        where_filter: Optional[Dict[str, Any]],
+        retrieval_mode: str,
+        query_text: str,
+    ) -> Any:
+        """Run one query against a collection in the given retrieval mode."""
         if retrieval_mode == "hybrid":
             # Hybrid search (vector + keyword)
-            response = collection.query.hybrid(
-                query=kwargs.get("query_text", ""),
+            return collection.query.hybrid(
+                query=query_text,
                 vector=query_embedding,
                 limit=top_k,
                 where=where_filter,
                 return_metadata=MetadataQuery(distance=True),
             )
-        elif retrieval_mode == "keyword":
+        if retrieval_mode == "keyword":
             # Keyword-only search
-            response = collection.query.bm25(
-                query=kwargs.get("query_text", ""),
-                limit=top_k,
-                where=where_filter,
-                return_metadata=MetadataQuery(distance=True),
-            )
-        else:
-            # Vector search (default)
-            response = collection.query.near_vector(
-                near_vector=query_embedding,
+            return collection.query.bm25(
+                query=query_text,
                 limit=top_k,
                 where=where_filter,
                 return_metadata=MetadataQuery(distance=True),
             )
-
+        # Vector search (default)
+        return collection.query.near_vector(
+            near_vector=query_embedding,
+            limit=top_k,
+            where=where_filter,
+            return_metadata=MetadataQuery(distance=True),
+        )
+
+    @staticmethod
+    def _parse_objects(response: Any) -> List[SearchHit]:
+        """Convert a Weaviate query response into search results."""
         results = []
         for obj in response.objects:
             props = obj.properties
-            doc = Document(
-                id=str(obj.uuid),
-                text=props.get("text", ""),
-                metadata={k: v for k, v in props.items() if k not in ("text", "doc_hash")},
-                doc_hash=props.get("doc_hash"),
-            )
 
             # Convert distance to similarity score
             distance = obj.metadata.distance if obj.metadata.distance else 0.0
             score = max(0.0, 1.0 - float(distance))
 
             results.append(
-                SearchResult(
-                    document=doc,
-                    score=score,
-                    doc_hash=doc.doc_hash or "",
+                SearchHit(
+                    str(obj.uuid),
+                    score,
+                    text=props.get("text", ""),
+                    metadata={k: v for k, v in props.items() if k not in ("text", "doc_hash")},
+                    doc_hash=props.get("doc_hash"),
                 )
             )
 
@@ -215,6 +447,10 @@ class WeaviateAdapter(VectorDB):
         if self.client is None:
             raise RuntimeError("Weaviate client not initialized")
 
+        await self._run_blocking(self._delete, document_ids)
+
+    def _delete(self, document_ids: List[str]) -> None:
+        """Delete objects one by one, skipping missing ones."""
         collection = self.client.collections.get(self.class_name)
         for doc_id in document_ids:
             try:
@@ -233,7 +469,7 @@ class WeaviateAdapter(VectorDB):
 
         collection = self.client.collections.get(self.class_name)
         try:
-            obj = collection.data.get_by_id(doc_id)
+            obj = await self._run_blocking(collection.data.get_by_id, document_id)
             if obj is None:
                 return None
 
@@ -247,6 +483,35 @@ class WeaviateAdapter(VectorDB):
         except Exception:
             return None
 
+    async def get_documents(self, document_ids: List[str]) -> List[Document]:
+        """Get documents by ID from Weaviate with one filtered fetch."""
+        if self.client is None:
+            await self.initialize()
+
+        if self.client is None:
+            raise RuntimeError("Weaviate client not initialized")
+
+        unique_ids = list(dict.fromkeys(document_ids))
+        if not unique_ids:
+            return []
+
+        collection = self.client.collections.get(self.class_name)
+        response = await self._run_blocking(
+            collection.query.fetch_objects,
+            filters=Filter.by_id().contains_any(unique_ids),
+            limit=len(unique_ids),
+        )
+        found = {}
+        for obj in response.objects:
+            props = obj.properties
+            found[str(obj.uuid)] = Document(
+                id=str(obj.uuid),
+                text=props.get("text", ""),
+                metadata={k: v for k, v in props.items() if k not in ("text", "doc_hash")},
+                doc_hash=props.get("doc_hash"),
+            )
+        return [found[doc_id] for doc_id in unique_ids if doc_id in found]
+
     async def update_document(self, document: Document) -> None:
         """Update document in Weaviate."""
         # Delete and re-add
@@ -263,7 +528,9 @@ class WeaviateAdapter(VectorDB):
 
         collection = self.client.collections.get(self.class_name)
         # Weaviate doesn't provide direct stats, so we count objects
-        response = collection.query.fetch_objects(limit=1, return_metadata=MetadataQuery())
+        response = await self._run_blocking(
+            collection.query.fetch_objects, limit=1, return_metadata=MetadataQuery()
+        )
         # This is approximate - full count would require pagination
         return {
             "backend": self.backend.value,
@@ -273,5 +540,5 @@ class WeaviateAdapter(VectorDB):
     async def close(self) -> None:
         """Close Weaviate connection."""
         if self.client:
-            self.client.close()
+            await self._run_blocking(self.client.close)
 
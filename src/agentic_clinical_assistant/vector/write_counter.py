@@ -0,0 +1,101 @@
+"""Per-backend write counters shared across processes through Redis.
+
+A manager's own write epochs only see writes made through it, so an API
+process would keep serving cached results after a Celery worker upserted into
+Pinecone or Weaviate, until the entries expired. With
+``VECTOR_CACHE_WRITE_COUNTER`` every write through any manager increments its
+backend's counter in Redis (``REDIS_URL``), and the counters are part of the
+cache validity token. A manager re-reads them at most every
+``VECTOR_CACHE_WRITE_COUNTER_INTERVAL_SECONDS``, which bounds how long a write
+made in another process goes unseen. While Redis cannot be reached the counts
+are unknown, and the cache is bypassed rather than trusted.
+"""
+
+import logging
+import math
+import time
+from typing import Any, Dict, Optional, Sequence
+
+import redis.asyncio
+from redis.exceptions import RedisError
+
+from agentic_clinical_assistant.config import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "vector:writes:"
+# Seconds a Redis call may take before the counts are treated as unknown
+REDIS_TIMEOUT_SECONDS = 0.5
+
+
+class WriteCounter:
+    """Redis-backed write counters, read through a short-lived local copy."""
+
+    def __init__(self, client: Optional[Any] = None, interval: Optional[float] = None):
+        """
+        Initialize write counters.
+
+        Args:
+            client: Async Redis client (default: one for ``REDIS_URL``)
+            interval: Seconds between reads of the counters
+                (default: ``VECTOR_CACHE_WRITE_COUNTER_INTERVAL_SECONDS``)
+        """
+        self.client = client or redis.asyncio.from_url(
+            settings.REDIS_URL,
+            socket_timeout=REDIS_TIMEOUT_SECONDS,
+            socket_connect_timeout=REDIS_TIMEOUT_SECONDS,
+        )
+        self.interval = (
+            settings.VECTOR_CACHE_WRITE_COUNTER_INTERVAL_SECONDS if interval is None else interval
+        )
+        self._counts: Dict[str, int] = {}
+        self._read_at = -math.inf
+
+    async def increment(self, backend: str) -> None:
+        """
+        Count a write to a backend.
+
+        Args:
+            backend: Backend name
+        """
+        try:
+            await self.client.incr(KEY_PREFIX + backend)
+        except (RedisError, OSError) as exc:
+            logger.warning("Could not count write to %s: %s", backend, exc)
+        # Read the counters again on the next lookup
+        self._read_at = -math.inf
+
+    async def refresh(self, backends: Sequence[str]) -> None:
+        """
+        Re-read the counters of backends if the local copy is older than the interval.
+
+        Args:
+            backends: Backend names
+        """
+        now = time.monotonic()
+        if now - self._read_at < self.interval:
+            return
+        self._read_at = now
+        try:
+            values = await self.client.mget([KEY_PREFIX + backend for backend in backends])
+        except (RedisError, OSError) as exc:
+            logger.warning("Could not read vector write counters: %s", exc)
+            self._counts = {}
+            return
+        self._counts = {backend: int(value or 0) for backend, value in zip(backends, values)}
+
+    def count(self, backend: str) -> Optional[int]:
+        """
+        Writes counted for a backend as of the last read.
+
+        Args:
+            backend: Backend name
+
+        Returns:
+            Count, or None if it is unknown
+        """
+        return self._counts.get(backend)
+
+    async def close(self) -> None:
+        """Close the Redis client."""
+        await self.client.aclose()
@@ -1,5 +1,7 @@
 """Celery application configuration."""
 
+from datetime import timedelta
+
 from celery import Celery
 from celery.schedules import crontab
 
@@ -55,6 +57,11 @@ celery_app.conf.update(
             "schedule": crontab(hour=2, minute=0),  # 2 AM daily
             "options": {"queue": "evaluation"},
         },
+        "faiss-compaction": {
+            "task": "agentic_clinical_assistant.workers.tasks.ingestion.compact_faiss_index",
+            "schedule": timedelta(minutes=settings.FAISS_COMPACTION_INTERVAL_MINUTES),
+            "options": {"queue": "ingestion"},
+        },
     },
 )
 
@@ -7,7 +7,7 @@ from agentic_clinical_assistant.workers.tasks.agent import (
     run_synthesis_agent,
     run_verifier_agent,
 )
-from agentic_clinical_assistant.workers.tasks.ingestion import ingest_documents
+from agentic_clinical_assistant.workers.tasks.ingestion import compact_faiss_index, ingest_documents
 from agentic_clinical_assistant.workers.tasks.evaluation import run_evaluation
 
 __all__ = [
@@ -17,6 +17,7 @@ __all__ = [
     "run_synthesis_agent",
     "run_verifier_agent",
     "ingest_documents",
+    "compact_faiss_index",
     "run_evaluation",
 ]
 
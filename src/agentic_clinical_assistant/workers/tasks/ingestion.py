@@ -1,17 +1,78 @@
 """Document ingestion tasks."""
 
+import asyncio
 import uuid
-from typing import Any, Dict, List
+from collections import Counter
+from typing import Any, Awaitable, Dict, List, Optional, Tuple, TypeVar
 
 from celery import Task
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
 
+from agentic_clinical_assistant.config import settings
 from agentic_clinical_assistant.database import get_async_session
 from agentic_clinical_assistant.database.audit import AuditLogger
+from agentic_clinical_assistant.metrics.collector import MetricsCollector
 from agentic_clinical_assistant.vector import VectorDBManager
 from agentic_clinical_assistant.vector.base import Document, VectorDBBackend
+from agentic_clinical_assistant.vector.dedup import DedupStatus, DocHashIndex
 from agentic_clinical_assistant.vector.embeddings import get_embedding_generator
 from agentic_clinical_assistant.workers.celery_app import celery_app
 
+T = TypeVar("T")
+
+# One event loop and vector manager per worker process, kept across tasks, so
+# a task does not reload the FAISS snapshot, replay the log, wait for the
+# writer lock and write a snapshot of its own; snapshots follow
+# FAISS_SNAPSHOT_INTERVAL and a final one is written at process shutdown
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_manager: Optional[VectorDBManager] = None
+
+
+@worker_process_init.connect
+def open_vector_manager(**kwargs: Any) -> None:
+    """
+    Create the worker process's event loop and vector manager.
+
+    Backends connect when a task first uses them, so only processes that
+    ingest open the FAISS index and take its writer lock.
+    """
+    global _loop, _manager
+    _loop = asyncio.new_event_loop()
+    _manager = VectorDBManager()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def close_vector_manager(**kwargs: Any) -> None:
+    """Close the process's vector manager, writing a final FAISS snapshot."""
+    global _loop, _manager
+    if _manager is not None:
+        _run(_manager.close())
+        _manager = None
+    if _loop is not None:
+        _loop.close()
+        _loop = None
+
+
+def _run(coroutine: Awaitable[T]) -> T:
+    """Run a coroutine on the worker process's event loop."""
+    global _loop
+    if _loop is None:
+        # Pools without child processes (solo, threads) send no worker_process_init
+        _loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coroutine)
+
+
+async def _vector_manager(backend: VectorDBBackend) -> VectorDBManager:
+    """The worker process's vector manager, with a backend connected on first use."""
+    global _manager
+    if _manager is None:
+        _manager = VectorDBManager()
+    if backend not in _manager.adapters and backend not in _manager.unavailable:
+        await _manager.initialize(backends=[backend], lazy=False)
+    return _manager
+
 
 @celery_app.task(
     name="agentic_clinical_assistant.workers.tasks.ingestion.ingest_documents",
@@ -28,63 +89,103 @@ def ingest_documents(
     """
     Ingest documents into vector database.
 
+    Documents are checked against the backend's doc-hash index before
+    embedding, and unchanged ones are skipped. A document with an 'id' keeps
+    it, so a changed version replaces the stored one; documents without one
+    get an id derived from their hash. If the backend holds no documents (its
+    index was reset), the doc-hash index is cleared first.
+
     Args:
-        documents: List of documents with 'text' and optional 'metadata'
+        documents: List of documents with 'text' and optional 'id' and 'metadata'
         backend: Vector backend to use
         batch_size: Batch size for processing
 
     Returns:
-        Ingestion result with document IDs and hashes
+        Ingestion result with document IDs and hashes, and new, changed and skipped counts
     """
     try:
-        # Initialize vector DB manager
-        manager = VectorDBManager()
-        # TODO: Initialize with proper backend
-        # await manager.initialize(backends=[VectorDBBackend(backend)])
-
-        # Get embedding generator
-        generator = get_embedding_generator()
-
-        # Process documents
-        document_objects = []
-        for doc_data in documents:
-            text = doc_data.get("text", "")
-            if not text:
-                continue
-
-            # Generate embedding
-            embedding = generator.generate_embedding(text)
-            doc_hash = generator.compute_doc_hash(text)
-
-            # Create document object
-            doc = Document(
-                id=str(uuid.uuid4()),
-                text=text,
-                embedding=embedding,
-                metadata=doc_data.get("metadata", {}),
-                doc_hash=doc_hash,
-            )
-            document_objects.append(doc)
-
-        # Add to vector database
-        # TODO: Actually add documents (requires async context)
-        # document_ids = await manager.add_documents(
-        #     document_objects,
-        #     backend=VectorDBBackend(backend),
-        #     batch_size=batch_size,
-        # )
-
-        return {
-            "ingested_count": len(document_objects),
-            "document_ids": [doc.id for doc in document_objects],
-            "doc_hashes": [doc.doc_hash for doc in document_objects],
-        }
+        return _run(_ingest(documents, VectorDBBackend(backend), batch_size))
 
     except Exception as exc:
         # Retry on failure
         raise self.retry(exc=exc)
 
 
+async def _ingest(
+    documents: List[Dict[str, Any]], backend: VectorDBBackend, batch_size: int
+) -> Dict[str, Any]:
+    """Classify, embed and add the new and changed documents of an ingestion run."""
+    generator = get_embedding_generator()
+
+    # Latest version of each document by id; repeats within the run are skipped
+    pending: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    repeats = 0
+    for doc_data in documents:
+        text = doc_data.get("text", "")
+        if not text:
+            continue
+        doc_hash = generator.compute_doc_hash(text)
+        key = str(doc_data.get("id") or uuid.uuid5(uuid.NAMESPACE_OID, doc_hash))
+        repeats += key in pending
+        pending[key] = (doc_hash, doc_data)
+
+    keys = list(pending)
+    manager = await _vector_manager(backend)
+    dedup = DocHashIndex.for_backend(backend.value) if settings.VECTOR_DEDUP_ENABLED else None
+    try:
+        if dedup is not None:
+            if len(dedup) and await _holds_no_documents(manager, backend):
+                dedup.clear()
+            statuses = dedup.classify([(key, pending[key][0]) for key in keys])
+        else:
+            statuses = [DedupStatus.NEW] * len(keys)
+        counts = Counter(status.value for status in statuses)
+        counts[DedupStatus.UNCHANGED.value] += repeats
+        changed_keys = [key for key, status in zip(keys, statuses) if status != DedupStatus.UNCHANGED]
+
+        document_objects = []
+        if changed_keys:
+            embeddings = generator.generate_embeddings(
+                [pending[key][1]["text"] for key in changed_keys], batch_size=batch_size
+            )
+            for key, embedding in zip(changed_keys, embeddings):
+                doc_hash, doc_data = pending[key]
+                document_objects.append(
+                    Document(
+                        id=key,
+                        text=doc_data["text"],
+                        embedding=embedding,
+                        metadata=doc_data.get("metadata", {}),
+                        doc_hash=doc_hash,
+                    )
+                )
+
+            await manager.add_documents(document_objects, backend=backend, batch_size=batch_size)
+
+        if dedup is not None:
+            dedup.record((key, pending[key][0]) for key in changed_keys)
+    finally:
+        if dedup is not None:
+            dedup.close()
+
+    counts = {status.value: counts[status.value] for status in DedupStatus}
+    MetricsCollector.record_dedup(backend.value, counts)
+    return {
+        "ingested_count": len(document_objects),
+        "document_ids": [doc.id for doc in document_objects],
+        "doc_hashes": [doc.doc_hash for doc in document_objects],
+        "new_count": counts[DedupStatus.NEW.value],
+        "changed_count": counts[DedupStatus.CHANGED.value],
+        "skipped_count": counts[DedupStatus.UNCHANGED.value],
+    }
+
+
+async def _holds_no_documents(manager: VectorDBManager, backend: VectorDBBackend) -> bool:
+    """Whether a backend reports an empty index (False if it reports no count)."""
+    stats = await manager.get_stats(backend)
+    return stats.get("total_documents", stats.get("total_vectors")) == 0
+
+
 @celery_app.task(
     name="agentic_clinical_assistant.workers.tasks.ingestion.reindex_documents",
     bind=True,
@@ -103,3 +204,31 @@ def reindex_documents(self, backend: str) -> Dict[str, Any]:
     # TODO: Implement reindexing logic
     return {"status": "completed", "backend": backend}
 
+
+@celery_app.task(
+    name="agentic_clinical_assistant.workers.tasks.ingestion.compact_faiss_index",
+    bind=True,
+    max_retries=1,
+)
+def compact_faiss_index(self, force: bool = False) -> Dict[str, Any]:
+    """
+    Compact the FAISS index once deleted rows pass the configured threshold.
+
+    Args:
+        force: Compact regardless of FAISS_COMPACTION_THRESHOLD
+
+    Returns:
+        Compaction summary
+    """
+    async def _compact() -> Dict[str, Any]:
+        # Compact through the process's own adapter, which holds the writer lock
+        manager = await _vector_manager(VectorDBBackend.FAISS)
+        try:
+            adapter = manager.get_adapter(VectorDBBackend.FAISS)
+        except ValueError as exc:
+            # The index could not be opened, e.g. another process holds the writer lock;
+            # it can compact on a later run
+            return {"compacted": False, "skipped": str(exc)}
+        return await adapter.compact(force=force)
+
+    return _run(_compact())
@@ -0,0 +1,30 @@
+"""Tests for retrieval agent models."""
+
+from agentic_clinical_assistant.agents.retrieval.models import RetrievalResult
+from agentic_clinical_assistant.vector.base import SearchHit
+
+
+def test_retrieval_result_from_hits():
+    """Test that retrieval results are built from search hits in one pass, loading text lazily."""
+    loads = []
+
+    def load():
+        loads.append(1)
+        return {"text": "sepsis bundle", "metadata": {"department": "ER"}, "doc_hash": "hash-a"}
+
+    hits = [
+        ("faiss", SearchHit("a", 0.9, load=load)),
+        ("pinecone", SearchHit("b", 0.7, text="triage policy", doc_hash="hash-b")),
+    ]
+    assert not loads
+
+    result = RetrievalResult.from_hits(
+        hits, backends_queried=["faiss", "pinecone"], selected_backend="faiss", retrieval_mode="multi_backend"
+    )
+
+    assert len(loads) == 1
+    assert result.doc_hashes == ["hash-a", "hash-b"]
+    assert result.scores == [0.9, 0.7]
+    assert result.evidence[0]["text"] == "sepsis bundle"
+    assert result.evidence[1]["backend"] == "pinecone"
+    assert result.metadata["total_results"] == 2
@@ -0,0 +1,1685 @@
+"""Tests for the vector database layer."""
+
+import asyncio
+import json
+import mmap
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+import faiss
+import numpy as np
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+
+from agentic_clinical_assistant.config import settings
+from agentic_clinical_assistant.vector import embedding_backends, faiss_store
+from agentic_clinical_assistant.vector import embeddings as embeddings_module
+from agentic_clinical_assistant.vector.base import Document, SearchHit, VectorDBBackend
+from agentic_clinical_assistant.vector.cache import SearchCache
+from agentic_clinical_assistant.vector.dedup import DedupStatus, DocHashIndex
+from agentic_clinical_assistant.vector.embedding_batcher import EmbeddingBatcher
+from agentic_clinical_assistant.vector.embedding_cache import EmbeddingCache
+from agentic_clinical_assistant.vector.embedding_client import EmbeddingClient, EmbeddingServerError
+from agentic_clinical_assistant.vector.embedding_server import EmbeddingServer
+from agentic_clinical_assistant.vector.embeddings import EmbeddingGenerator
+from agentic_clinical_assistant.vector.executor import backend_semaphore, run_blocking
+from agentic_clinical_assistant.vector.faiss_adapter import FAISSAdapter
+from agentic_clinical_assistant.vector.faiss_filters import bitmap_selector
+from agentic_clinical_assistant.vector.faiss_index import search_parameters
+from agentic_clinical_assistant.vector.faiss_lexical import LexicalIndex
+from agentic_clinical_assistant.vector.fusion import fuse_results
+from agentic_clinical_assistant.vector.manager import VectorDBManager
+from agentic_clinical_assistant.vector.pinecone_adapter import PineconeAdapter
+from agentic_clinical_assistant.vector.routing import CircuitState
+from agentic_clinical_assistant.vector.weaviate_adapter import WeaviateAdapter
+from agentic_clinical_assistant.vector.write_counter import WriteCounter
+
+DIMENSION = 8
+
+
+def make_documents(count, start=0, metadata=None):
+    """Create documents with deterministic random embeddings."""
+    rng = np.random.default_rng(start)
+    return [
+        Document(
+            id=f"doc-{i}",
+            text=f"policy text {i}",
+            embedding=rng.random(DIMENSION).tolist(),
+            metadata=dict(metadata or {}),
+            doc_hash=f"hash-{i}",
+        )
+        for i in range(start, start + count)
+    ]
+
+
+def simulate_crash(adapter):
+    """Drop a writer without a final snapshot, as if its process had died."""
+    adapter._log.close()
+    adapter._writer_lock.release()
+
+
+def make_results(doc_ids, scores):
+    """Create ranked search results."""
+    return [
+        SearchHit(doc_id, score, text=doc_id, doc_hash=f"hash-{doc_id}")
+        for doc_id, score in zip(doc_ids, scores)
+    ]
+
+
+class StubBackend:
+    """Backend answering every search with fixed results after a delay."""
+
+    def __init__(self, results, delay=0.0):
+        self.results = results
+        self.delay = delay
+        self.calls = 0
+
+    async def search(self, query_embedding, top_k=10, filters=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.results[:top_k]
+
+
+class ConnectingBackend(StubBackend):
+    """Stub backend whose connection attempts take the given times."""
+
+    def __init__(self, results, connect_delays=(0.0,)):
+        super().__init__(results)
+        self.connect_delays = list(connect_delays)
+        self.connects = 0
+
+    async def initialize(self):
+        delay = self.connect_delays[min(self.connects, len(self.connect_delays) - 1)]
+        self.connects += 1
+        await asyncio.sleep(delay)
+
+    async def close(self):
+        pass
+
+
+class FailingBackend(StubBackend):
+    """Backend whose first `failures` searches raise."""
+
+    def __init__(self, results, failures=None):
+        super().__init__(results)
+        self.failures = failures
+
+    async def search(self, query_embedding, top_k=10, filters=None, **kwargs):
+        if self.failures is None or self.calls < self.failures:
+            self.calls += 1
+            raise ConnectionError("backend unavailable")
+        return await super().search(query_embedding, top_k, filters, **kwargs)
+
+
+class PineconeStandIn(ThreadingHTTPServer):
+    """Local HTTP stand-in for the Pinecone data-plane API."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), PineconeStandInHandler)
+        self.vectors = {}
+        self.upserts = []
+        self.fail_ids = {}
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.fetch_requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def host(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class PineconeStandInHandler(BaseHTTPRequestHandler):
+    """Serves upsert and fetch; fails upserts of batches holding a fail id while it has failures left."""
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        ids = [vector["id"] for vector in body["vectors"]]
+        with server.lock:
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+            failing = [doc_id for doc_id in ids if server.fail_ids.get(doc_id, 0) > 0]
+            for doc_id in failing:
+                server.fail_ids[doc_id] -= 1
+        time.sleep(0.02)
+        with server.lock:
+            server.in_flight -= 1
+            if not failing:
+                server.upserts.append(ids)
+                server.vectors.update({vector["id"]: vector for vector in body["vectors"]})
+        if failing:
+            self._reply(503, {"code": 14, "message": "unavailable"})
+        else:
+            self._reply(200, {"upsertedCount": len(ids)})
+
+    def do_GET(self):
+        ids = self.path.split("?", 1)[1].replace("ids=", "").split("&")
+        with self.server.lock:
+            self.server.fetch_requests += 1
+            vectors = {doc_id: self.server.vectors[doc_id] for doc_id in ids if doc_id in self.server.vectors}
+        self._reply(200, {"vectors": vectors, "namespace": ""})
+
+    def log_message(self, *args):
+        pass
+
+
+class WeaviateStandIn:
+    """In-process stand-in for a Weaviate collection and its batch API."""
+
+    def __init__(self):
+        self.objects = {}
+        self.batches = []
+        self.reject = {}  # uuid -> number of imports to reject
+        self.failed_objects = []
+        self.batch = self
+        self.collections = self
+
+    def get(self, name):
+        return self
+
+    def fixed_size(self, batch_size, concurrent_requests):
+        return self._open(("fixed", batch_size))
+
+    def rate_limit(self, requests_per_minute):
+        return self._open(("rate_limit", requests_per_minute))
+
+    def dynamic(self):
+        return self._open(("dynamic", None))
+
+    def _open(self, mode):
+        self.failed_objects = []
+        self.batches.append((mode, []))
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def add_object(self, properties, vector, uuid):
+        self.batches[-1][1].append(uuid)
+        if self.reject.get(uuid, 0) > 0:
+            self.reject[uuid] -= 1
+            self.failed_objects.append(
+                SimpleNamespace(message="vector dimension mismatch", object_=SimpleNamespace(uuid=uuid))
+            )
+        else:
+            self.objects[uuid] = properties
+
+
+@pytest.fixture
+def weaviate_adapter():
+    """Weaviate adapter connected to the stand-in."""
+    adapter = WeaviateAdapter()
+    adapter.client = WeaviateStandIn()
+    return adapter
+
+
+@pytest.fixture
+def pinecone_server():
+    """Pinecone stand-in serving on a local port."""
+    server = PineconeStandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest_asyncio.fixture
+async def faiss_adapter(tmp_path):
+    """FAISS adapter backed by a temporary index directory."""
+    adapter = FAISSAdapter(index_path=str(tmp_path / "faiss_index"), dimension=DIMENSION)
+    await adapter.initialize()
+    return adapter
+
+
+@pytest.mark.asyncio
+async def test_faiss_bulk_add_uses_batch_size(faiss_adapter, mocker):
+    """Test that bulk add issues one index add and one log write per batch."""
+    add_spy = mocker.spy(faiss_adapter.index, "add_with_ids")
+    persist_spy = mocker.spy(faiss_adapter, "_persist")
+
+    documents = make_documents(25)
+    ids = await faiss_adapter.add_documents(documents, batch_size=10)
+
+    assert ids == [doc.id for doc in documents]
+    assert [call.args[0].shape[0] for call in add_spy.call_args_list] == [10, 10, 5]
+    assert persist_spy.call_count == 3
+    assert faiss_adapter.index.ntotal == 25
+    assert faiss_adapter.table.row_of("doc-24") == 24
+
+
+@pytest.mark.asyncio
+async def test_faiss_bulk_add_validates_before_adding(faiss_adapter):
+    """Test that an invalid embedding rejects the whole call."""
+    documents = make_documents(3)
+    documents[2].embedding = [0.0] * (DIMENSION + 1)
+
+    with pytest.raises(ValueError, match="dimension mismatch"):
+        await faiss_adapter.add_documents(documents)
+
+    assert faiss_adapter.index.ntotal == 0
+
+
+@pytest.mark.asyncio
+async def test_faiss_search_returns_nearest(faiss_adapter):
+    """Test that the exact match is the top search result."""
+    documents = make_documents(20)
+    await faiss_adapter.add_documents(documents)
+
+    results = await faiss_adapter.search(documents[7].embedding, top_k=3)
+
+    assert len(results) == 3
+    assert results[0].id == "doc-7"
+
+
+@pytest.mark.asyncio
+async def test_faiss_hits_load_records_on_first_access(faiss_adapter, mocker):
+    """Test that hit records are decoded only when read, and converted only at serialization."""
+    documents = make_documents(10, metadata={"department": "ICU"})
+    await faiss_adapter.add_documents(documents)
+    decode_spy = mocker.spy(faiss_store, "decode_record")
+
+    hits = await faiss_adapter.search(documents[4].embedding, top_k=5)
+    assert decode_spy.call_count == 0
+
+    top = hits[0]
+    assert (top.text, top.doc_hash, top.metadata) == ("policy text 4", "hash-4", {"department": "ICU"})
+    assert decode_spy.call_count == 1
+    assert top.with_score(0.5).text == "policy text 4" and decode_spy.call_count == 1
+
+    result = top.to_result()
+    assert result.document.id == "doc-4" and result.doc_hash == "hash-4"
+    assert decode_spy.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_hybrid_and_fused_searches_decode_only_records_read(faiss_adapter, mocker):
+    """Test that fusing candidates, in hybrid or multi-backend search, decodes no records."""
+    documents = make_documents(50)
+    documents[42].text = "Vancomycin trough monitoring policy"
+    await faiss_adapter.add_documents(documents)
+    decode_spy = mocker.spy(faiss_store, "decode_record")
+
+    hybrid = await faiss_adapter.search(
+        documents[7].embedding, top_k=3, retrieval_mode="hybrid", query_text="vancomycin"
+    )
+    assert len(hybrid) == 3 and decode_spy.call_count == 0
+
+    manager = VectorDBManager()
+    manager.enable_multi_backend = True
+    manager.adapters = {
+        VectorDBBackend.FAISS: faiss_adapter,
+        VectorDBBackend.WEAVIATE: StubBackend(make_results(["doc-7", "z"], [0.9, 0.8])),
+    }
+    fused = await manager.search(documents[7].embedding, top_k=3)
+    assert fused[0].id == "doc-7" and decode_spy.call_count == 0
+
+    assert hybrid[0].text
+    assert decode_spy.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_faiss_recovers_from_log_and_torn_write(faiss_adapter):
+    """Test that logged writes survive a restart and a torn frame is dropped."""
+    documents = make_documents(5)
+    await faiss_adapter.add_documents(documents)
+    await faiss_adapter.delete_documents(["doc-1"])
+
+    # Simulate a crash in the middle of the next write
+    log_path = faiss_adapter.index_path / faiss_store.LOG_FILE
+    with open(log_path, "ab") as f:
+        f.write(b"\x07" * 11)
+    simulate_crash(faiss_adapter)
+
+    reopened = FAISSAdapter(index_path=str(faiss_adapter.index_path), dimension=DIMENSION)
+    await reopened.initialize()
+
+    assert reopened.table.live_count == 4
+    assert (await reopened.get_document("doc-1")) is None
+    doc = await reopened.get_document("doc-3")
+    assert doc.text == "policy text 3"
+    assert np.allclose(doc.embedding, documents[3].embedding)
+
+    await reopened.add_documents(make_documents(1, start=5))
+    assert (await reopened.get_document("doc-5")) is not None
+
+
+@pytest.mark.asyncio
+async def test_faiss_snapshot_truncates_log(faiss_adapter, monkeypatch):
+    """Test that a periodic snapshot captures state and empties the log."""
+    monkeypatch.setattr(settings, "FAISS_SNAPSHOT_INTERVAL", 10)
+
+    await faiss_adapter.add_documents(make_documents(12), batch_size=4)
+
+    log_path = faiss_adapter.index_path / faiss_store.LOG_FILE
+    stats = await faiss_adapter.get_stats()
+    assert stats["snapshot_lsn"] == 3
+    assert stats["changes_since_snapshot"] == 0
+    assert log_path.stat().st_size == 0
+
+    await faiss_adapter.close()
+    reopened = FAISSAdapter(index_path=str(faiss_adapter.index_path), dimension=DIMENSION)
+    await reopened.initialize()
+    assert reopened.table.live_count == 12
+    assert reopened.index.ntotal == 12
+
+
+@pytest.mark.asyncio
+async def test_faiss_document_table_replaces_and_removes(faiss_adapter):
+    """Test that the array-backed table tracks replaced and deleted ids."""
+    await faiss_adapter.add_documents(make_documents(3))
+    updated = make_documents(1, start=1)[0]
+    updated.text = "revised policy text"
+    await faiss_adapter.update_document(updated)
+    await faiss_adapter.delete_documents(["doc-0"])
+
+    assert faiss_adapter.table.live_count == 2
+    assert faiss_adapter.table.row_of("doc-1") == 3
+    assert (await faiss_adapter.get_document("doc-1")).text == "revised policy text"
+
+    results = await faiss_adapter.search(updated.embedding, top_k=3)
+    assert [result.id for result in results].count("doc-1") == 1
+    assert all(isinstance(result, SearchHit) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_faiss_ivf_index_trains_and_persists(tmp_path, monkeypatch):
+    """Test that an IVF index trains on first add and recovers onto its template."""
+    monkeypatch.setattr(settings, "FAISS_NLIST", 4)
+    index_path = tmp_path / "faiss_index"
+    adapter = FAISSAdapter(index_path=str(index_path), dimension=DIMENSION, index_type="ivf_flat")
+    await adapter.initialize()
+    assert not adapter.index.is_trained
+
+    with pytest.raises(ValueError, match="training vectors"):
+        await adapter.add_documents(make_documents(2))
+
+    documents = make_documents(50)
+    await adapter.add_documents(documents)
+
+    assert adapter.index.is_trained
+    assert (index_path / "trained.faiss").exists()
+    results = await adapter.search(documents[11].embedding, top_k=1, nprobe=4)
+    assert results[0].id == "doc-11"
+
+    # Recovery replays the log onto the persisted trained index
+    simulate_crash(adapter)
+    reopened = FAISSAdapter(index_path=str(index_path), dimension=DIMENSION)
+    await reopened.initialize()
+    stats = await reopened.get_stats()
+    assert stats["index_type"] == "ivf_flat"
+    assert stats["is_trained"] is True
+    assert reopened.index.ntotal == 50
+    assert np.allclose((await reopened.get_document("doc-3")).embedding, documents[3].embedding)
+
+
+@pytest.mark.asyncio
+async def test_faiss_hnsw_index_search(tmp_path):
+    """Test that an HNSW index needs no training and honours ef_search."""
+    adapter = FAISSAdapter(
+        index_path=str(tmp_path / "faiss_index"), dimension=DIMENSION, index_type="hnsw_flat"
+    )
+    await adapter.initialize()
+    documents = make_documents(30)
+    await adapter.add_documents(documents)
+
+    results = await adapter.search(documents[5].embedding, top_k=2, ef_search=16)
+
+    assert results[0].id == "doc-5"
+    assert (await adapter.get_stats())["index_type"] == "hnsw_flat"
+
+
+@pytest.mark.asyncio
+async def test_faiss_delete_removes_vectors(faiss_adapter):
+    """Test that deletes and updates remove vectors from the index."""
+    documents = make_documents(10)
+    await faiss_adapter.add_documents(documents)
+    await faiss_adapter.delete_documents(["doc-2", "doc-4"])
+    await faiss_adapter.update_document(documents[5])
+
+    assert faiss_adapter.index.ntotal == 8
+    results = await faiss_adapter.search(documents[2].embedding, top_k=8)
+    assert len(results) == 8
+    assert "doc-2" not in [result.id for result in results]
+    assert (await faiss_adapter.get_stats())["tombstone_ratio"] == pytest.approx(3 / 11)
+
+
+@pytest.mark.asyncio
+async def test_faiss_compaction_drops_tombstones(tmp_path, monkeypatch):
+    """Test that compaction rebuilds an HNSW index from live rows past the threshold."""
+    monkeypatch.setattr(settings, "FAISS_COMPACTION_THRESHOLD", 0.25)
+    index_path = tmp_path / "faiss_index"
+    adapter = FAISSAdapter(index_path=str(index_path), dimension=DIMENSION, index_type="hnsw_flat")
+    await adapter.initialize()
+    documents = make_documents(20)
+    await adapter.add_documents(documents)
+
+    await adapter.delete_documents(["doc-0", "doc-1"])
+    assert adapter.index.ntotal == 20  # HNSW keeps deleted vectors as tombstones
+    assert (await adapter.compact())["compacted"] is False
+
+    await adapter.delete_documents([f"doc-{i}" for i in range(2, 6)])
+    result = await adapter.compact()
+
+    assert result["compacted"] is True
+    assert result["rows_after"] == 14
+    assert adapter.index.ntotal == 14
+    assert adapter.table.tombstone_ratio == 0.0
+    assert adapter.table.row_of("doc-6") == 0
+    results = await adapter.search(documents[9].embedding, top_k=1)
+    assert results[0].id == "doc-9"
+
+    simulate_crash(adapter)
+    reopened = FAISSAdapter(index_path=str(index_path), dimension=DIMENSION)
+    await reopened.initialize()
+    assert reopened.index.ntotal == 14
+    assert np.allclose((await reopened.get_document("doc-19")).embedding, documents[19].embedding)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("brute_force_max", [0, 4096])
+async def test_faiss_filtered_search_returns_top_k(faiss_adapter, monkeypatch, brute_force_max):
+    """Test that filters are applied before the search, via selector or brute force."""
+    monkeypatch.setattr(settings, "FAISS_FILTER_BRUTE_FORCE_MAX", brute_force_max)
+    documents = make_documents(200)
+    for i, doc in enumerate(documents):
+        doc.metadata = {"department": "ICU" if i % 20 == 0 else "ER", "version": str(i % 3)}
+    await faiss_adapter.add_documents(documents)
+    await faiss_adapter.delete_documents(["doc-40"])
+
+    results = await faiss_adapter.search(documents[1].embedding, top_k=5, filters={"department": "ICU"})
+
+    assert len(results) == 5
+    assert all(result.metadata["department"] == "ICU" for result in results)
+    assert "doc-40" not in [result.id for result in results]
+
+    results = await faiss_adapter.search(
+        documents[1].embedding, top_k=50, filters={"department": "ICU", "version": ["0", "1"]}
+    )
+    expected = {f"doc-{i}" for i in range(0, 200, 20) if i % 3 != 2 and i != 40}
+    assert {result.id for result in results} == expected
+
+
+@pytest.mark.asyncio
+async def test_faiss_filtered_search_widens_instead_of_scanning(tmp_path, monkeypatch):
+    """Test that a short filtered IVF search is retried wider, not brute-forced over every match."""
+    monkeypatch.setattr(settings, "FAISS_NLIST", 16)
+    monkeypatch.setattr(settings, "FAISS_FILTER_BRUTE_FORCE_MAX", 0)
+    adapter = FAISSAdapter(
+        index_path=str(tmp_path / "faiss_index"), dimension=DIMENSION, index_type="ivf_flat"
+    )
+    await adapter.initialize()
+    documents = make_documents(400)
+    for i, doc in enumerate(documents):
+        doc.metadata = {"department": "ICU" if i % 2 else "ER"}
+    await adapter.add_documents(documents)
+
+    def no_scan(*args, **kwargs):
+        raise AssertionError("matching rows were scanned exhaustively")
+
+    monkeypatch.setattr(faiss, "knn", no_scan)
+    query = np.asarray([documents[1].embedding], dtype=np.float32)
+    mask = adapter.filters.mask({"department": "ICU"}, adapter.table.alive)
+    params = search_parameters(adapter.index, 1, None, bitmap_selector(mask))
+    _, labels = adapter.index.search(query, 100, params=params)
+    reached = int(np.count_nonzero(labels != -1))
+    assert reached < 100
+
+    results = await adapter.search(
+        documents[1].embedding, top_k=100, filters={"department": "ICU"}, nprobe=1
+    )
+
+    assert reached < len(results) <= 100
+    assert all(result.metadata["department"] == "ICU" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_faiss_metadata_index_rebuilt_on_load(faiss_adapter):
+    """Test that the metadata index is rebuilt from a snapshot plus the log."""
+    await faiss_adapter.add_documents(make_documents(10, metadata={"department": "ICU"}))
+    await faiss_adapter.close()
+    await faiss_adapter.initialize()
+    await faiss_adapter.add_documents(make_documents(5, start=10, metadata={"department": "ER"}))
+    simulate_crash(faiss_adapter)
+
+    reopened = FAISSAdapter(index_path=str(faiss_adapter.index_path), dimension=DIMENSION)
+    await reopened.initialize()
+    results = await reopened.search([0.5] * DIMENSION, top_k=10, filters={"department": "ER"})
+
+    assert sorted(result.id for result in results) == [f"doc-{i}" for i in range(10, 15)]
+    assert await reopened.search([0.5] * DIMENSION, filters={"department": "OR"}) == []
+
+
+@pytest.mark.asyncio
+async def test_faiss_read_only_maps_snapshot(faiss_adapter):
+    """Test that a read-only adapter serves the mapped snapshot and rejects writes."""
+    documents = make_documents(30)
+    for i, doc in enumerate(documents):
+        doc.metadata = {"department": "ICU" if i % 3 == 0 else "ER"}
+    await faiss_adapter.add_documents(documents)
+    await faiss_adapter.delete_documents(["doc-3"])
+    await faiss_adapter.close()
+
+    reader = FAISSAdapter(
+        index_path=str(faiss_adapter.index_path), dimension=DIMENSION, read_only=True
+    )
+    await reader.initialize()
+
+    assert isinstance(reader.table._record_blob, mmap.mmap)
+    assert not reader.table._alive.view.flags.writeable  # mapped, not recomputed
+    assert reader.table.live_count == 29
+    results = await reader.search(documents[6].embedding, top_k=20, filters={"department": "ICU"})
+    assert len(results) == 9
+    assert results[0].id == "doc-6"
+    doc = await reader.get_document("doc-7")
+    assert np.allclose(doc.embedding, documents[7].embedding)
+    assert (await reader.get_document("doc-3")) is None
+
+    with pytest.raises(RuntimeError, match="read-only"):
+        await reader.add_documents(make_documents(1, start=30))
+    with pytest.raises(RuntimeError, match="read-only"):
+        await reader.delete_documents(["doc-0"])
+
+
+@pytest.mark.asyncio
+async def test_faiss_single_writer_lock(faiss_adapter, monkeypatch):
+    """Test that a second writer on the same directory is refused until the first closes."""
+    monkeypatch.setattr(settings, "FAISS_WRITER_LOCK_TIMEOUT", 0.1)
+    second = FAISSAdapter(index_path=str(faiss_adapter.index_path), dimension=DIMENSION)
+
+    with pytest.raises(RuntimeError, match="Another process is writing"):
+        await second.initialize()
+
+    await faiss_adapter.close()
+    await second.initialize()
+    await second.close()
+
+
+@pytest.mark.asyncio
+async def test_faiss_reader_hot_swaps_generations(faiss_adapter, monkeypatch):
+    """Test that a reader picks up new generations while keeping the old one usable."""
+    monkeypatch.setattr(settings, "FAISS_SNAPSHOT_INTERVAL", 5)
+    monkeypatch.setattr(settings, "FAISS_REFRESH_INTERVAL_SECONDS", 0.0)
+    documents = make_documents(15)
+    await faiss_adapter.add_documents(documents[:5])
+
+    reader = FAISSAdapter(
+        index_path=str(faiss_adapter.index_path), dimension=DIMENSION, read_only=True
+    )
+    await reader.initialize()
+    pinned_index, pinned_table = reader.index, reader.table
+    assert reader.table.live_count == 5
+
+    await faiss_adapter.add_documents(documents[5:10])
+    await faiss_adapter.add_documents(documents[10:])
+
+    results = await reader.search(documents[12].embedding, top_k=1)
+    assert results[0].id == "doc-12"
+    assert reader.table.live_count == 15
+    assert (await reader.get_stats())["generation"] == (await faiss_adapter.get_stats())["generation"]
+
+    # The previous generation stays intact for searches that pinned it
+    assert pinned_table.live_count == 5
+    assert pinned_index.search(np.array([documents[3].embedding], dtype=np.float32), 1)[1][0][0] == 3
+
+    generations = sorted(faiss_adapter.index_path.glob(f"{faiss_store.GENERATION_PREFIX}*"))
+    assert len(generations) == settings.FAISS_SNAPSHOT_GENERATIONS
+    assert await reader.refresh() is False
+
+
+@pytest.mark.asyncio
+async def test_faiss_reader_swaps_generations_under_concurrent_searches(
+    faiss_adapter, monkeypatch, mocker
+):
+    """Test that searches racing a hot swap see one whole generation, opened once."""
+    monkeypatch.setattr(settings, "FAISS_SNAPSHOT_INTERVAL", 10)
+    monkeypatch.setattr(settings, "FAISS_REFRESH_INTERVAL_SECONDS", 0.0)
+    documents = make_documents(60)
+    for i, doc in enumerate(documents):
+        doc.metadata = {"department": "ICU" if i % 2 else "ER"}
+    await faiss_adapter.add_documents(documents[:10])
+
+    reader = FAISSAdapter(
+        index_path=str(faiss_adapter.index_path), dimension=DIMENSION, read_only=True
+    )
+    await reader.initialize()
+    opens = mocker.spy(faiss_store, "read_current_snapshot")
+    queries = np.array([doc.embedding for doc in documents[:4]], dtype=np.float32)
+    done = asyncio.Event()
+
+    async def search_until_done():
+        while not done.is_set():
+            batch = await reader.search_batch(
+                queries,
+                top_k=5,
+                filters={"department": "ICU"},
+                retrieval_mode="hybrid",
+                query_texts=["policy text"] * len(queries),
+            )
+            for hits in batch:
+                for hit in hits:
+                    number = int(hit.id.split("-")[1])
+                    assert number % 2 == 1
+                    assert hit.text == f"policy text {number}"
+            await asyncio.sleep(0)
+
+    searchers = [asyncio.create_task(search_until_done()) for _ in range(8)]
+    for start in range(10, 60, 10):
+        await faiss_adapter.add_documents(documents[start : start + 10])
+        await asyncio.sleep(0.02)
+    done.set()
+    await asyncio.gather(*searchers)
+
+    await reader.refresh()
+    assert reader.table.live_count == 60
+    assert opens.call_count <= 5  # one open per published generation at most
+
+
+@pytest.mark.asyncio
+async def test_faiss_search_batch_runs_one_matrix_search(faiss_adapter, mocker):
+    """Test that a batch query matches single searches with one index search."""
+    documents = make_documents(40, metadata={"department": "ICU"})
+    await faiss_adapter.add_documents(documents)
+    queries = np.array([documents[i].embedding for i in (3, 17, 29)], dtype=np.float32)
+    search_spy = mocker.spy(faiss_adapter.index, "search")
+
+    batch = await faiss_adapter.search_batch(queries, top_k=4)
+
+    assert search_spy.call_count == 1
+    assert [results[0].id for results in batch] == ["doc-3", "doc-17", "doc-29"]
+    for query, results in zip(queries, batch):
+        single = await faiss_adapter.search(query.tolist(), top_k=4)
+        assert [r.id for r in single] == [r.id for r in results]
+
+    with pytest.raises(ValueError, match="2-D"):
+        await faiss_adapter.search_batch(queries[0], top_k=4)
+
+
+@pytest.mark.asyncio
+async def test_embeddings_stay_float32_arrays_without_copies(faiss_adapter):
+    """Test that documents share a generated matrix and FAISS adds it without copying."""
+    matrix = np.random.default_rng(0).random((6, DIMENSION)).astype(np.float32)
+    documents = [
+        Document(id=f"doc-{i}", text=f"policy text {i}", embedding=row)
+        for i, row in enumerate(matrix)
+    ]
+
+    assert all(np.shares_memory(doc.embedding, matrix) for doc in documents)
+    stacked = faiss_adapter._stack_embeddings(documents[1:4])
+    assert np.shares_memory(stacked, matrix) and np.array_equal(stacked, matrix[1:4])
+    shuffled = faiss_adapter._stack_embeddings([documents[2], documents[0]])
+    assert not np.shares_memory(shuffled, matrix)
+
+    listed = Document(id="doc-x", text="policy", embedding=matrix[0].tolist())
+    assert listed.embedding.dtype == np.float32
+    assert json.loads(listed.model_dump_json())["embedding"] == pytest.approx(matrix[0].tolist())
+
+    await faiss_adapter.add_documents(documents)
+    fetched = await faiss_adapter.get_document("doc-2")
+    assert isinstance(fetched.embedding, np.ndarray)
+    assert np.array_equal(fetched.embedding, matrix[2])
+
+
+@pytest.mark.asyncio
+async def test_manager_search_batch_uses_default_backend(faiss_adapter):
+    """Test that the manager routes a batch query to the default backend."""
+    documents = make_documents(10)
+    await faiss_adapter.add_documents(documents)
+    manager = VectorDBManager()
+    manager.adapters = {VectorDBBackend.FAISS: faiss_adapter}
+    manager.default_backend = VectorDBBackend.FAISS
+
+    batch = await manager.search_batch([documents[1].embedding, documents[8].embedding], top_k=2)
+
+    assert [results[0].id for results in batch] == ["doc-1", "doc-8"]
+
+
+@pytest.mark.asyncio
+async def test_pinecone_search_batch_queries_concurrently(mocker):
+    """Test that Pinecone batch queries are issued per row and returned in order."""
+    adapter = PineconeAdapter(api_key="test-key")
+    adapter.index = mocker.Mock()
+    adapter.index.query.side_effect = lambda vector, **kwargs: {
+        "matches": [{"id": f"doc-{vector[0]:.0f}", "score": 0.9, "metadata": {"text": "t"}}]
+    }
+
+    batch = await adapter.search_batch(
+        np.array([[1.0, 0.0], [2.0, 0.0], [3.0, 0.0]], dtype=np.float32),
+        top_k=1,
+        filters={"department": ["ER", "ICU"]},
+    )
+
+    assert [results[0].id for results in batch] == ["doc-1", "doc-2", "doc-3"]
+    assert adapter.index.query.call_count == 3
+    assert adapter.index.query.call_args.kwargs["filter"] == {"department": {"$in": ["ER", "ICU"]}}
+
+
+@pytest.mark.asyncio
+async def test_blocking_backend_calls_leave_event_loop_free(faiss_adapter, monkeypatch):
+    """Test that a slow search runs off the loop and backend calls are capped."""
+    monkeypatch.setattr(settings, "VECTOR_BACKEND_CONCURRENCY", 2)
+    await faiss_adapter.add_documents(make_documents(10))
+    search_pinned = faiss_adapter._search_pinned
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def slow_search(*args):
+        with lock:
+            active.append(None)
+            peak.append(len(active))
+        time.sleep(0.2)
+        with lock:
+            active.pop()
+        return search_pinned(*args)
+
+    monkeypatch.setattr(faiss_adapter, "_search_pinned", slow_search)
+    query = make_documents(1)[0].embedding
+    searches = asyncio.gather(*(faiss_adapter.search(query, top_k=1) for _ in range(4)))
+
+    ticks = 0
+    while ticks < 5:
+        await asyncio.sleep(0.01)
+        ticks += 1
+    assert not searches.done()
+
+    results = await searches
+    assert all(hits[0].id == "doc-0" for hits in results)
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_backend_call_holds_its_slot_until_the_thread_ends(monkeypatch):
+    """Test that cancelling a caller does not free the backend slot of a running call."""
+    monkeypatch.setattr(settings, "VECTOR_BACKEND_CONCURRENCY", 1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_call():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    call = asyncio.create_task(run_blocking("slot-test", blocking_call))
+    await asyncio.to_thread(started.wait, 5)
+    call.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await call
+
+    semaphore = backend_semaphore("slot-test")
+    assert semaphore.locked()
+
+    release.set()
+    assert await run_blocking("slot-test", lambda: "next") == "next"
+    assert not semaphore.locked()
+
+
+@pytest.mark.parametrize("method", ["rrf", "score"])
+def test_fusion_ranks_across_score_scales(method):
+    """Test that fusion favours documents several backends agree on, whatever their scales."""
+    faiss_results = make_results(["a", "c", "b"], [0.99, 0.98, 0.97])
+    pinecone_results = make_results(["c", "d"], [0.2, 0.1])
+
+    fused = fuse_results([faiss_results, pinecone_results], top_k=3, method=method)
+
+    assert fused[0].id == "c"
+    assert len(fused) == 3
+
+
+@pytest.mark.asyncio
+async def test_manager_multi_backend_search_drops_backends_past_timeout(monkeypatch):
+    """Test that a backend missing the timeout is left out of the fused results."""
+    monkeypatch.setattr(settings, "VECTOR_BACKEND_TIMEOUT_SECONDS", 0.1)
+    manager = VectorDBManager()
+    manager.enable_multi_backend = True
+    manager.adapters = {
+        VectorDBBackend.FAISS: StubBackend(make_results(["a", "b"], [0.9, 0.8])),
+        VectorDBBackend.WEAVIATE: StubBackend(make_results(["z"], [1.0]), delay=1.0),
+    }
+
+    results = await manager.search([0.0] * DIMENSION, top_k=2)
+
+    assert [result.id for result in results] == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_manager_hedges_to_secondary_when_primary_is_slow(monkeypatch):
+    """Test that a hedged search returns the secondary's answer once the primary lags."""
+    monkeypatch.setattr(settings, "VECTOR_HEDGED_REQUESTS", True)
+    monkeypatch.setattr(settings, "VECTOR_HEDGE_DELAY_SECONDS", 0.05)
+    primary = StubBackend(make_results(["a", "b"], [0.9, 0.8]), delay=1.0)
+    secondary = StubBackend(make_results(["c", "d"], [0.7, 0.6]))
+    manager = VectorDBManager()
+    manager.enable_multi_backend = True
+    manager.default_backend = VectorDBBackend.FAISS
+    manager.adapters = {VectorDBBackend.PINECONE: secondary, VectorDBBackend.FAISS: primary}
+
+    start = time.perf_counter()
+    results = await manager.search([0.0] * DIMENSION, top_k=2)
+
+    assert time.perf_counter() - start < 0.5
+    assert [result.id for result in results] == ["c", "d"]
+    assert primary.calls == 1 and secondary.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_manager_retries_without_fixed_backoff():
+    """Test that a failed search is retried at once within the deadline."""
+    backend = FailingBackend(make_results(["a"], [0.9]), failures=1)
+    manager = VectorDBManager()
+    manager.adapters = {VectorDBBackend.FAISS: backend}
+
+    start = time.perf_counter()
+    results = await manager.search([0.0] * DIMENSION, top_k=1, backend=VectorDBBackend.FAISS)
+
+    assert time.perf_counter() - start < 0.5
+    assert [result.id for result in results] == ["a"]
+    assert backend.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_single_backend_without_routing_ignores_breaker_and_timeout(monkeypatch):
+    """Test that the only backend is still called, past its timeout, once its circuit opens."""
+    monkeypatch.setattr(settings, "VECTOR_CIRCUIT_FAILURE_THRESHOLD", 1)
+    monkeypatch.setattr(settings, "VECTOR_BACKEND_TIMEOUT_SECONDS", 0.05)
+    backend = FailingBackend(make_results(["a"], [0.9]), failures=1)
+    backend.delay = 0.1
+    manager = VectorDBManager()
+    manager.default_backend = VectorDBBackend.FAISS
+    manager.adapters = {VectorDBBackend.FAISS: backend}
+
+    results = await manager.search([0.0] * DIMENSION, top_k=1)
+    assert [result.id for result in results] == ["a"]
+    assert backend.calls == 2
+
+    manager.router.record_failure("faiss", 0.0)
+    assert manager.router.breaker("faiss").state == CircuitState.OPEN
+    results = await manager.search([0.0] * DIMENSION, top_k=1)
+    assert [result.id for result in results] == ["a"]
+    assert backend.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_adaptive_routing_opens_circuit_and_routes_to_healthy_backend(monkeypatch):
+    """Test that a failing backend trips its breaker and traffic moves to a healthy one."""
+    monkeypatch.setattr(settings, "VECTOR_ADAPTIVE_ROUTING", True)
+    monkeypatch.setattr(settings, "VECTOR_CIRCUIT_FAILURE_THRESHOLD", 1)
+    failing = FailingBackend(make_results(["a"], [0.9]))
+    healthy = StubBackend(make_results(["b"], [0.8]))
+    manager = VectorDBManager()
+    manager.default_backend = VectorDBBackend.FAISS
+    manager.adapters = {VectorDBBackend.FAISS: failing, VectorDBBackend.WEAVIATE: healthy}
+
+    for _ in range(3):
+        results = await manager.search([0.0] * DIMENSION, top_k=1)
+        assert [result.id for result in results] == ["b"]
+
+    assert failing.calls == 1
+    assert manager.router.breaker("faiss").state == CircuitState.OPEN
+    labels = {"backend": "faiss", "request_type": "search"}
+    assert REGISTRY.get_sample_value("vector_routing_weight", labels) == 0.0
+    labels["backend"] = "weaviate"
+    assert REGISTRY.get_sample_value("vector_routing_weight", labels) == 1.0
+
+
+@pytest.mark.asyncio
+async def test_manager_initializes_backends_concurrently_and_reconnects(monkeypatch):
+    """Test that a hanging backend only delays startup by its timeout and is reconnected later."""
+    monkeypatch.setattr(settings, "VECTOR_INIT_TIMEOUT_SECONDS", 0.2)
+    monkeypatch.setattr(settings, "VECTOR_HEALTH_PROBE_INTERVAL_SECONDS", 0.05)
+    adapters = {
+        VectorDBBackend.FAISS: ConnectingBackend(make_results(["a"], [0.9]), [0.1]),
+        VectorDBBackend.WEAVIATE: ConnectingBackend(make_results(["b"], [0.8]), [10.0, 0.0]),
+    }
+    monkeypatch.setattr(VectorDBManager, "_create_adapter", staticmethod(adapters.get))
+    manager = VectorDBManager()
+
+    start = time.perf_counter()
+    await manager.initialize(backends=list(adapters))
+
+    assert time.perf_counter() - start < 0.5
+    assert list(manager.adapters) == [VectorDBBackend.FAISS]
+    assert list(manager.unavailable) == [VectorDBBackend.WEAVIATE]
+
+    await asyncio.sleep(0.2)
+    assert set(manager.adapters) == set(adapters)
+    assert not manager.unavailable
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_manager_lazy_init_connects_once_on_first_use(monkeypatch):
+    """Test that lazily registered adapters connect on first use, once."""
+    backend = ConnectingBackend(make_results(["a"], [0.9]), [0.05])
+    monkeypatch.setattr(VectorDBManager, "_create_adapter", staticmethod(lambda _: backend))
+    manager = VectorDBManager()
+    manager.default_backend = VectorDBBackend.FAISS
+
+    await manager.initialize(backends=[VectorDBBackend.FAISS], lazy=True)
+    assert backend.connects == 0
+
+    batch = await asyncio.gather(*(manager.search([0.0] * DIMENSION, top_k=1) for _ in range(3)))
+
+    assert all(results[0].id == "a" for results in batch)
+    assert backend.connects == 1
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_pinecone_upserts_batches_concurrently_and_resends_failed_ones(
+    pinecone_server, monkeypatch
+):
+    """Test that upsert batches run in parallel, follow payload size and retry on their own."""
+    monkeypatch.setattr(settings, "PINECONE_UPSERT_CONCURRENCY", 3)
+    monkeypatch.setattr(settings, "PINECONE_UPSERT_MAX_BYTES", 4000)
+    monkeypatch.setattr(settings, "PINECONE_UPSERT_RETRY_BACKOFF_SECONDS", 0.0)
+    monkeypatch.setattr(settings, "PINECONE_FETCH_BATCH_SIZE", 4)
+    adapter = PineconeAdapter(api_key="test-key", host=pinecone_server.host)
+    await adapter.initialize()
+    documents = make_documents(30) + make_documents(2, start=30, metadata={"note": "x" * 3000})
+    # Fail more attempts than the client retries by itself
+    pinecone_server.fail_ids["doc-5"] = 5
+
+    ids = await adapter.add_documents(documents, batch_size=10)
+
+    assert ids == [doc.id for doc in documents]
+    assert set(pinecone_server.vectors) == set(ids)
+    batches = pinecone_server.upserts
+    assert sorted(len(batch) for batch in batches) == [1, 1, 10, 10, 10]
+    assert sum("doc-5" in batch for batch in batches) == 1
+    assert 1 < pinecone_server.peak_in_flight <= 3
+
+    fetched = await adapter.get_documents(["doc-31", "missing", "doc-0", "doc-12", "doc-3", "doc-7"])
+
+    assert [doc.id for doc in fetched] == ["doc-31", "doc-0", "doc-12", "doc-3", "doc-7"]
+    assert fetched[0].metadata == {"note": "x" * 3000}
+    assert fetched[1].embedding == pytest.approx(documents[0].embedding)
+    assert pinecone_server.fetch_requests == 2
+
+
+@pytest.mark.asyncio
+async def test_faiss_get_documents_in_bulk(faiss_adapter):
+    """Test that FAISS bulk fetch returns live documents with embeddings, in id order."""
+    documents = make_documents(10)
+    await faiss_adapter.add_documents(documents)
+    await faiss_adapter.delete_documents(["doc-4"])
+
+    fetched = await faiss_adapter.get_documents(["doc-7", "doc-4", "doc-1", "doc-7"])
+
+    assert [doc.id for doc in fetched] == ["doc-7", "doc-1"]
+    assert fetched[0].embedding == pytest.approx(documents[7].embedding)
+    assert fetched[1].metadata == documents[1].metadata
+
+
+@pytest.mark.asyncio
+async def test_weaviate_add_resends_only_failed_objects(weaviate_adapter, monkeypatch):
+    """Test that fixed-size batching honours batch_size and retries rejected objects alone."""
+    monkeypatch.setattr(settings, "WEAVIATE_BATCH_MODE", "fixed")
+    stand_in = weaviate_adapter.client
+    stand_in.reject = {"doc-3": 1, "doc-8": 5}
+    documents = make_documents(10)
+
+    with pytest.raises(RuntimeError, match="1 of 10 objects failed"):
+        await weaviate_adapter.add_documents(documents, batch_size=4)
+
+    assert stand_in.batches[0] == (("fixed", 4), [doc.id for doc in documents])
+    assert [uuids for _, uuids in stand_in.batches[1:]] == [["doc-3", "doc-8"], ["doc-8"]]
+    assert set(stand_in.objects) == {doc.id for doc in documents} - {"doc-8"}
+
+
+@pytest.mark.asyncio
+async def test_weaviate_ingest_stream_reports_failures_and_throughput(weaviate_adapter, monkeypatch):
+    """Test that streaming ingestion chunks an async iterator and reports instead of raising."""
+    monkeypatch.setattr(settings, "WEAVIATE_BATCH_MODE", "rate_limit")
+    monkeypatch.setattr(settings, "WEAVIATE_BATCH_REQUESTS_PER_MINUTE", 120)
+    monkeypatch.setattr(settings, "WEAVIATE_BATCH_RETRIES", 0)
+    stand_in = weaviate_adapter.client
+    stand_in.reject = {"doc-6": 1}
+    documents = make_documents(11)
+
+    async def stream():
+        for doc in documents:
+            await asyncio.sleep(0)
+            yield doc
+
+    failed_before = REGISTRY.get_sample_value(
+        "vector_ingest_objects_total", {"backend": "weaviate", "status": "failed"}
+    ) or 0.0
+
+    report = await weaviate_adapter.ingest_stream(stream(), batch_size=5)
+
+    assert [len(uuids) for _, uuids in stand_in.batches] == [5, 5, 1]
+    assert {mode for mode, _ in stand_in.batches} == {("rate_limit", 120)}
+    assert report.imported == [doc.id for doc in documents if doc.id != "doc-6"]
+    assert report.failed == {"doc-6": "vector dimension mismatch"}
+    assert report.objects_per_second > 0
+    assert REGISTRY.get_sample_value(
+        "vector_ingest_objects_total", {"backend": "weaviate", "status": "failed"}
+    ) == failed_before + 1
+
+
+@pytest.mark.asyncio
+async def test_faiss_keyword_search_follows_writes_and_snapshots(faiss_adapter):
+    """Test that BM25 search tracks adds, deletes and replacements and survives reload."""
+    documents = make_documents(6)
+    documents[0].text = "Asthma exacerbation coded J45.909, give albuterol"
+    documents[1].text = "Albuterol dosing for pediatric asthma"
+    documents[2].text = "Sepsis bundle: lactate, cultures, antibiotics"
+    documents[3].text = "ICD-10 J45.909 unspecified asthma, uncomplicated"
+    documents[3].metadata = {"department": "ER"}
+    await faiss_adapter.add_documents(documents)
+
+    results = await faiss_adapter.search(
+        documents[5].embedding, top_k=5, retrieval_mode="keyword", query_text="J45.909"
+    )
+    assert {result.id for result in results} == {"doc-0", "doc-3"}
+    results = await faiss_adapter.search(
+        documents[5].embedding, top_k=5, retrieval_mode="keyword", query_text="icd", filters={"department": "ER"}
+    )
+    assert [result.id for result in results] == ["doc-3"]
+
+    await faiss_adapter.delete_documents(["doc-0"])
+    replacement = documents[1].model_copy(update={"text": "Inhaled corticosteroids"})
+    await faiss_adapter.add_documents([replacement])
+    await faiss_adapter._run_blocking(faiss_adapter._save_index)
+    await faiss_adapter.add_documents(
+        [documents[4].model_copy(update={"text": "Albuterol nebulizer in the ER"})]
+    )
+
+    async def keyword_ids(adapter, query_text):
+        results = await adapter.search(
+            documents[5].embedding, top_k=5, retrieval_mode="keyword", query_text=query_text
+        )
+        return [result.id for result in results]
+
+    assert await keyword_ids(faiss_adapter, "albuterol") == ["doc-4"]
+    assert await keyword_ids(faiss_adapter, "J45.909") == ["doc-3"]
+
+    simulate_crash(faiss_adapter)
+    reopened = FAISSAdapter(index_path=str(faiss_adapter.index_path), dimension=DIMENSION)
+    await reopened.initialize()
+    assert await keyword_ids(reopened, "albuterol") == ["doc-4"]
+    assert await keyword_ids(reopened, "corticosteroids") == ["doc-1"]
+    await reopened.close()
+
+    reader = FAISSAdapter(index_path=str(faiss_adapter.index_path), dimension=DIMENSION, read_only=True)
+    await reader.initialize()
+    assert await keyword_ids(reader, "J45.909") == ["doc-3"]
+
+
+@pytest.mark.asyncio
+async def test_faiss_hybrid_search_fuses_vector_and_keyword_candidates(faiss_adapter):
+    """Test that hybrid search surfaces both the nearest vector and the exact term match."""
+    documents = make_documents(50)
+    documents[42].text = "Vancomycin trough monitoring policy"
+    await faiss_adapter.add_documents(documents)
+
+    vector_only = await faiss_adapter.search(documents[7].embedding, top_k=3)
+    hybrid = await faiss_adapter.search(
+        documents[7].embedding, top_k=3, retrieval_mode="hybrid", query_text="vancomycin"
+    )
+    batch = await faiss_adapter.search_batch(
+        [documents[7].embedding, documents[8].embedding],
+        top_k=3,
+        retrieval_mode="hybrid",
+        query_texts=["vancomycin", ""],
+    )
+
+    assert "doc-42" not in {result.id for result in vector_only}
+    assert {"doc-7", "doc-42"} <= {result.id for result in hybrid}
+    assert [result.id for result in batch[0]] == [result.id for result in hybrid]
+    assert batch[1][0].id == "doc-8"
+    with pytest.raises(ValueError, match="retrieval_mode"):
+        await faiss_adapter.search(documents[7].embedding, retrieval_mode="fuzzy")
+
+
+@pytest.mark.asyncio
+async def test_faiss_hybrid_search_keeps_distinct_documents_with_equal_text(faiss_adapter):
+    """Test that hybrid fusion does not merge different ids that share text and hash."""
+    documents = make_documents(50)
+    for doc in documents[42:44]:
+        doc.text = "Vancomycin trough monitoring policy"
+        doc.doc_hash = "hash-vancomycin"
+    await faiss_adapter.add_documents(documents)
+
+    hybrid = await faiss_adapter.search(
+        documents[7].embedding, top_k=4, retrieval_mode="hybrid", query_text="vancomycin"
+    )
+
+    assert {"doc-7", "doc-42", "doc-43"} <= {result.id for result in hybrid}
+
+
+def test_lexical_index_statistics_follow_removals():
+    """Test that BM25 scores after a removal match an index built without the row."""
+    texts = ["albuterol for asthma", "albuterol", "sepsis bundle lactate cultures antibiotics", "asthma"]
+    index = LexicalIndex()
+    index.add(range(4), texts)
+    alive = np.ones(4, dtype=bool)
+    alive[2] = False
+    index.remove([2])
+    fresh = LexicalIndex()
+    fresh.add(range(3), [texts[0], texts[1], texts[3]])
+
+    rows, scores = index.search("albuterol asthma", alive, 3)
+    fresh_rows, fresh_scores = fresh.search("albuterol asthma", np.ones(3, dtype=bool), 3)
+
+    assert rows.tolist() == [0, 1, 3] and fresh_rows.tolist() == [0, 1, 2]
+    assert np.allclose(scores, fresh_scores)
+
+
+class SharedCounters:
+    """In-memory stand-in for the Redis client behind the write counters."""
+
+    def __init__(self):
+        self.values = {}
+        self.down = False
+
+    async def incr(self, key):
+        if self.down:
+            raise ConnectionError("redis unavailable")
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def mget(self, keys):
+        if self.down:
+            raise ConnectionError("redis unavailable")
+        return [self.values.get(key) for key in keys]
+
+    async def aclose(self):
+        pass
+
+
+class WritableBackend(StubBackend):
+    """Stub backend that also accepts writes."""
+
+    backend = VectorDBBackend.PINECONE
+
+    async def add_documents(self, documents, batch_size=None):
+        return [doc.id for doc in documents]
+
+    def cache_token(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_manager_cache_sees_writes_from_other_processes(monkeypatch):
+    """Test that a write counted by another manager invalidates cached results via the shared counter."""
+    monkeypatch.setattr(settings, "VECTOR_CACHE_ENABLED", True)
+    counters = SharedCounters()
+    api_backend = WritableBackend(make_results(["a"], [0.9]))
+    api = VectorDBManager()
+    api.adapters = {VectorDBBackend.PINECONE: api_backend}
+    api.write_counter = WriteCounter(client=counters, interval=0.0)
+    worker = VectorDBManager()
+    worker.adapters = {VectorDBBackend.PINECONE: WritableBackend([])}
+    worker.write_counter = WriteCounter(client=counters, interval=0.0)
+    query = [0.5] * DIMENSION
+
+    for _ in range(2):
+        await api.search(query, top_k=1, backend=VectorDBBackend.PINECONE)
+    assert api_backend.calls == 1
+
+    await worker.add_documents(make_documents(1), backend=VectorDBBackend.PINECONE)
+    await api.search(query, top_k=1, backend=VectorDBBackend.PINECONE)
+    assert api_backend.calls == 2
+
+    # Unknown counts bypass the cache instead of trusting it
+    counters.down = True
+    await api.search(query, top_k=1, backend=VectorDBBackend.PINECONE)
+    assert api_backend.calls == 3
+    assert api.get_cached("q", top_k=1, backend=VectorDBBackend.PINECONE) is None
+
+
+def cache_lookups(result):
+    """Count of FAISS-scope cache lookups with a result."""
+    return REGISTRY.get_sample_value(
+        "vector_cache_lookups_total", {"scope": "faiss", "result": result}
+    ) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_manager_cache_answers_repeats_until_a_write(faiss_adapter, monkeypatch, mocker):
+    """Test that repeated searches hit the cache and writes through the manager invalidate it."""
+    monkeypatch.setattr(settings, "VECTOR_CACHE_ENABLED", True)
+    documents = make_documents(10)
+    await faiss_adapter.add_documents(documents)
+    manager = VectorDBManager()
+    manager.adapters = {VectorDBBackend.FAISS: faiss_adapter}
+    spy = mocker.spy(faiss_adapter, "search")
+    query = documents[4].embedding
+    hits, misses = cache_lookups("hit"), cache_lookups("miss")
+
+    first = await manager.search(query, top_k=3, backend=VectorDBBackend.FAISS)
+    # Float noise below the quantization step keys the same entry
+    jittered = [value + 1e-7 for value in query]
+    second = await manager.search(jittered, top_k=3, backend=VectorDBBackend.FAISS)
+    await manager.search(query, top_k=3, filters={"department": "ICU"}, backend=VectorDBBackend.FAISS)
+
+    assert [result.id for result in second] == [result.id for result in first]
+    assert spy.call_count == 2
+    assert (cache_lookups("hit") - hits, cache_lookups("miss") - misses) == (1, 2)
+
+    await manager.delete_documents(["doc-4"], backend=VectorDBBackend.FAISS)
+    after_delete = await manager.search(query, top_k=3, backend=VectorDBBackend.FAISS)
+
+    assert spy.call_count == 3
+    assert "doc-4" not in {result.id for result in after_delete}
+
+    await manager.search(
+        query, top_k=3, backend=VectorDBBackend.FAISS, retrieval_mode="hybrid", query_text="Policy  TEXT 4"
+    )
+    cached = manager.get_cached(
+        "policy text 4", top_k=3, backend=VectorDBBackend.FAISS, retrieval_mode="hybrid"
+    )
+    assert cached is not None and spy.call_count == 4
+    assert manager.get_cached("policy text 4", top_k=3, backend=VectorDBBackend.FAISS) is None
+
+
+def test_search_cache_near_duplicates_ttl_and_lru(monkeypatch):
+    """Test near-duplicate hits above the threshold, expiry and least-recently-used eviction."""
+    clock = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: clock[0])
+    cache = SearchCache(max_entries=2, ttl_seconds=60, similarity_threshold=0.95)
+    rng = np.random.default_rng(0)
+    base = rng.random(DIMENSION)
+    results = make_results(["a"], [0.9])
+
+    cache.store("faiss", 1, 5, None, None, results, query_embedding=base)
+    near = base + rng.normal(0, 0.01, DIMENSION)
+    far = rng.random(DIMENSION)
+
+    assert cache.lookup("faiss", 1, 5, None, None, query_embedding=near) == results
+    assert cache.lookup("faiss", 1, 5, None, None, query_embedding=far) is None
+    assert cache.lookup("faiss", 1, 10, None, None, query_embedding=near) is None
+    assert cache.lookup("faiss", 2, 5, None, None, query_embedding=base) is None  # new token
+
+    cache.store("faiss", 1, 5, None, None, results, query_embedding=base)
+    cache.store("faiss", 1, 5, None, None, results, query_embedding=far)
+    cache.lookup("faiss", 1, 5, None, None, query_embedding=base)
+    cache.store("faiss", 1, 5, None, None, results, query_text="sepsis bundle")
+    assert len(cache) == 2
+    assert cache.lookup("faiss", 1, 5, None, None, query_embedding=base) == results
+    assert cache.lookup("faiss", 1, 5, None, None, query_text="Sepsis   bundle") == results
+
+    clock[0] += 61
+    assert cache.lookup("faiss", 1, 5, None, None, query_embedding=base) is None
+
+
+def test_doc_hash_index_classifies_and_persists(tmp_path):
+    """Test new, changed and unchanged classification, and that it survives a reopen."""
+    path = tmp_path / "faiss.sqlite3"
+    index = DocHashIndex(path)
+    entries = [(f"doc-{i}", f"hash-{i}") for i in range(1200)]
+    assert set(index.classify(entries)) == {DedupStatus.NEW}
+
+    index.record(entries)
+    assert set(index.classify(entries)) == {DedupStatus.UNCHANGED}
+    index.close()
+
+    reopened = DocHashIndex(path)
+    assert len(reopened) == 1200
+    statuses = reopened.classify([("doc-1", "hash-1"), ("doc-2", "hash-2b"), ("doc-9999", "hash-9999")])
+    assert statuses == [DedupStatus.UNCHANGED, DedupStatus.CHANGED, DedupStatus.NEW]
+
+    reopened.remove(["doc-1"])
+    assert reopened.classify([("doc-1", "hash-1")]) == [DedupStatus.NEW]
+    reopened.clear()
+    assert len(reopened) == 0
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_deleted_documents_are_stored_again_when_reingested(faiss_adapter, tmp_path, monkeypatch):
+    """Test that a manager delete clears dedup keys, so re-ingesting stores and finds the documents."""
+    monkeypatch.setattr(settings, "VECTOR_DEDUP_INDEX_PATH", str(tmp_path / "dedup"))
+    documents = make_documents(5)
+    entries = [(doc.id, doc.doc_hash) for doc in documents]
+    manager = VectorDBManager()
+    manager.adapters = {VectorDBBackend.FAISS: faiss_adapter}
+    await manager.add_documents(documents, backend=VectorDBBackend.FAISS)
+    dedup = DocHashIndex.for_backend("faiss")
+    dedup.record(entries)
+
+    await manager.delete_documents(["doc-1", "doc-3"], backend=VectorDBBackend.FAISS)
+
+    statuses = dedup.classify(entries)
+    assert [doc_id for (doc_id, _), status in zip(entries, statuses) if status == DedupStatus.NEW] == [
+        "doc-1",
+        "doc-3",
+    ]
+    await manager.add_documents([documents[1], documents[3]], backend=VectorDBBackend.FAISS)
+    dedup.record([entries[1], entries[3]])
+    results = await manager.search(documents[3].embedding, top_k=1, backend=VectorDBBackend.FAISS)
+    assert results[0].id == "doc-3"
+    assert set(dedup.classify(entries)) == {DedupStatus.UNCHANGED}
+    dedup.close()
+
+
+class CountingModel:
+    """Stand-in sentence transformer recording the texts it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        self.encoded.extend(batch)
+        vectors = np.array([[len(text), sum(map(ord, text)), 1.0] for text in batch], dtype=np.float32)
+        return vectors[0] if isinstance(texts, str) else vectors
+
+
+def test_embedding_cache_encodes_only_misses(tmp_path):
+    """Test that cached texts skip the model, in memory and across processes via disk."""
+    path = str(tmp_path / "embeddings.sqlite3")
+    generator = EmbeddingGenerator(model_name="model-a", cache=EmbeddingCache("model-a", path=path))
+    generator.model = CountingModel()
+
+    first = generator.generate_embeddings(["sepsis", "triage", "sepsis"])
+    assert generator.model.encoded == ["sepsis", "triage"]
+    assert np.array_equal(first[0], first[2])
+
+    second = generator.generate_embeddings(["triage", "stroke"])
+    assert generator.model.encoded == ["sepsis", "triage", "stroke"]
+    assert np.array_equal(second[0], first[1]) and second.flags.c_contiguous
+    assert np.array_equal(generator.generate_embedding("sepsis"), first[0])
+    assert generator.model.encoded == ["sepsis", "triage", "stroke"]
+
+    # A fresh process reads the disk tier; another model does not share entries
+    restarted = EmbeddingGenerator(model_name="model-a", cache=EmbeddingCache("model-a", path=path))
+    restarted.model = CountingModel()
+    assert np.array_equal(restarted.generate_embeddings(["stroke", "sepsis"])[1], first[0])
+    assert restarted.model.encoded == []
+    assert restarted.cache.hit_ratio == 1.0
+
+    other = EmbeddingGenerator(model_name="model-b", cache=EmbeddingCache("model-b", path=path))
+    other.model = CountingModel()
+    other.generate_embedding("sepsis")
+    assert other.model.encoded == ["sepsis"]
+
+
+def test_embedding_cache_keeps_nothing_on_disk_by_default(tmp_path, monkeypatch):
+    """Test that the unbounded SQLite tier is only used when a path is configured."""
+    monkeypatch.chdir(tmp_path)
+    cache = EmbeddingCache("model-a")
+    cache.put_many(["sepsis"], np.ones((1, 3), dtype=np.float32))
+
+    assert cache.get_many(["sepsis"])[0] is not None
+    assert list(tmp_path.rglob("*")) == []
+
+
+class WordTokenizer:
+    """Tokenizer stand-in whose tokens are words, with two special tokens per text."""
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 2
+
+    def __call__(self, texts, add_special_tokens=False, verbose=False):
+        return {"input_ids": [text.split() for text in texts]}
+
+    def decode(self, ids):
+        return " ".join(ids)
+
+
+class TokenizedModel(CountingModel):
+    """Model stand-in with a tokenizer that records each encode call as a batch."""
+
+    tokenizer = WordTokenizer()
+    max_seq_length = 6
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        self.batches.append(list(texts))
+        return np.array([[len(text.split()), 1.0] for text in texts], dtype=np.float32)
+
+
+@pytest.mark.asyncio
+async def test_embedding_server_serves_clients_over_unix_socket(tmp_path, monkeypatch, mocker):
+    """Test that clients embed through the server, which batches single texts across clients."""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EMBEDDING_SERVER_ENABLED", True)
+    monkeypatch.setattr(settings, "EMBEDDING_SERVER_SOCKET", str(tmp_path / "embed.sock"))
+    monkeypatch.setattr(embeddings_module, "_embedding_generator", None)
+    generator = EmbeddingGenerator(model_name="model-a")
+    generator.model = CountingModel()
+    encode_spy = mocker.spy(generator.model, "encode")
+    server = EmbeddingServer(generator)
+    server.batcher.window_seconds = 0.05
+    await server.start()
+    try:
+        client = embeddings_module.get_embedding_generator()
+        assert isinstance(client, EmbeddingClient) and client.model is None
+
+        matrix = await asyncio.to_thread(client.generate_embeddings, ["sepsis", "stroke"])
+        assert matrix.dtype == np.float32
+        assert np.array_equal(matrix, generator.model.encode(["sepsis", "stroke"]))
+
+        # Single texts from concurrent threads (one connection each) share a batch
+        encode_spy.reset_mock()
+        texts = [f"query {i}" for i in range(4)]
+        vectors = await asyncio.gather(
+            *(asyncio.to_thread(client.generate_embedding, text) for text in texts)
+        )
+        assert [len(call.args[0]) for call in encode_spy.call_args_list] == [4]
+        assert all(np.array_equal(v, generator.model.encode([t])[0]) for t, v in zip(texts, vectors))
+        assert await asyncio.to_thread(lambda: client.dimension) == 3
+
+        mocker.patch.object(generator.model, "encode", side_effect=RuntimeError("out of memory"))
+        with pytest.raises(EmbeddingServerError, match="out of memory"):
+            await asyncio.to_thread(client.generate_embeddings, ["a", "b"])
+    finally:
+        await server.stop()
+    assert not (tmp_path / "embed.sock").exists()
+
+
+def test_embedding_client_times_out_and_falls_back_to_local_model(tmp_path, monkeypatch):
+    """Test that an unanswered request raises EmbeddingServerError, or embeds locally if enabled."""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    path = str(tmp_path / "embed.sock")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen()  # Accepts connections but never answers
+    try:
+        client = EmbeddingClient(socket_path=path, timeout=0.1, fallback_local=False)
+        start = time.perf_counter()
+        with pytest.raises(EmbeddingServerError, match="did not answer"):
+            client.generate_embeddings(["sepsis"])
+        assert time.perf_counter() - start < 1.0
+
+        monkeypatch.setattr(
+            EmbeddingGenerator, "_load_model", lambda self: setattr(self, "model", CountingModel())
+        )
+        client = EmbeddingClient(socket_path=path, timeout=0.1, fallback_local=True)
+        matrix = client.generate_embeddings(["sepsis", "stroke"])
+        assert np.array_equal(matrix, CountingModel().encode(["sepsis", "stroke"]))
+    finally:
+        listener.close()
+
+
+def test_embedding_client_waits_for_the_server_only_once(tmp_path, monkeypatch):
+    """Test that after the first connection wait, an unreachable server sends requests straight to the fallback."""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(
+        EmbeddingGenerator, "_load_model", lambda self: setattr(self, "model", CountingModel())
+    )
+    client = EmbeddingClient(
+        socket_path=str(tmp_path / "missing.sock"), connect_timeout=0.3, fallback_local=True
+    )
+
+    start = time.perf_counter()
+    client.generate_embeddings(["sepsis", "stroke"])
+    assert time.perf_counter() - start >= 0.3
+
+    start = time.perf_counter()
+    for _ in range(3):
+        matrix = client.generate_embeddings(["sepsis", "stroke"])
+    assert time.perf_counter() - start < 0.2
+    assert np.array_equal(matrix, CountingModel().encode(["sepsis", "stroke"]))
+
+
+class OverlapModel(CountingModel):
+    """Model stand-in that records how many encode calls run at once."""
+
+    def __init__(self):
+        super().__init__()
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def encode(self, texts, convert_to_numpy=True, **kwargs):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self.lock:
+            self.running -= 1
+        return super().encode(texts, convert_to_numpy=convert_to_numpy, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_embedding_server_encodes_one_request_at_a_time(tmp_path, monkeypatch):
+    """Test that the server serializes encodes, answers bad frames and keeps a live socket."""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    path = str(tmp_path / "embed.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()  # A socket file nobody listens on
+    generator = EmbeddingGenerator(model_name="model-a")
+    generator.model = OverlapModel()
+    server = EmbeddingServer(generator, socket_path=path)
+    await server.start()
+    try:
+        await asyncio.gather(
+            *(server.embed([f"a {i}", f"b {i}"], batch_size=2) for i in range(4)),
+            *(server.embed([f"query {i}"], batch_size=1) for i in range(4)),
+        )
+        assert generator.model.max_running == 1
+
+        with pytest.raises(RuntimeError, match="already listening"):
+            await EmbeddingServer(generator, socket_path=path).start()
+
+        reader, writer = await asyncio.open_unix_connection(path)
+        payload = b"{not json"
+        writer.write(struct.pack("!I", len(payload)) + payload)
+        (size,) = struct.unpack("!I", await reader.readexactly(4))
+        assert "error" in json.loads(await reader.readexactly(size))
+        writer.close()
+
+        client = EmbeddingClient(socket_path=path)
+        vector = await asyncio.to_thread(client.generate_embedding, "sepsis")
+        assert np.array_equal(vector, CountingModel().encode(["sepsis"])[0])
+    finally:
+        await server.stop()
+
+
+def test_generate_embeddings_buckets_by_token_length(monkeypatch):
+    """Test that batches group similar lengths within the token budget, and long texts window."""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EMBEDDING_BATCH_TOKEN_BUDGET", 12)
+    monkeypatch.setattr(settings, "EMBEDDING_WINDOW_OVERLAP", 1)
+    texts = ["a b c d", "a", "a b", "a b c d e f g h i j", "b"]
+
+    generator = EmbeddingGenerator(model_name="model-a", long_text_strategy="truncate")
+    generator.model = TokenizedModel()
+    embeddings = generator.generate_embeddings(texts, batch_size=2)
+    # Padded to 3, 3, 4 tokens then 6, 6 (the long text capped at the model's limit)
+    assert generator.model.batches == [["a", "b", "a b"], ["a b c d", "a b c d e f g h i j"]]
+    assert embeddings[:, 0].tolist() == [4, 1, 2, 10, 1]
+
+    windowed = EmbeddingGenerator(model_name="model-a", long_text_strategy="window")
+    windowed.model = TokenizedModel()
+    embeddings = windowed.generate_embeddings(texts)
+    segments = [segment for batch in windowed.model.batches for segment in batch]
+    assert {"a b c d", "d e f g", "g h i j"} <= set(segments) and len(segments) == 7
+    assert embeddings[:, 0].tolist() == [4, 1, 2, 4, 1]
+    assert windowed.generate_embedding("a b c d e f g h i j")[0] == 4
+
+
+def test_embedding_generator_loads_through_backend(monkeypatch, mocker):
+    """Test that the model is loaded by the configured backend and int8 vectors are cached apart."""
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(settings, "EMBEDDING_ONNX_QUANTIZE", "avx2")
+    monkeypatch.setitem(embedding_backends.LOADERS, "onnx", mocker.Mock(return_value=CountingModel()))
+
+    generator = EmbeddingGenerator(model_name="model-a")
+    generator.generate_embedding("sepsis")
+    embedding_backends.LOADERS["onnx"].assert_called_once_with("model-a", "cpu", "avx2", 0)
+    assert embedding_backends.model_key("model-a", generator.quantize) != "model-a"
+
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        EmbeddingGenerator(model_name="model-a", backend="tensorrt").generate_embedding("sepsis")
+
+
+def test_onnx_backend_agrees_with_torch(tmp_path, monkeypatch):
+    """Test that ONNX Runtime embeddings, fp32 and int8, match PyTorch's by cosine similarity."""
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("optimum.onnxruntime")
+    monkeypatch.setattr(settings, "EMBEDDING_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "EMBEDDING_ONNX_MODEL_DIR", str(tmp_path))
+    texts = [
+        "Sepsis bundle must start within one hour of triage.",
+        "Discharge summaries are signed by the attending physician.",
+        "Stroke alerts page the neurology team.",
+    ]
+
+    try:
+        reference = EmbeddingGenerator(backend="torch").generate_embeddings(texts)
+    except OSError as exc:  # model not cached and no network
+        pytest.skip(f"embedding model unavailable: {exc}")
+
+    def cosine(a, b):
+        return np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+
+    fp32 = EmbeddingGenerator(backend="onnx", quantize="").generate_embeddings(texts)
+    assert fp32.dtype == np.float32
+    assert cosine(reference, fp32).min() > 0.9999
+
+    int8 = EmbeddingGenerator(backend="onnx", quantize="avx2").generate_embeddings(texts)
+    assert cosine(reference, int8).min() > 0.98
+
+
+@pytest.mark.asyncio
+async def test_embedding_batcher_coalesces_concurrent_requests(mocker):
+    """Test that concurrent requests share one encode, split at the max batch size."""
+    generator = EmbeddingGenerator(model_name="model-a")
+    generator.cache = None
+    generator.model = CountingModel()
+    encode_spy = mocker.spy(generator.model, "encode")
+    batcher = EmbeddingBatcher(generator, window_seconds=0.05, max_batch_size=4)
+
+    texts = [f"query {i}" for i in range(6)]
+    embeddings = await asyncio.gather(*(batcher.embed(text) for text in texts))
+
+    assert [len(call.args[0]) for call in encode_spy.call_args_list] == [4, 2]
+    for text, embedding in zip(texts, embeddings):
+        assert np.array_equal(embedding, generator.model.encode([text])[0])
+
+    # A lone request goes out after the window, not before
+    started = time.monotonic()
+    await batcher.embed("lone query")
+    assert time.monotonic() - started >= 0.04
+
+    generator.model = None
+    mocker.patch.object(generator, "_load_model")
+    with pytest.raises(RuntimeError, match="Model not loaded"):
+        await asyncio.gather(batcher.embed("a"), batcher.embed("b"))